@@ -0,0 +1,20 @@
+from scitrans.quality_evaluation.placeholder_benchmark import run_placeholder_benchmark
+
+if __name__ == '__main__':
+    jsonl_path = "../Data/pipeline_testing_data.jsonl"
+    results_output_file = "quality_evaluation/eval_results/placeholder_benchmark.pickle"
+    seed = 42
+    n_samples = 1000
+    models_to_use = [
+        'opus_mt_base', 'opus_mt_finetuned',
+        'm2m100_418m_base', 'm2m100_418m_finetuned',
+        'mbart50_mmt_base', 'mbart50_mmt_finetuned',
+    ]
+    
+    run_placeholder_benchmark(
+        models_to_use=models_to_use,
+        jsonl_path=jsonl_path,
+        n_samples=n_samples,
+        seed=seed,
+        output_pickle=results_output_file
+    )
@@ -0,0 +1,16 @@
+from scitrans.quality_evaluation.shortlist_benchmark import run_shortlist_benchmark
+
+if __name__ == '__main__':
+    jsonl_path = "../Data/pipeline_testing_data.jsonl"
+    results_output_file = "quality_evaluation/eval_results/shortlist_benchmark.pickle"
+    seed = 42
+    n_samples = 1000
+    models_to_use = ['opus_mt_base', 'opus_mt_finetuned']
+    
+    run_shortlist_benchmark(
+        models_to_use=models_to_use,
+        jsonl_path=jsonl_path,
+        n_samples=n_samples,
+        seed=seed,
+        output_pickle=results_output_file
+    )
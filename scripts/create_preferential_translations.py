@@ -10,6 +10,7 @@ from datetime import datetime
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 from scitrans import config
+from scitrans.rules_based_replacements.glossary_store import get_glossary_store
 
 OLD_REPO = os.path.join(os.path.dirname(__file__), '..', '..', 'RuleBasedTranslationMatching')
 SPREADSHEET_FILE = os.path.join(OLD_REPO, 'translations_spreadsheet.xlsx')
@@ -426,6 +427,8 @@ def generate_preferential_translations_json(spreadsheet_file=SPREADSHEET_FILE,
     }
     
     save_json(all_translations, output_file)
+    index_path = get_glossary_store(output_file).write_index()
+    print(f"Saved glossary index to {index_path}")
     
     print("\n" + "=" * 50)
     print("TRANSLATION STATISTICS")
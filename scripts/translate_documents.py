@@ -4,6 +4,7 @@ from pathlib import Path
 from scitrans.translate.txt_document import translate_txt_document
 from scitrans.translate.word_document import translate_word_document
 from scitrans.translate.models import create_translator
+from scitrans.translate.ensemble_stats import format_ensemble_report
 
 if __name__ == '__main__':
     print_timing = True
@@ -53,7 +54,9 @@ if __name__ == '__main__':
                 use_finetuned=None,
                 translation_manager=translation_manager,
                 include_timestamp=False,
-                use_cache=True
+                use_cache=True,
+                checkpoint=True,
+                progress=True
             )
         else:
             translate_txt_document(
@@ -66,7 +69,8 @@ if __name__ == '__main__':
                 use_finetuned=None,
                 translation_manager=translation_manager,
                 single_attempt=False,
-                use_cache=True
+                use_cache=True,
+                progress=True
             )
         
         if print_timing:
@@ -76,6 +80,10 @@ if __name__ == '__main__':
         else:
             print(f"Translation complete for {filename}")
     
+    if translation_manager.ensemble_stats is not None:
+        print(format_ensemble_report(translation_manager.ensemble_stats))
+        print(f"Ensemble stats saved to {translation_manager.ensemble_stats.save()}")
+    
     if print_timing:
         end_time = time.time()
         print(f"Total execution time: {end_time - start_time:.2f}s")
@@ -0,0 +1,9 @@
+from scitrans.model_finetuning.trim_vocab import trim_variants
+
+if __name__ == '__main__':
+    variants_to_trim = [
+        'm2m100_418m_base', 'm2m100_418m_finetuned',
+        'mbart50_mmt_base', 'mbart50_mmt_finetuned',
+    ]
+    
+    trim_variants(variants_to_trim)
@@ -1,3 +1,4 @@
+import string
 from pathlib import Path
 
 # folders
@@ -35,6 +36,7 @@ PRETRAINED_MODELS_FOLDER = EXTERNAL_DATA_DIR / "pretrained_models"
 PROOFREADER_MODELS_FOLDER = EXTERNAL_DATA_DIR / "proofreader_models"
 MODEL_OUTPUT_DIR = EXTERNAL_DATA_DIR / "finetuning_outputs"
 MERGED_MODEL_DIR = EXTERNAL_DATA_DIR / "finetuning_merged"
+TRIMMED_MODEL_DIR = EXTERNAL_DATA_DIR / "finetuning_trimmed"
 
 Path(EXTERNAL_DATA_DIR).mkdir(parents=True, exist_ok=True)
 Path(MODEL_OUTPUT_DIR).mkdir(parents=True, exist_ok=True)
@@ -136,6 +138,18 @@ DEVICE_CONFIG = {
     "offload_folder": "./offload",
 }
 
+# CPU settings swept by `python -m scitrans.translate.execution_profile`; create_translator
+# applies the profile saved for this host. The first dtype and beam size are the defaults.
+EXECUTION_PROFILE_CONFIG = {
+    "enabled": True,
+    "profile_dir": INTERNAL_DATA_DIR / "execution_profiles",
+    "thread_counts": [1, 2, 4, 8, 16, 32],
+    "interop_threads": 1,
+    "dtypes": ["bfloat16", "float32", "int8"],
+    "beam_sizes": [4, 2],
+    "min_agreement": 0.9,
+}
+
 DATA_CLEANING_CONFIG = {
     "skip_cleaning": False,
     "linebreaks": True,
@@ -158,10 +172,130 @@ TABLE_TRANSLATION_CONFIG = {
     "min_cell_length_for_ai": 20,
 }
 
+# "auto" writes protected terms as single-subword sentinels for every tokenizer that keeps
+# at least min_sentinels of the candidates whole; "category" keeps NOMENCLATURE0001-style tokens.
+# Stays on "category" until quality_evaluation/placeholder_benchmark.py has been run on the models
+PLACEHOLDER_CONFIG = {
+    "scheme": "category",
+    "sentinels": ["Ω", "Δ", "Σ", "Φ", "Ψ", "Λ", "Π", "Θ", "Ξ", "Γ", "§", "¶", "†", "‡"],
+    "min_sentinels": 6,
+}
+
 NUMERIC_CONVERSION_CONFIG = {
     "enabled": True,
 }
 
+SEGMENT_BYPASS_CONFIG = {
+    "enabled": True,
+    "target_language_threshold": 0.9,
+    "target_language_min_words": 3,
+}
+
+REFERENCE_SECTION_CONFIG = {
+    "enabled": True,
+    "headings": [
+        "References", "References cited", "Literature cited", "Works cited", "Bibliography",
+        "Sources of information", "Références", "Références citées", "Ouvrages cités",
+        "Littérature citée", "Bibliographie", "Sources de renseignements",
+    ],
+    "style_names": ["Bibliography", "Bibliographie", "References", "Reference List"],
+    "min_entry_run": 3,
+}
+
+# Similarity scores of aligned sentence pairs: pairs below "low" are dropped from the training
+# data, "medium" and "high" split the rest into tiers with their own outlier bounds
+# (median, +1 stdev, +2 stdev, raised 1 stdev from the original POC)
+SIMILARITY_THRESHOLDS = {"low": 0.85, "medium": 0.92, "high": 0.99}
+
+# Aligned corpora whose human translations are reused for segments found in them word for
+# word; the testing data is left out so evaluations are not scored against their own references,
+# and matched pickle rows below min_similarity are left out as likely misaligned
+CORPUS_LOOKUP_CONFIG = {
+    "enabled": False,
+    "jsonl_paths": [TRAINING_DATA_OUTPUT, WORDDOC_TRAINING_DATA],
+    "pickle_paths": [MATCHED_DATA, WORDDOC_MATCHED_DATA],
+    "exclude_jsonl_paths": [TESTING_DATA_OUTPUT],
+    "min_words": 4,
+    "min_similarity": SIMILARITY_THRESHOLDS["low"],
+}
+
+# Optional CPU decoding mode for the Marian (opus-mt) models: the output layer only scores
+# target tokens the aligned training pairs associate with the input's tokens
+SHORTLIST_CONFIG = {
+    "enabled": False,
+    "jsonl_paths": [TRAINING_DATA_OUTPUT, WORDDOC_TRAINING_DATA],
+    "cache_dir": INTERNAL_DATA_DIR / "shortlists",
+    "top_k": 50,
+    "frequent_targets": 500,
+    "min_cooccurrence": 2,
+}
+
+# Vocabulary-trimmed copies of the multilingual models, keeping only the subwords the en/fr
+# corpora use; "enabled" makes get_model_config load them wherever they have been built
+VOCAB_TRIM_CONFIG = {
+    "enabled": False,
+    "output_dir": TRIMMED_MODEL_DIR,
+    "jsonl_paths": [TRAINING_DATA_OUTPUT, WORDDOC_TRAINING_DATA],
+    "min_count": 1,
+    "keep_characters": string.printable + "àâäçéèêëîïôöùûüÿœæÀÂÄÇÉÈÊËÎÏÔÖÙÛÜŸŒÆ«»‹›“”‘’–—…°±×µ§",
+}
+
+# Win counts per ensemble variant, direction and segment length (in words, split at
+# length_buckets), accumulated across runs in stats_path. With auto_prune, a variant with
+# min_segments segments in a context that wins fewer than min_win_rate of them by more than
+# negligible_margin is skipped there; every explore_every-th segment still runs them all.
+# Opt-in: only scripts/translate_documents.py saves the stats at the end of a run
+ENSEMBLE_STATS_CONFIG = {
+    "enabled": False,
+    "stats_path": INTERNAL_DATA_DIR / "ensemble_stats.json",
+    "length_buckets": [8, 24],
+    "negligible_margin": 0.005,
+    "auto_prune": False,
+    "min_segments": 200,
+    "min_win_rate": 0.03,
+    "explore_every": 50,
+}
+
+# chunk_by="tokens": inputs are kept under max_tokens with every loaded tokenizer, leaving
+# room for the translation (usually longer in French) within the models' 512-token limit
+CHUNK_PLANNER_CONFIG = {
+    "max_tokens": 200,
+    "pack_sentences": True,
+    "chars_per_token": 4,
+}
+
+# Segments the generation thread may run ahead of the document walk (preprocessing runs twice as far)
+PIPELINE_CONFIG = {
+    "enabled": False,
+    "lookahead": 4,
+}
+
+# Cheaper strategies translate_word_document falls back to when a time budget is at risk;
+# cost is the expected per-segment latency relative to the full ensemble. A segment that
+# runs past segment_timeout_seconds keeps the models and retries it finished in that time
+DEADLINE_CONFIG = {
+    "segment_timeout_seconds": 60,
+    "safety_margin": 0.9,
+    "latency_smoothing": 0.3,
+    "levels": [
+        {"name": "full", "cost": 1.0},
+        {"name": "fewer_models", "cost": 0.5, "max_models": 2},
+        {"name": "no_retries", "cost": 0.35, "max_models": 2, "single_attempt": True},
+        {"name": "fewer_beams", "cost": 0.2, "max_models": 2, "single_attempt": True, "num_beams": 2},
+        {"name": "single_model", "cost": 0.08, "max_models": 1, "single_attempt": True, "num_beams": 1},
+    ],
+}
+
+CHECKPOINT_CONFIG = {
+    "save_every": 25,
+    "save_interval_seconds": 60,
+}
+
+PERSON_NAME_DETECTION_CONFIG = {
+    "batch_size": 64,
+    "n_process": 1,
+}
+
 TRANSLATION_MODEL_VARIANTS = {
     "opus_mt_base": {
         "base_model_key": "opus_mt_en_fr",
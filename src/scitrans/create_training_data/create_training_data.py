@@ -1,6 +1,7 @@
 import json
 import re
 
+from scitrans import config
 from scitrans.helpers.helpers import print_timing
 
 outlier_criteria_s1 = {
@@ -33,7 +34,8 @@ def add_exclusion_columns(dataframe):
     # Note:
     #  thresholds increased 1 stdev from original POC to improve training data quality
     #  median, +1 stdev, +2 stdev
-    low_p, med_p, high_p = 0.85, 0.92, 0.99
+    thresholds = config.SIMILARITY_THRESHOLDS
+    low_p, med_p, high_p = thresholds["low"], thresholds["medium"], thresholds["high"]
     
     dataframe["exclude_low_similarity"] = dataframe["similarity"] < low_p
     
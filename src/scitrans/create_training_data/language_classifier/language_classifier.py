@@ -1,6 +1,9 @@
 import json
+import re
 from pathlib import Path
 
+_WORD_RE = re.compile(r"[^\W\d_]+")
+
 
 class LanguageClassifier:
     def __init__(self, wordlist_path=None, max_incorrect_words=0, min_words_in_language=2):
@@ -29,3 +32,16 @@ class LanguageClassifier:
             return 'mixed'
         
         return 'unknown'
+    
+    def language_confidence(self, sentence):
+        # (language, share of the recognised words in that language, recognised word count);
+        # apostrophes split words so elided French articles ("l'évaluation") still match
+        words = _WORD_RE.findall(sentence.lower())
+        en_count = sum(1 for word in words if word in self.english_words)
+        fr_count = sum(1 for word in words if word in self.french_words)
+        recognised = en_count + fr_count
+        if not recognised:
+            return 'unknown', 0.0, 0
+        if en_count >= fr_count:
+            return 'en', en_count / recognised, recognised
+        return 'fr', fr_count / recognised, recognised
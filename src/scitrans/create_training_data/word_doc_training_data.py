@@ -5,7 +5,6 @@ import re
 import pandas as pd
 import torch
 
-from docx import Document
 from sentence_transformers import SentenceTransformer
 
 from scitrans import config
@@ -25,7 +24,7 @@ from scitrans.create_training_data.match_languages import (
 )
 from scitrans.helpers.helpers import print_timing
 from scitrans.proofreader.glossary import load_glossary
-from scitrans.translate.word_document import _iter_document_elements
+from scitrans.translate.word_reader import iter_translatable_texts
 
 _ERRATUM_RE = re.compile(r'[\s\-\(\[]*erratum[\s\-\)\]]*', re.IGNORECASE)
 _LANG_RE = re.compile(r'\b(english|french)\b', re.IGNORECASE)
@@ -102,21 +101,8 @@ def pair_documents(root_path, regions=None):
 def extract_paragraphs_from_docx(docx_path):
     # Yield full-paragraph text strings in document order. Splitting happens per-paragraph
     # downstream so sentence fragments from one paragraph cannot glue onto the next.
-    document = Document(docx_path)
-    paragraphs = []
-    
-    for element, _location, element_type in _iter_document_elements(document):
-        if element_type == "paragraph":
-            text = element.text
-            if text and text.strip():
-                paragraphs.append(text)
-        elif element_type == "cell":
-            for paragraph in element.paragraphs:
-                text = paragraph.text
-                if text and text.strip():
-                    paragraphs.append(text)
-    
-    return paragraphs
+    # Read straight from the package XML; building python-docx objects dominated corpus runs.
+    return [text for text in iter_translatable_texts(docx_path) if text and text.strip()]
 
 
 def _extract_clean_paragraphs(docx_path):
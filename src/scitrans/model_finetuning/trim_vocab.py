@@ -0,0 +1,297 @@
+import json
+import logging
+import os
+from collections import Counter
+
+import torch
+from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+
+from scitrans import config
+
+logger = logging.getLogger(__name__)
+
+TRIM_FILE = "vocab_trim.json"
+TRIMMABLE_MODEL_CLASSES = ("M2M100TranslationModel", "MBART50TranslationModel")
+SPECIAL_ID_ATTRIBUTES = (
+    "pad_token_id", "bos_token_id", "eos_token_id", "decoder_start_token_id", "forced_bos_token_id", "forced_eos_token_id"
+)
+
+
+def _iter_corpus_texts(jsonl_paths):
+    for path in jsonl_paths:
+        if not os.path.exists(path):
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                for key in ("source", "target"):
+                    if record.get(key):
+                        yield record[key]
+
+
+def collect_used_ids(tokenizer, texts, min_count=1, keep_texts=()):
+    # Ids the tokenizer produces for the corpus, plus the special and language tokens and
+    # every id needed for keep_texts (single characters, placeholder tokens) whatever its count
+    counts = Counter()
+    for text in texts:
+        counts.update(tokenizer(text, add_special_tokens=False)["input_ids"])
+    kept = {token_id for token_id, count in counts.items() if count >= min_count}
+    kept.update(tokenizer.all_special_ids)
+    for text in keep_texts:
+        kept.update(tokenizer(text, add_special_tokens=False)["input_ids"])
+    return sorted(kept)
+
+
+def trim_model_vocabulary(model, kept_ids):
+    # Keeps only the kept_ids rows of the shared embeddings, the LM head and MBART's
+    # final_logits_bias, in that order, so trimmed id i is original id kept_ids[i]
+    index = torch.tensor(kept_ids, dtype=torch.long)
+    trimmed_ids = {old_id: new_id for new_id, old_id in enumerate(kept_ids)}
+    
+    replaced = {}
+    
+    def trimmed(parameter):
+        if parameter not in replaced:
+            replaced[parameter] = torch.nn.Parameter(
+                parameter.data.index_select(0, index.to(parameter.device)).clone(), requires_grad=parameter.requires_grad
+            )
+        return replaced[parameter]
+    
+    input_weight = model.get_input_embeddings().weight
+    for module in model.modules():
+        if isinstance(module, torch.nn.Embedding) and module.weight is input_weight:
+            module.weight = trimmed(input_weight)
+            module.num_embeddings = len(kept_ids)
+            if module.padding_idx is not None:
+                module.padding_idx = trimmed_ids[module.padding_idx]
+    output_layer = model.get_output_embeddings()
+    output_layer.weight = trimmed(output_layer.weight)
+    output_layer.out_features = len(kept_ids)
+    if getattr(model, "final_logits_bias", None) is not None:
+        model.final_logits_bias = model.final_logits_bias.index_select(1, index.to(model.final_logits_bias.device)).clone()
+    
+    model.config.vocab_size = len(kept_ids)
+    for settings in (model.config, getattr(model, "generation_config", None)):
+        if settings is None:
+            continue
+        for attribute in SPECIAL_ID_ATTRIBUTES:
+            token_id = getattr(settings, attribute, None)
+            if isinstance(token_id, int):
+                setattr(settings, attribute, trimmed_ids[token_id])
+            elif isinstance(token_id, list):
+                setattr(settings, attribute, [trimmed_ids[i] for i in token_id])
+    return model
+
+
+def _restrict_segmentation(tokenizer, kept_ids):
+    # Makes the tokenizer segment with the kept pieces only, so a word whose usual piece was
+    # dropped is split into smaller kept pieces rather than becoming <unk>
+    kept_pieces = set(tokenizer.convert_ids_to_tokens(list(kept_ids)))
+    sp_model = getattr(tokenizer, "sp_model", None)
+    if sp_model is not None:
+        try:
+            from sentencepiece import SentencePieceProcessor, sentencepiece_model_pb2
+        except ImportError:
+            return False
+        # Dropped pieces are marked UNUSED, which keeps their ids but leaves them out of segmentation
+        proto = sentencepiece_model_pb2.ModelProto()
+        proto.ParseFromString(sp_model.serialized_model_proto())
+        for piece in proto.pieces:
+            if piece.type == piece.NORMAL and piece.piece not in kept_pieces:
+                piece.type = piece.UNUSED
+        tokenizer.sp_model = SentencePieceProcessor()
+        tokenizer.sp_model.LoadFromSerializedProto(proto.SerializeToString())
+        return True
+    
+    backend = getattr(tokenizer, "backend_tokenizer", None)
+    if backend is None:
+        return False
+    state = json.loads(backend.to_str())
+    if state["model"].get("type") != "Unigram":
+        return False
+    # Dropped pieces keep their ids but can only win when nothing else covers the text
+    state["model"]["vocab"] = [
+        [piece, score if piece in kept_pieces else -1e9] for piece, score in state["model"]["vocab"]
+    ]
+    tokenizer._tokenizer = type(backend).from_str(json.dumps(state))
+    return True
+
+
+class TrimmedVocabTokenizer:
+    # The original tokenizer of a vocabulary-trimmed checkpoint, with ids translated between
+    # the original and the trimmed vocabulary on the way in and out. Anything not overridden
+    # here (src_lang, pad_token, save_pretrained...) goes to the wrapped tokenizer.
+    def __init__(self, tokenizer, kept_ids):
+        object.__setattr__(self, "tokenizer", tokenizer)
+        object.__setattr__(self, "kept_ids", list(kept_ids))
+        object.__setattr__(self, "trimmed_ids", {old_id: new_id for new_id, old_id in enumerate(kept_ids)})
+        if not _restrict_segmentation(tokenizer, self.kept_ids):
+            logger.warning("%s cannot be restricted to the kept pieces; dropped pieces will decode as <unk>",
+                           type(tokenizer).__name__)
+    
+    def __getattr__(self, name):
+        return getattr(self.tokenizer, name)
+    
+    def __setattr__(self, name, value):
+        setattr(self.tokenizer, name, value)
+    
+    def __len__(self):
+        return len(self.kept_ids)
+    
+    def _to_trimmed(self, ids):
+        if isinstance(ids, list) and ids and isinstance(ids[0], list):
+            return [self._to_trimmed(row) for row in ids]
+        if isinstance(ids, int):
+            return self.trimmed_ids.get(ids, self.unk_token_id)
+        return [self.trimmed_ids.get(token_id, self.unk_token_id) for token_id in ids]
+    
+    def _to_original(self, ids):
+        if hasattr(ids, "tolist"):
+            ids = ids.tolist()
+        if isinstance(ids, list) and ids and isinstance(ids[0], list):
+            return [self._to_original(row) for row in ids]
+        if isinstance(ids, int):
+            return self.kept_ids[ids]
+        return [self.kept_ids[token_id] for token_id in ids]
+    
+    def __call__(self, *args, **kwargs):
+        encoding = self.tokenizer(*args, **kwargs)
+        for key in ("input_ids", "labels"):
+            ids = encoding.get(key)
+            if torch.is_tensor(ids):
+                encoding[key] = torch.tensor(self._to_trimmed(ids.tolist()), dtype=ids.dtype, device=ids.device)
+            elif ids is not None:
+                encoding[key] = self._to_trimmed(ids)
+        return encoding
+    
+    def decode(self, token_ids, **kwargs):
+        return self.tokenizer.decode(self._to_original(token_ids), **kwargs)
+    
+    def batch_decode(self, sequences, **kwargs):
+        return self.tokenizer.batch_decode(self._to_original(sequences), **kwargs)
+    
+    def convert_tokens_to_ids(self, tokens):
+        return self._to_trimmed(self.tokenizer.convert_tokens_to_ids(tokens))
+    
+    def convert_ids_to_tokens(self, ids, **kwargs):
+        return self.tokenizer.convert_ids_to_tokens(self._to_original(ids), **kwargs)
+    
+    def get_lang_id(self, lang):
+        return self._to_trimmed(self.tokenizer.get_lang_id(lang))
+    
+    @property
+    def lang_code_to_id(self):
+        return {code: self._to_trimmed(token_id) for code, token_id in self.tokenizer.lang_code_to_id.items()}
+    
+    @property
+    def unk_token_id(self):
+        return self.trimmed_ids[self.tokenizer.unk_token_id]
+    
+    @property
+    def pad_token_id(self):
+        return self._special_id(self.tokenizer.pad_token_id)
+    
+    @property
+    def bos_token_id(self):
+        return self._special_id(self.tokenizer.bos_token_id)
+    
+    @property
+    def eos_token_id(self):
+        return self._special_id(self.tokenizer.eos_token_id)
+    
+    @property
+    def all_special_ids(self):
+        return [self.trimmed_ids[token_id] for token_id in self.tokenizer.all_special_ids if token_id in self.trimmed_ids]
+    
+    def _special_id(self, token_id):
+        return None if token_id is None else self._to_trimmed(token_id)
+
+
+def load_trimmed_tokenizer(model_path, tokenizer):
+    # Wraps tokenizer when model_path is a trimmed checkpoint; other tokenizers are returned as is
+    trim_path = os.path.join(os.fspath(model_path), TRIM_FILE)
+    if not os.path.exists(trim_path):
+        return tokenizer
+    with open(trim_path, 'r', encoding='utf-8') as f:
+        return TrimmedVocabTokenizer(tokenizer, json.load(f)["kept_ids"])
+
+
+def trim_checkpoint(model_path, out_dir, jsonl_paths=None, min_count=None, keep_texts=None, dtype=torch.float32):
+    from scitrans.translate.models import TranslationManager
+    
+    settings = config.VOCAB_TRIM_CONFIG
+    jsonl_paths = [os.fspath(path) for path in (jsonl_paths or settings["jsonl_paths"])]
+    min_count = min_count or settings["min_count"]
+    if keep_texts is None:
+        keep_texts = list(settings["keep_characters"]) + list(config.PLACEHOLDER_CONFIG["sentinels"])
+        keep_texts += [f"{prefix}0001" for prefix in TranslationManager.TOKEN_PREFIXES]
+    
+    tokenizer = AutoTokenizer.from_pretrained(model_path, use_fast=True)
+    model = AutoModelForSeq2SeqLM.from_pretrained(model_path, torch_dtype=dtype)
+    original_size = model.config.vocab_size
+    original_parameters = model.num_parameters()
+    
+    kept_ids = collect_used_ids(tokenizer, _iter_corpus_texts(jsonl_paths), min_count=min_count, keep_texts=keep_texts)
+    trim_model_vocabulary(model, kept_ids)
+    
+    os.makedirs(out_dir, exist_ok=True)
+    model.save_pretrained(out_dir)
+    tokenizer.save_pretrained(out_dir)
+    report = {
+        "source_model": os.fspath(model_path),
+        "original_vocab_size": original_size,
+        "trimmed_vocab_size": len(kept_ids),
+        "original_parameters": original_parameters,
+        "trimmed_parameters": model.num_parameters(),
+    }
+    with open(os.path.join(out_dir, TRIM_FILE), 'w', encoding='utf-8') as f:
+        json.dump({**report, "kept_ids": kept_ids}, f)
+    return report
+
+
+def _variant_sources(variant_name):
+    # path parameter -> model to trim, as get_model_config would pass them to the model class
+    variant = config.TRANSLATION_MODEL_VARIANTS[variant_name]
+    if "merged_model_names" in variant:
+        return {key: os.path.join(config.MERGED_MODEL_DIR, name) for key, name in variant["merged_model_names"].items()}
+    base_model_id = config.MODELS[variant["base_model_key"]]["model_id"]
+    if variant["model_class"] == "MBART50TranslationModel":
+        return {"merged_model_path_en_fr": base_model_id, "merged_model_path_fr_en": base_model_id}
+    return {"merged_model_path": base_model_id}
+
+
+def trimmed_model_paths(variant_name):
+    # path parameter -> trimmed checkpoint; directions that share a model share its checkpoint
+    sources = _variant_sources(variant_name)
+    output_dir = os.fspath(config.VOCAB_TRIM_CONFIG["output_dir"])
+    if len(set(sources.values())) == 1:
+        return {key: os.path.join(output_dir, variant_name) for key in sources}
+    return {key: os.path.join(output_dir, f"{variant_name}_{key.replace('merged_model_path_', '')}") for key in sources}
+
+
+def trim_variants(variant_names=None):
+    if variant_names is None:
+        variant_names = [
+            name for name, variant in config.TRANSLATION_MODEL_VARIANTS.items()
+            if variant["model_class"] in TRIMMABLE_MODEL_CLASSES
+        ]
+    
+    reports = {}
+    for variant_name in variant_names:
+        sources = _variant_sources(variant_name)
+        for key, out_dir in trimmed_model_paths(variant_name).items():
+            if out_dir in reports:
+                continue
+            print(f'\ntrimming {variant_name} ({sources[key]})')
+            reports[out_dir] = trim_checkpoint(sources[key], out_dir)
+            print(format_trim_report(reports[out_dir]))
+    return reports
+
+
+def format_trim_report(report):
+    return (
+        f"Vocabulary {report['original_vocab_size']} -> {report['trimmed_vocab_size']} tokens, "
+        f"parameters {report['original_parameters'] / 1e6:.0f}M -> {report['trimmed_parameters'] / 1e6:.0f}M"
+    )
@@ -1,4 +1,4 @@
-import docx
+from scitrans.translate.word_reader import iter_location_texts
 
 
 def _iter_header_footer_paragraphs(document):
@@ -47,41 +47,8 @@ def _iter_header_footer_paragraphs(document):
 
 
 def extract_text_with_ids(filepath):
-    doc = docx.Document(filepath)
-    lines = []
-    
-    # Paragraphs
-    for i, p in enumerate(doc.paragraphs):
-        if p.text.strip():
-            lines.append(f'[P{i}] {p.text}')
-    
-    # Tables
-    for t_idx, table in enumerate(doc.tables):
-        for r_idx, row in enumerate(table.rows):
-            cells = [c.text for c in row.cells]
-            lines.append(f'[T{t_idx}-R{r_idx}] ' + ' | '.join(cells))
-    
-    # Headers and footers
-    for loc_id, para in _iter_header_footer_paragraphs(doc):
-        lines.append(f'[{loc_id}] {para.text}')
-    
-    return '\n'.join(lines)
+    return '\n'.join(f'[{loc_id}] {text}' for loc_id, text in iter_location_texts(filepath))
 
 
 def extract_locations(filepath):
-    doc = docx.Document(filepath)
-    locations = []
-    
-    for i, p in enumerate(doc.paragraphs):
-        if p.text.strip():
-            locations.append((f'P{i}', p.text))
-    
-    for t_idx, table in enumerate(doc.tables):
-        for r_idx, row in enumerate(table.rows):
-            cells = [c.text for c in row.cells]
-            locations.append((f'T{t_idx}-R{r_idx}', ' | '.join(cells)))
-    
-    for loc_id, para in _iter_header_footer_paragraphs(doc):
-        locations.append((loc_id, para.text))
-    
-    return locations
+    return list(iter_location_texts(filepath))
@@ -1,8 +1,10 @@
-import json
 import re
 
 import docx
 
+from scitrans.rules_based_replacements.glossary_store import get_glossary_store
+from scitrans.translate.word_reader import DocxReader, iter_header_footer_locations
+
 W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
 W = f'{{{W_NS}}}'
 
@@ -39,47 +41,18 @@ def detect_language_from_path(filepath):
 
 
 def load_glossary(filepath, categories=None, source_lang=None):
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    all_categories = ["nomenclature", "taxon", "site", "table", "acronym"]
-    if categories is None:
-        categories = all_categories
-    
     if source_lang not in ("en", "fr"):
         raise ValueError(f'source_lang must be "en" or "fr", got {source_lang!r}')
-    
-    if source_lang == "en":
-        src_key, tgt_key = "english", "french"
-        src_acronym_key, tgt_acronym_key = "english_acronym", "french_acronym"
-    else:
-        src_key, tgt_key = "french", "english"
-        src_acronym_key, tgt_acronym_key = "french_acronym", "english_acronym"
-    
-    glossary = {}
-    for category in categories:
-        if category == "acronym":
-            for entry in data.get("translations", {}).get("acronym", []):
-                src = entry.get(src_acronym_key) or entry.get(src_key)
-                tgt = entry.get(tgt_acronym_key) or entry.get(tgt_key)
-                if src and tgt:
-                    glossary[src] = tgt
-        else:
-            for entry in data.get("translations", {}).get(category, []):
-                if entry.get(src_key) and entry.get(tgt_key):
-                    glossary[entry[src_key]] = entry[tgt_key]
-    return glossary
+    return dict(get_glossary_store(filepath).glossary(source_lang, categories))
 
 
 def extract_text(filepath):
-    doc = docx.Document(filepath)
-    parts = [p.text for p in doc.paragraphs]
-    for table in doc.tables:
-        for row in table.rows:
-            for cell in row.cells:
-                parts.append(cell.text)
-    from scitrans.proofreader.extract_text import _iter_header_footer_paragraphs
-    for _, para in _iter_header_footer_paragraphs(doc):
-        parts.append(para.text)
+    reader = DocxReader(filepath)
+    parts = [text for _, text in reader.iter_paragraphs()]
+    for table in reader.tables:
+        for r_idx in range(len(table.rows)):
+            parts.extend(table.row_texts(r_idx))
+    parts.extend(text for _, text in iter_header_footer_locations(reader))
     return "\n".join(parts)
 
 
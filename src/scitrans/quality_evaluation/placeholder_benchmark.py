@@ -0,0 +1,79 @@
+import os
+import time
+
+import pandas as pd
+
+from scitrans.quality_evaluation.evaluate import load_testing_data, sample_testing_data
+from scitrans.translate.models import create_translator
+
+DEFAULT_OUTPUT_PICKLE = os.path.join(os.path.dirname(__file__), "eval_results", "placeholder_benchmark.pickle")
+
+
+def benchmark_placeholder_schemes(translation_manager, samples, schemes=("category", "auto")):
+    # Translates every sample that has protected terms with each scheme and each loaded model;
+    # samples without glossary terms or names are the same under every scheme and are skipped
+    previous_scheme = translation_manager.placeholder_scheme
+    rows = []
+    try:
+        for idx, sample in enumerate(samples):
+            source_lang = sample["source_lang"]
+            target_lang = "fr" if source_lang == "en" else "en"
+            preprocessed = translation_manager.preprocess_text(sample["source"], source_lang, target_lang)
+            if not preprocessed[1]:
+                continue
+            
+            for scheme in schemes:
+                translation_manager.placeholder_scheme = scheme
+                for model_name, model in translation_manager.loaded_models.items():
+                    active = translation_manager.placeholder_scheme_for(model, source_lang, target_lang)
+                    model_input, _ = active.apply(*preprocessed) if active is not None else preprocessed
+                    started = time.perf_counter()
+                    result = translation_manager.translate_single(
+                        sample["source"], model_name, source_lang=source_lang, target_lang=target_lang,
+                        use_find_replace=True, idx=idx, preprocessed=preprocessed
+                    )
+                    rows.append({
+                        "sample_idx": idx,
+                        "model_name": model_name,
+                        "scheme": scheme,
+                        "applied_scheme": active.name if active is not None else "category",
+                        "placeholders": len(preprocessed[1]),
+                        "input_tokens": model.count_tokens(model_input, input_language=source_lang, target_language=target_lang),
+                        "retry_attempts": result["retry_attempts"],
+                        "retried": result["retry_attempts"] > 0,
+                        "find_replace_error": result["find_replace_error"],
+                        "seconds": time.perf_counter() - started,
+                    })
+    finally:
+        translation_manager.placeholder_scheme = previous_scheme
+    
+    return pd.DataFrame(rows)
+
+
+def summarize_placeholder_benchmark(results):
+    return results.groupby(["model_name", "scheme"]).agg(
+        segments=("sample_idx", "size"),
+        mean_input_tokens=("input_tokens", "mean"),
+        retry_rate=("retried", "mean"),
+        find_replace_error_rate=("find_replace_error", "mean"),
+        mean_seconds=("seconds", "mean"),
+    )
+
+
+def run_placeholder_benchmark(models_to_use, jsonl_path, n_samples=None, seed=None, output_pickle=None):
+    if output_pickle is None:
+        output_pickle = DEFAULT_OUTPUT_PICKLE
+    
+    data = load_testing_data(jsonl_path)
+    if n_samples:
+        data = sample_testing_data(data, n_samples, seed)
+    
+    translation_manager = create_translator(models_to_use=models_to_use, use_embedder=False, load_models=True)
+    results = benchmark_placeholder_schemes(translation_manager, data)
+    
+    os.makedirs(os.path.dirname(output_pickle), exist_ok=True)
+    results.to_pickle(output_pickle)
+    
+    print(summarize_placeholder_benchmark(results).to_string())
+    print(f"Results saved to {output_pickle}")
+    return results
@@ -0,0 +1,78 @@
+import os
+import time
+
+import pandas as pd
+
+from scitrans.quality_evaluation.evaluate import load_testing_data, sample_testing_data
+from scitrans.translate.models import create_translator
+
+DEFAULT_OUTPUT_PICKLE = os.path.join(os.path.dirname(__file__), "eval_results", "shortlist_benchmark.pickle")
+
+
+def benchmark_shortlist(translation_manager, samples, model_names=None):
+    # Translates every sample with each shortlist-capable model twice, with the full output
+    # layer and with the shortlist, so speed and output changes can be compared per segment
+    models = {
+        name: model for name, model in translation_manager.loaded_models.items()
+        if hasattr(model, "use_shortlist") and (model_names is None or name in model_names)
+    }
+    rows = []
+    for model_name, model in models.items():
+        previous = model.use_shortlist
+        try:
+            for idx, sample in enumerate(samples):
+                source_lang = sample["source_lang"]
+                target_lang = "fr" if source_lang == "en" else "en"
+                outputs = {}
+                for use_shortlist in (False, True):
+                    model.use_shortlist = use_shortlist
+                    started = time.perf_counter()
+                    outputs[use_shortlist] = model.translate_text(
+                        sample["source"], input_language=source_lang, target_language=target_lang
+                    )
+                    rows.append({
+                        "sample_idx": idx,
+                        "model_name": model_name,
+                        "shortlist": use_shortlist,
+                        "seconds": time.perf_counter() - started,
+                        "translated_text": outputs[use_shortlist],
+                    })
+                rows[-1]["same_as_full"] = outputs[True] == outputs[False]
+                rows[-2]["same_as_full"] = True
+        finally:
+            model.use_shortlist = previous
+    
+    return pd.DataFrame(rows)
+
+
+def summarize_shortlist_benchmark(results):
+    summary = results.groupby(["model_name", "shortlist"]).agg(
+        segments=("sample_idx", "size"),
+        mean_seconds=("seconds", "mean"),
+        same_as_full_rate=("same_as_full", "mean"),
+    )
+    full_seconds = summary.xs(False, level="shortlist")["mean_seconds"]
+    summary["speedup"] = [
+        full_seconds[model_name] / mean_seconds if mean_seconds else float("nan")
+        for (model_name, _), mean_seconds in summary["mean_seconds"].items()
+    ]
+    return summary
+
+
+def run_shortlist_benchmark(models_to_use, jsonl_path, n_samples=None, seed=None, output_pickle=None):
+    if output_pickle is None:
+        output_pickle = DEFAULT_OUTPUT_PICKLE
+    
+    data = load_testing_data(jsonl_path)
+    if n_samples:
+        data = sample_testing_data(data, n_samples, seed)
+    
+    translation_manager = create_translator(models_to_use=models_to_use, use_embedder=False, load_models=True)
+    results = benchmark_shortlist(translation_manager, data)
+    
+    os.makedirs(os.path.dirname(output_pickle), exist_ok=True)
+    results.to_pickle(output_pickle)
+    
+    print(summarize_shortlist_benchmark(results).to_string())
+    print(f"Results saved to {output_pickle}")
+    return results
@@ -0,0 +1,180 @@
+from collections import deque
+
+from scitrans.rules_based_replacements.token_utils import (
+    get_search_patterns, get_translation_value,
+    build_english_to_french_lookup, normalize_translations
+)
+
+# Part of the glossary store's on-disk index key: bump it whenever the matcher state or
+# the way it is built changes, so indexes written by older code are rebuilt
+MATCHER_VERSION = 1
+
+
+def _fold(text):
+    # Per-character lowercase so offsets in the folded text line up with the original
+    # (str.lower() can expand some characters, e.g. 'İ', which would shift every span).
+    return ''.join(c if len(c.lower()) != 1 else c.lower() for c in text)
+
+
+def _is_word_char(c):
+    return c.isalnum() or c == '_'
+
+
+class _AhoCorasick:
+    def __init__(self, patterns=()):
+        self.goto = [{}]
+        self.fail = [0]
+        self.outputs = [[]]
+        self.pattern_lengths = []
+        
+        for pattern_id, pattern in enumerate(patterns):
+            self.pattern_lengths.append(len(pattern))
+            node = 0
+            for char in pattern:
+                next_node = self.goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self.goto)
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.outputs.append([])
+                    self.goto[node][char] = next_node
+                node = next_node
+            self.outputs[node].append(pattern_id)
+        
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                if node:
+                    fallback = self.fail[node]
+                    while fallback and char not in self.goto[fallback]:
+                        fallback = self.fail[fallback]
+                    self.fail[child] = self.goto[fallback].get(char, 0)
+                self.outputs[child] = self.outputs[child] + self.outputs[self.fail[child]]
+    
+    def to_state(self):
+        return {"goto": self.goto, "fail": self.fail, "outputs": self.outputs, "pattern_lengths": self.pattern_lengths}
+    
+    @classmethod
+    def from_state(cls, state):
+        automaton = cls()
+        automaton.goto = state["goto"]
+        automaton.fail = state["fail"]
+        automaton.outputs = state["outputs"]
+        automaton.pattern_lengths = state["pattern_lengths"]
+        return automaton
+    
+    def iter_matches(self, text):
+        goto = self.goto
+        fail = self.fail
+        outputs = self.outputs
+        node = 0
+        for position, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if outputs[node]:
+                for pattern_id in outputs[node]:
+                    yield position + 1 - self.pattern_lengths[pattern_id], pattern_id
+
+
+class GlossaryMatcher:
+    # Terms keep the priority preprocess_for_translation has always used: categories in
+    # glossary order, longest term first within a category, leftmost match first within a
+    # term. Single-word terms need regex-style \b boundaries, multi-word terms do not.
+    def __init__(self, translations, source_lang='fr'):
+        translations = normalize_translations(translations)
+        patterns = get_search_patterns(translations, source_lang)
+        
+        en_to_fr_lookup = build_english_to_french_lookup(translations) if source_lang == 'en' else None
+        
+        self.source_lang = source_lang
+        self.categories = list(translations.keys())
+        self.entries = []
+        
+        for category, terms in patterns.items():
+            folded_keys = {}
+            if source_lang != 'en':
+                for original_key in translations[category].keys():
+                    folded_keys.setdefault(original_key.lower(), original_key)
+            
+            for term in terms:
+                if source_lang == 'en':
+                    lookup_result = en_to_fr_lookup.get(term.lower())
+                    if not lookup_result:
+                        continue
+                    translation = lookup_result[1]
+                else:
+                    translation_key = folded_keys.get(term.lower())
+                    term_data = translations[category].get(translation_key) if translation_key else None
+                    translation = get_translation_value(term_data) if term_data else None
+                
+                self.entries.append({
+                    'category': category,
+                    'term': term,
+                    'length': len(term),
+                    'translation': translation,
+                    'needs_boundary': ' ' not in term,
+                })
+        
+        self._automaton = _AhoCorasick([_fold(entry['term']) for entry in self.entries])
+    
+    def to_state(self):
+        # Plain lists and dicts only, so a persisted matcher never depends on this class's pickle layout
+        return {
+            "source_lang": self.source_lang,
+            "categories": self.categories,
+            "entries": self.entries,
+            "automaton": self._automaton.to_state(),
+        }
+    
+    @classmethod
+    def from_state(cls, state):
+        matcher = cls.__new__(cls)
+        matcher.source_lang = state["source_lang"]
+        matcher.categories = state["categories"]
+        matcher.entries = state["entries"]
+        matcher._automaton = _AhoCorasick.from_state(state["automaton"])
+        return matcher
+    
+    @staticmethod
+    def _has_boundary(text, position, covered):
+        before = position > 0 and (covered[position - 1] or _is_word_char(text[position - 1]))
+        after = position < len(text) and (covered[position] or _is_word_char(text[position]))
+        return before != after
+    
+    def find_matches(self, text):
+        occurrences = {}
+        for start, entry_id in self._automaton.iter_matches(_fold(text)):
+            occurrences.setdefault(entry_id, []).append(start)
+        
+        # covered marks characters already claimed by a higher-priority term; they stand in
+        # for the replacement token, which is made entirely of word characters
+        covered = bytearray(len(text))
+        matches = []
+        
+        for entry_id in sorted(occurrences):
+            entry = self.entries[entry_id]
+            length = entry['length']
+            accepted = []
+            last_end = -1
+            
+            for start in occurrences[entry_id]:
+                end = start + length
+                if start < last_end or any(covered[start:end]):
+                    continue
+                if entry['needs_boundary'] and not (
+                        self._has_boundary(text, start, covered) and self._has_boundary(text, end, covered)
+                ):
+                    continue
+                accepted.append((start, end))
+                last_end = end
+            
+            for start, end in accepted:
+                covered[start:end] = b'\x01' * (end - start)
+            
+            for start, end in reversed(accepted):
+                matches.append((start, end, entry))
+        
+        return matches
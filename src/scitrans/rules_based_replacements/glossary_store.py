@@ -0,0 +1,212 @@
+import hashlib
+import json
+import logging
+import os
+import pickle
+from pathlib import Path
+
+from scitrans import config
+from scitrans.rules_based_replacements.glossary_matcher import MATCHER_VERSION, GlossaryMatcher
+from scitrans.rules_based_replacements.token_utils import normalize_translations
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 2
+_MAX_CACHED_MATCHERS = 8
+GLOSSARY_CATEGORIES = ["nomenclature", "taxon", "site", "table", "acronym"]
+_SOURCE_LANGS = ("en", "fr")
+
+_stores = {}
+_matcher_cache = {}
+
+
+def index_path_for(json_path):
+    json_path = Path(json_path)
+    return json_path.with_name(json_path.stem + '.index.pickle')
+
+
+def _build_glossaries(translations, source_lang):
+    if source_lang == "en":
+        src_key, tgt_key = "english", "french"
+        src_acronym_key, tgt_acronym_key = "english_acronym", "french_acronym"
+    else:
+        src_key, tgt_key = "french", "english"
+        src_acronym_key, tgt_acronym_key = "french_acronym", "english_acronym"
+    
+    glossaries = {}
+    for category, entries in translations.items():
+        if not isinstance(entries, list):
+            continue
+        glossary = {}
+        for entry in entries:
+            if category == "acronym":
+                src = entry.get(src_acronym_key) or entry.get(src_key)
+                tgt = entry.get(tgt_acronym_key) or entry.get(tgt_key)
+            else:
+                src = entry.get(src_key)
+                tgt = entry.get(tgt_key)
+            if src and tgt:
+                glossary[src] = tgt
+        glossaries[category] = glossary
+    return glossaries
+
+
+def _build_table_translations(translations, source_lang):
+    source_key = "english" if source_lang == "en" else "french"
+    target_formatted_key = "fr_formatted" if source_lang == "en" else "en_formatted"
+    table_translations = {}
+    for entry in translations.get("table", []):
+        plain_key = entry.get(source_key, "")
+        formatted_value = entry.get(target_formatted_key, "")
+        if plain_key and formatted_value and plain_key not in table_translations:
+            table_translations[plain_key] = formatted_value
+    return table_translations
+
+
+def build_index(data):
+    translations = data.get("translations", data)
+    categorized = data.get("translations", {})
+    return {
+        "data": data,
+        "translations": normalize_translations(translations),
+        "glossaries": {lang: _build_glossaries(categorized, lang) for lang in _SOURCE_LANGS},
+        "table_translations": {lang: _build_table_translations(categorized, lang) for lang in _SOURCE_LANGS},
+        "matchers": {lang: GlossaryMatcher(translations, source_lang=lang).to_state() for lang in _SOURCE_LANGS},
+    }
+
+
+class GlossaryStore:
+    # One parsed, normalized copy of a glossary JSON per process. The compiled indexes are
+    # persisted to a pickle sidecar of plain data and rebuilt only when the JSON's mtime/size
+    # and hash change, or when the index or matcher code version does.
+    def __init__(self, json_path):
+        self.json_path = Path(json_path)
+        self.index_path = index_path_for(self.json_path)
+        self._stat_key = None
+        self._index = None
+        self._matchers = {}
+    
+    def _current_stat_key(self):
+        stat = os.stat(self.json_path)
+        return stat.st_mtime_ns, stat.st_size
+    
+    def _read_sidecar(self):
+        if not self.index_path.exists():
+            return None
+        try:
+            with open(self.index_path, 'rb') as f:
+                payload = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+        if not isinstance(payload, dict) or payload.get("version") != (INDEX_VERSION, MATCHER_VERSION):
+            return None
+        return payload
+    
+    def _write_sidecar(self, stat_key, sha256, index):
+        payload = {"version": (INDEX_VERSION, MATCHER_VERSION), "stat_key": stat_key, "sha256": sha256, "index": index}
+        tmp_path = self.index_path.with_name(self.index_path.name + '.tmp')
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            try:
+                tmp_path.unlink(missing_ok=True)
+            except OSError:
+                pass
+            logger.warning("could not write glossary index %s: %s", self.index_path, e)
+    
+    def _load(self, stat_key):
+        sidecar = self._read_sidecar()
+        if sidecar and sidecar["stat_key"] == stat_key:
+            return sidecar["index"]
+        
+        with open(self.json_path, 'rb') as f:
+            raw = f.read()
+        sha256 = hashlib.sha256(raw).hexdigest()
+        
+        if sidecar and sidecar["sha256"] == sha256:
+            index = sidecar["index"]
+        else:
+            index = build_index(json.loads(raw.decode('utf-8')))
+        self._write_sidecar(stat_key, sha256, index)
+        return index
+    
+    def _get_index(self):
+        stat_key = self._current_stat_key()
+        if self._index is None or stat_key != self._stat_key:
+            self._index = self._load(stat_key)
+            self._stat_key = stat_key
+            self._matchers = {}
+        return self._index
+    
+    def write_index(self):
+        self._index = None
+        self._get_index()
+        return self.index_path
+    
+    @property
+    def data(self):
+        return self._get_index()["data"]
+    
+    @property
+    def translations(self):
+        return self._get_index()["translations"]
+    
+    def glossary(self, source_lang, categories=None):
+        if source_lang not in _SOURCE_LANGS:
+            raise ValueError(f'source_lang must be "en" or "fr", got {source_lang!r}')
+        if categories is None:
+            categories = GLOSSARY_CATEGORIES
+        glossaries = self._get_index()["glossaries"][source_lang]
+        merged = {}
+        for category in categories:
+            merged.update(glossaries.get(category, {}))
+        return merged
+    
+    def table_translations(self, source_lang):
+        return self._get_index()["table_translations"][source_lang]
+    
+    def matcher(self, source_lang):
+        index = self._get_index()
+        if source_lang not in self._matchers:
+            self._matchers[source_lang] = GlossaryMatcher.from_state(index["matchers"][source_lang])
+        return self._matchers[source_lang]
+
+
+def get_glossary_store(json_path=None):
+    if json_path is None:
+        json_path = config.PREFERENTIAL_JSON_PATH
+    key = os.path.abspath(os.fspath(json_path))
+    if key not in _stores:
+        _stores[key] = GlossaryStore(key)
+    return _stores[key]
+
+
+def _translations_from_data(translations_data):
+    if 'translations' in translations_data:
+        return translations_data['translations']
+    return translations_data
+
+
+def get_glossary_matcher(translations_file, source_lang='fr'):
+    if not isinstance(translations_file, dict):
+        # file-backed glossaries share the process-wide store and its on-disk index
+        return get_glossary_store(translations_file).matcher(source_lang)
+    
+    cache_key = (id(translations_file), source_lang)
+    cached = _matcher_cache.get(cache_key)
+    # holding the dict in the cache entry keeps its id from being reused
+    if cached and cached[0] is translations_file:
+        return cached[1]
+    matcher = GlossaryMatcher(_translations_from_data(translations_file), source_lang)
+    
+    _matcher_cache.pop(cache_key, None)
+    while len(_matcher_cache) >= _MAX_CACHED_MATCHERS:
+        _matcher_cache.pop(next(iter(_matcher_cache)))
+    _matcher_cache[cache_key] = (translations_file, matcher)
+    return matcher
+
+
+def clear_matcher_cache():
+    _matcher_cache.clear()
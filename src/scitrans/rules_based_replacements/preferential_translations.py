@@ -1,7 +1,6 @@
 from scitrans.rules_based_replacements.replacements import (
     preprocess_for_translation,
-    postprocess_translation,
-    validate_tokens_replaced,
+    restore_tokens,
 )
 
 
@@ -18,11 +17,10 @@ def reverse_preferential_translations(translated_text, token_mapping, validate_t
     if not token_mapping:
         return translated_text
     
-    result_text = postprocess_translation(translated_text, token_mapping)
+    result_text, _, leftover_tokens = restore_tokens(translated_text, token_mapping)
     
-    if validate_tokens_flag:
-        if not validate_tokens_replaced(result_text, token_mapping):
-            return None
+    if validate_tokens_flag and leftover_tokens:
+        return None
     
     return result_text
 
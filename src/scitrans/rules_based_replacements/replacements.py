@@ -1,31 +1,36 @@
 import re
 import spacy
 
-from scitrans.rules_based_replacements.token_utils import (
-    create_replacement_token, load_translations, get_search_patterns,
-    get_translation_value, build_english_to_french_lookup,
-    normalize_translations
-)
+from scitrans import config
+from scitrans.rules_based_replacements.glossary_store import get_glossary_matcher
+from scitrans.rules_based_replacements.token_utils import create_replacement_token
 
 _spacy_models = {}
+_person_name_cache = {}
 
+_SPACY_MODEL_NAMES = {
+    'en': 'en_core_web_lg',
+    'fr': 'fr_core_news_lg'
+}
+# Only the entity recognizer is needed for name protection
+_NON_NER_COMPONENTS = ['tagger', 'parser', 'attribute_ruler', 'lemmatizer', 'morphologizer', 'senter']
 
-def detect_person_names(text, source_lang):
-    model_name_map = {
-        'en': 'en_core_web_lg',
-        'fr': 'fr_core_news_lg'
-    }
-    
-    model_name = model_name_map.get(source_lang)
+
+def _load_ner_model(source_lang):
+    model_name = _SPACY_MODEL_NAMES.get(source_lang)
     if not model_name:
-        return []
+        return None
     
     if model_name not in _spacy_models:
-        _spacy_models[model_name] = spacy.load(model_name)
-    
-    nlp = _spacy_models[model_name]
-    doc = nlp(text)
+        nlp = spacy.load(model_name, exclude=_NON_NER_COMPONENTS)
+        if 'tok2vec' in nlp.pipe_names and 'ner' not in nlp.get_pipe('tok2vec').listening_components:
+            nlp.remove_pipe('tok2vec')
+        _spacy_models[model_name] = nlp
     
+    return _spacy_models[model_name]
+
+
+def _person_entities(doc):
     person_entities = []
     for ent in doc.ents:
         if ent.label_ == 'PER' or ent.label_ == 'PERSON':
@@ -34,6 +39,44 @@ def detect_person_names(text, source_lang):
     return sorted(person_entities, key=lambda x: x[0], reverse=True)
 
 
+def detect_person_names(text, source_lang):
+    cache_key = (source_lang, text)
+    if cache_key in _person_name_cache:
+        return list(_person_name_cache[cache_key])
+    
+    nlp = _load_ner_model(source_lang)
+    if nlp is None:
+        return []
+    
+    person_entities = _person_entities(nlp(text))
+    _person_name_cache[cache_key] = person_entities
+    return list(person_entities)
+
+
+def prefetch_person_names(texts, source_lang, batch_size=64, n_process=1):
+    # Runs NER over every segment of a document in batches so detect_person_names
+    # becomes a cache lookup during translation
+    nlp = _load_ner_model(source_lang)
+    if nlp is None:
+        return 0
+    
+    pending = list(dict.fromkeys(
+        text for text in texts
+        if text and text.strip() and (source_lang, text) not in _person_name_cache
+    ))
+    if not pending:
+        return 0
+    
+    for text, doc in zip(pending, nlp.pipe(pending, batch_size=batch_size, n_process=n_process)):
+        _person_name_cache[(source_lang, text)] = _person_entities(doc)
+    
+    return len(pending)
+
+
+def clear_person_name_cache():
+    _person_name_cache.clear()
+
+
 def replace_whole_word(text, word, replacement):
     pattern = r'(?<!\S)' + re.escape(word) + r'(?=\s|[.,;:!?]|$)'
     return re.sub(pattern, replacement, text)
@@ -59,78 +102,29 @@ def find_translation_matches(source, target, source_lang, french_index, english_
 
 
 def preprocess_for_translation(text, translations_file, source_lang='fr'):
-    # Accept a pre-loaded dict to avoid repeated disk I/O at the call site
-    if isinstance(translations_file, dict):
-        translations_data = translations_file
-    else:
-        translations_data = load_translations(translations_file)
-    
-    if 'translations' in translations_data:
-        translations = translations_data['translations']
-    else:
-        translations = translations_data
-    
-    translations = normalize_translations(translations)
-    patterns = get_search_patterns(translations, source_lang)
+    # Accepts a pre-loaded dict or a path; the compiled matcher is cached per glossary
+    matcher = get_glossary_matcher(translations_file, source_lang)
     
-    en_to_fr_lookup = None
-    if source_lang == 'en':
-        en_to_fr_lookup = build_english_to_french_lookup(translations)
-    
-    processed_text = text
     token_mapping = {}
     token_counters = {}
+    replacements = []
     
-    for category in translations.keys():
-        token_counters[category] = 0
-    
-    token_counters['name'] = 0
-    
-    replaced_spans = []
-    
-    for category, terms in patterns.items():
-        for term in terms:
-            if ' ' in term:
-                pattern = re.compile(re.escape(term), re.IGNORECASE)
-            else:
-                pattern = re.compile(r'\b' + re.escape(term) + r'\b', re.IGNORECASE)
-            
-            matches = list(pattern.finditer(processed_text))
-            
-            for match in reversed(matches):
-                original_text = match.group()
-                start, end = match.span()
-                
-                replaced_spans.append((start, end))
-                
-                if source_lang == 'en':
-                    lookup_result = en_to_fr_lookup.get(term.lower())
-                    if not lookup_result:
-                        continue
-                    found_category, french_term, term_data = lookup_result
-                    translation = french_term
-                else:
-                    translation_key = None
-                    for original_key in translations[category].keys():
-                        if original_key.lower() == term.lower():
-                            translation_key = original_key
-                            break
-                    term_data = translations[category].get(translation_key) if translation_key else None
-                    translation = get_translation_value(term_data) if term_data else None
-                
-                token_counters[category] += 1
-                token = create_replacement_token(category, token_counters[category])
-                
-                token_mapping[token] = {
-                    'original_text': original_text,
-                    'category': category,
-                    'translation': translation,
-                    'should_translate': True
-                }
-                
-                processed_text = processed_text[:start] + token + processed_text[end:]
+    for start, end, entry in matcher.find_matches(text):
+        category = entry['category']
+        token_counters[category] = token_counters.get(category, 0) + 1
+        token = create_replacement_token(category, token_counters[category])
+        
+        token_mapping[token] = {
+            'original_text': text[start:end],
+            'category': category,
+            'translation': entry['translation'],
+            'should_translate': True
+        }
+        replacements.append((start, end, token))
     
+    replaced_spans = [(start, end) for start, end, _ in replacements]
     detected_names = detect_person_names(text, source_lang)
+    name_counter = 0
     
     for name_start, name_end, name_text in detected_names:
         has_overlap = False
@@ -140,8 +134,8 @@ def preprocess_for_translation(text, translations_file, source_lang='fr'):
                 break
         
         if not has_overlap:
-            token_counters['name'] += 1
-            token = create_replacement_token('name', token_counters['name'])
+            name_counter += 1
+            token = create_replacement_token('name', name_counter)
             
             token_mapping[token] = {
                 'original_text': name_text,
@@ -149,10 +143,59 @@ def preprocess_for_translation(text, translations_file, source_lang='fr'):
                 'translation': None,
                 'should_translate': False
             }
-            
-            processed_text = processed_text[:name_start] + token + processed_text[name_end:]
+            replacements.append((name_start, name_end, token))
+    
+    # All spans are offsets into the original text, so the output is built in one pass
+    parts = []
+    position = 0
+    for start, end, token in sorted(replacements):
+        parts.append(text[position:start])
+        parts.append(token)
+        position = end
+    parts.append(text[position:])
+    
+    return ''.join(parts), token_mapping
+
+
+def _is_single_subword(tokenizer, text):
+    ids = tokenizer(text, add_special_tokens=False)["input_ids"]
+    if len(ids) != 1 or ids[0] == getattr(tokenizer, "unk_token_id", None):
+        return False
+    return tokenizer.decode(ids, skip_special_tokens=True).strip() == text
+
+
+class PlaceholderScheme:
+    # How protected terms are written into one model's input. preprocess_for_translation
+    # always produces category tokens (NOMENCLATURE0001), which most subword vocabularies
+    # split into several pieces; the "sentinel" scheme renames them to rare strings the
+    # model's tokenizer keeps whole. The token mapping is renamed with the text, so
+    # restore_tokens works the same for both.
+    def __init__(self, name="category", sentinels=()):
+        self.name = name
+        self.sentinels = list(sentinels)
+    
+    @classmethod
+    def for_tokenizer(cls, tokenizer, candidates=None, min_sentinels=None):
+        settings = config.PLACEHOLDER_CONFIG
+        candidates = candidates or settings["sentinels"]
+        min_sentinels = min_sentinels or settings["min_sentinels"]
+        sentinels = [candidate for candidate in candidates if _is_single_subword(tokenizer, candidate)]
+        if len(sentinels) < min_sentinels:
+            return cls("category")
+        return cls("sentinel", sentinels)
     
-    return processed_text, token_mapping
+    def apply(self, text, token_mapping):
+        if self.name != "sentinel" or not token_mapping:
+            return text, token_mapping
+        # Sentinels already in the segment (a Greek letter in a formula) are not reused;
+        # a segment with more tokens than free sentinels keeps its category tokens
+        available = [sentinel for sentinel in self.sentinels if sentinel not in text]
+        if len(available) < len(token_mapping):
+            return text, token_mapping
+        renames = dict(zip(token_mapping, available))
+        pattern = '|'.join(re.escape(token) for token in sorted(renames, key=len, reverse=True))
+        renamed_text = re.sub(pattern, lambda match: renames[match.group()], text)
+        return renamed_text, {renames[token]: mapping for token, mapping in token_mapping.items()}
 
 
 def preserve_capitalization(original_text, replacement_text, is_sentence_start=False):
@@ -194,32 +237,128 @@ def find_corrupted_token(text, token):
     return (False, None, None)
 
 
-def postprocess_translation(translated_text, token_mapping):
-    result_text = translated_text
+_TOKEN_SHAPE = re.compile(r'^([A-Z]+)(\d+)$')
+_FORM_PRIORITY = {'exact': 0, 'spaced': 1, 'plural': 2}
+_token_pattern_cache = {}
+
+
+def _compile_token_pattern(tokens):
+    prefixes = set()
+    literals = []
+    for token in tokens:
+        shape = _TOKEN_SHAPE.match(token)
+        if shape:
+            prefixes.add(shape.group(1))
+        else:
+            literals.append(token)
     
-    for token in token_mapping.keys():
-        found, position, corrupted_form = find_corrupted_token(result_text, token)
+    cache_key = (frozenset(prefixes), frozenset(literals))
+    if cache_key not in _token_pattern_cache:
+        alternatives = []
+        if literals:
+            alternatives.append(
+                '(?P<literal>' + '|'.join(re.escape(t) for t in sorted(literals, key=len, reverse=True)) + ')'
+                r'(?P<literal_plural>(?:e?s)?)'
+            )
+        if prefixes:
+            alternatives.append(
+                '(?P<prefix>' + '|'.join(re.escape(p) for p in sorted(prefixes, key=len, reverse=True)) + ')'
+                r'(?:(?P<digits>\d+)(?P<plural>(?:e?s)?)|\s+(?P<spaced>\d+))'
+            )
+        _token_pattern_cache[cache_key] = re.compile('|'.join(alternatives))
+    return _token_pattern_cache[cache_key]
+
+
+def _is_bounded(text, start, end, literals=None):
+    # Sentinels (literals) are symbols, never part of a word, so the model may attach them to
+    # the word before ("deΩ") or to another sentinel; only letters running on after them count
+    if literals is not None:
+        return not (end < len(text) and (text[end].isalnum() or text[end] == '_') and text[end] not in literals)
+    before = start > 0 and (text[start - 1].isalnum() or text[start - 1] == '_')
+    after = end < len(text) and (text[end].isalnum() or text[end] == '_')
+    return not before and not after
+
+
+def scan_tokens(text, tokens):
+    # One pass over the text finds every exact ("TAXON0001", "Ω"), spaced ("TAXON 0001") and
+    # pluralized ("TAXON0001s", "Ωs") placeholder. Each token claims its best form, preferring
+    # exact over spaced over plural and then the leftmost, as find_corrupted_token does.
+    # Returns ({token: (start, end)}, leftover) where leftover lists tokens whose literal
+    # text is still present outside the claimed span.
+    tokens = set(tokens)
+    if not tokens or not text:
+        return {}, []
+    
+    candidates = {}
+    leftover = set()
+    for match in _compile_token_pattern(tokens).finditer(text):
+        start, end = match.span()
+        groups = match.groupdict()
+        if groups.get('literal'):
+            token = groups['literal']
+            form = 'plural' if groups['literal_plural'] else 'exact'
+        elif groups.get('spaced') is not None:
+            token, form = groups['prefix'] + groups['spaced'], 'spaced'
+        else:
+            token = groups['prefix'] + groups['digits']
+            form = 'plural' if groups['plural'] else 'exact'
+            if token not in tokens:
+                # e.g. "TAXON00012" still contains TAXON0001
+                leftover.update(t for t in tokens if token.startswith(t))
+                continue
         
-        if found:
-            mapping = token_mapping[token]
-            
-            is_sentence_start = False
-            if position == 0:
-                is_sentence_start = True
-            elif position > 0:
-                preceding_text = result_text[:position].rstrip()
-                if preceding_text and preceding_text[-1] in '.!?':
-                    is_sentence_start = True
-            
-            if mapping['should_translate'] and mapping['translation'] and mapping['translation'] != 'None':
-                replacement = preserve_capitalization(mapping['original_text'], mapping['translation'], is_sentence_start)
-            else:
-                replacement = mapping['original_text']
-            
-            pattern = r'\b' + re.escape(corrupted_form) + r'\b'
-            result_text = re.sub(pattern, replacement, result_text, count=1)
+        if token not in tokens:
+            continue
+        if not _is_bounded(text, start, end, tokens if groups.get('literal') else None):
+            if form != 'spaced':
+                leftover.add(token)
+            continue
+        candidates.setdefault(token, []).append((_FORM_PRIORITY[form], start, end, form))
+    
+    found = {}
+    for token, token_candidates in candidates.items():
+        token_candidates.sort()
+        _, start, end, _ = token_candidates[0]
+        found[token] = (start, end)
+        if any(form != 'spaced' for _, _, _, form in token_candidates[1:]):
+            leftover.add(token)
+    
+    return found, sorted(leftover)
+
+
+def restore_tokens(translated_text, token_mapping):
+    # Returns (restored_text, missing_tokens, leftover_tokens) from a single scan
+    found, leftover = scan_tokens(translated_text, token_mapping.keys())
+    missing = [token for token in token_mapping if token not in found]
     
-    return result_text
+    parts = []
+    position = 0
+    last_char = ''
+    for start, end, token in sorted((start, end, token) for token, (start, end) in found.items()):
+        preceding = translated_text[position:start]
+        parts.append(preceding)
+        if preceding.rstrip():
+            last_char = preceding.rstrip()[-1]
+        
+        is_sentence_start = start == 0 or (bool(last_char) and last_char in '.!?')
+        
+        mapping = token_mapping[token]
+        if mapping['should_translate'] and mapping['translation'] and mapping['translation'] != 'None':
+            replacement = preserve_capitalization(mapping['original_text'], mapping['translation'], is_sentence_start)
+        else:
+            replacement = mapping['original_text']
+        
+        parts.append(replacement)
+        if replacement.rstrip():
+            last_char = replacement.rstrip()[-1]
+        position = end
+    parts.append(translated_text[position:])
+    
+    return ''.join(parts), missing, leftover
+
+
+def postprocess_translation(translated_text, token_mapping):
+    return restore_tokens(translated_text, token_mapping)[0]
 
 
 def validate_tokens_replaced(text, token_mapping):
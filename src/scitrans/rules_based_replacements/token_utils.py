@@ -1,4 +1,5 @@
 import json
+
 from scipy.stats import pareto
 
 
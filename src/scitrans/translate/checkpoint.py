@@ -0,0 +1,113 @@
+import hashlib
+import json
+import logging
+import os
+import time
+
+from scitrans import config
+from scitrans.translate.segment_map import normalize_segment, segment_hash
+
+CHECKPOINT_VERSION = 1
+
+logger = logging.getLogger(__name__)
+
+
+def checkpoint_path_for(input_docx_file, target_lang):
+    # Keyed to the input rather than the output, whose default name carries the date
+    return f"{os.path.splitext(input_docx_file)[0]}_{target_lang}_checkpoint.json"
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def location_key(location):
+    if not location:
+        return ''
+    return ','.join(f'{key}={location[key]}' for key in sorted(location))
+
+
+class TranslationCheckpoint:
+    # Per-segment results of an unfinished translate_word_document run, saved to a sidecar
+    # so a rerun on the same input only sends the unfinished segments to the models.
+    # Entries are keyed by document location and segment hash, and the whole file is
+    # discarded when the input or the settings that shape the output change.
+    def __init__(self, path, fingerprint, save_every=None, save_interval=None):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.save_every = save_every or config.CHECKPOINT_CONFIG["save_every"]
+        self.save_interval = save_interval or config.CHECKPOINT_CONFIG["save_interval_seconds"]
+        self.segments = {}
+        self.resumed = 0
+        self._pending = 0
+        self._last_save = time.monotonic()
+    
+    @classmethod
+    def open(cls, path, input_docx_file, source_lang, chunk_by, use_find_replace, **kwargs):
+        fingerprint = {
+            "input_sha256": _file_sha256(input_docx_file),
+            "source_lang": source_lang,
+            "chunk_by": str(chunk_by),
+            "use_find_replace": bool(use_find_replace),
+        }
+        checkpoint = cls(path, fingerprint, **kwargs)
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning("Ignoring unreadable checkpoint %s: %s", path, e)
+                return checkpoint
+            if data.get("version") == CHECKPOINT_VERSION and data.get("fingerprint") == fingerprint:
+                checkpoint.segments = data.get("segments", {})
+            else:
+                logger.info("Checkpoint %s was written for a different input or settings; starting over", path)
+        return checkpoint
+    
+    @staticmethod
+    def _key(location, source_text):
+        return f"{location_key(location)}|{segment_hash(source_text)}"
+    
+    def contains(self, location, source_text):
+        return self._key(location, source_text) in self.segments
+    
+    def lookup(self, location, source_text):
+        if not normalize_segment(source_text):
+            return None
+        translated = self.segments.get(self._key(location, source_text))
+        if translated is not None:
+            self.resumed += 1
+        return translated
+    
+    def record(self, location, source_text, translated_text):
+        if not normalize_segment(source_text):
+            return
+        self.segments[self._key(location, source_text)] = translated_text
+        self._pending += 1
+        if self._pending >= self.save_every or time.monotonic() - self._last_save >= self.save_interval:
+            self.save()
+    
+    def save(self):
+        if not self._pending:
+            return
+        data = {"version": CHECKPOINT_VERSION, "fingerprint": self.fingerprint, "segments": self.segments}
+        tmp_path = self.path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning("Could not write checkpoint %s: %s", self.path, e)
+            return
+        self._pending = 0
+        self._last_save = time.monotonic()
+    
+    def discard(self):
+        self.segments = {}
+        self._pending = 0
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,124 @@
+import functools
+import json
+import os
+
+from scitrans import config
+from scitrans.translate.segment_map import normalize_segment, segment_hash
+
+_translation_indexes = {}
+
+
+def _iter_jsonl_pairs(path, source_lang):
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if record.get("source_lang") == source_lang:
+                yield record.get("source"), record.get("target")
+
+
+def _iter_pickle_pairs(path, source_lang, min_similarity=None):
+    import pandas as pd
+    
+    target_lang = "fr" if source_lang == "en" else "en"
+    dataframe = pd.read_pickle(path)
+    # The raw matches include the low-similarity (misaligned) pairs the training data drops
+    if min_similarity is not None and "similarity" in dataframe:
+        dataframe = dataframe[dataframe["similarity"] >= min_similarity]
+    yield from zip(dataframe[source_lang], dataframe[target_lang])
+
+
+def _held_out_hashes(paths):
+    # Both sides of every held-out pair, in either direction; the matched pickles still contain them
+    held_out = set()
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        for source_lang in ("en", "fr"):
+            for source_text, target_text in _iter_jsonl_pairs(path, source_lang):
+                held_out.update(segment_hash(text) for text in (source_text, target_text) if isinstance(text, str))
+    return held_out
+
+
+def _build_translation_index(
+        source_lang, jsonl_paths, pickle_paths, min_words, exclude_jsonl_paths=(), min_similarity=None
+):
+    # segment hash -> {normalized translation: (translation, corpus file)}
+    held_out = _held_out_hashes(exclude_jsonl_paths)
+    candidates = {}
+    iter_pickle_pairs = functools.partial(_iter_pickle_pairs, min_similarity=min_similarity)
+    sources = [(path, _iter_jsonl_pairs) for path in jsonl_paths] + [(path, iter_pickle_pairs) for path in pickle_paths]
+    for path, iter_pairs in sources:
+        if not os.path.exists(path):
+            continue
+        corpus_name = os.path.basename(path)
+        for source_text, target_text in iter_pairs(path, source_lang):
+            if not isinstance(source_text, str) or not isinstance(target_text, str) or not target_text.strip():
+                continue
+            if len(normalize_segment(source_text).split()) < min_words:
+                continue
+            if segment_hash(source_text) in held_out or segment_hash(target_text) in held_out:
+                continue
+            targets = candidates.setdefault(segment_hash(source_text), {})
+            targets.setdefault(normalize_segment(target_text), (target_text.strip(), corpus_name))
+    
+    # A sentence aligned to more than one translation depends on its context and is left to the models
+    return {key: next(iter(targets.values())) for key, targets in candidates.items() if len(targets) == 1}
+
+
+class CorpusLookup:
+    # Human reference translations for segments that appear word for word (after
+    # whitespace and Unicode normalization) in the aligned bilingual corpora. A hit
+    # replaces the model call for that segment, and the matches are kept, in order,
+    # so the run can note where each translation came from. Pairs in the held-out
+    # test split are never used, so evaluation segments are still generated.
+    def __init__(self, translations, source_lang="en"):
+        self.translations = translations
+        self.source_lang = source_lang
+        self.matches = []
+    
+    @classmethod
+    def load(cls, source_lang="en", jsonl_paths=None, pickle_paths=None, min_words=None, exclude_jsonl_paths=None,
+             min_similarity=None):
+        settings = config.CORPUS_LOOKUP_CONFIG
+        jsonl_paths = [os.fspath(path) for path in (jsonl_paths or settings["jsonl_paths"])]
+        pickle_paths = [os.fspath(path) for path in (pickle_paths or settings["pickle_paths"])]
+        min_words = min_words or settings["min_words"]
+        min_similarity = min_similarity if min_similarity is not None else settings["min_similarity"]
+        if exclude_jsonl_paths is None:
+            exclude_jsonl_paths = settings["exclude_jsonl_paths"]
+        exclude_jsonl_paths = [os.fspath(path) for path in exclude_jsonl_paths]
+        key = (source_lang, tuple(jsonl_paths), tuple(pickle_paths), min_words, tuple(exclude_jsonl_paths), min_similarity)
+        if key not in _translation_indexes:
+            _translation_indexes[key] = _build_translation_index(
+                source_lang, jsonl_paths, pickle_paths, min_words, exclude_jsonl_paths, min_similarity
+            )
+        return cls(_translation_indexes[key], source_lang=source_lang)
+    
+    def __contains__(self, text):
+        # A peek that leaves the matches alone
+        return bool(normalize_segment(text)) and segment_hash(text) in self.translations
+    
+    def __len__(self):
+        return len(self.translations)
+    
+    def translate(self, text):
+        if not normalize_segment(text):
+            return None
+        entry = self.translations.get(segment_hash(text))
+        if entry is None:
+            return None
+        translated, corpus_name = entry
+        self.matches.append((text.strip(), corpus_name))
+        leading = text[:len(text) - len(text.lstrip())]
+        trailing = text[len(text.rstrip()):]
+        return f"{leading}{translated}{trailing}"
+
+
+def format_corpus_stats(matches):
+    counts = {}
+    for _text, corpus_name in matches:
+        counts[corpus_name] = counts.get(corpus_name, 0) + 1
+    details = ", ".join(f"{name}={count}" for name, count in sorted(counts.items()))
+    return f"Used reference translations from the bilingual corpus for {len(matches)} segments ({details})"
@@ -0,0 +1,113 @@
+import time
+
+from scitrans import config
+
+
+class DeadlineScheduler:
+    # Chooses a strategy for each segment so a document finishes within its time budget.
+    # Measured latency is kept per unit of level cost, so one estimate covers every
+    # level; the first (best quality) level whose projected finish still fits the budget
+    # is used, and the scheduler moves back up once the run is ahead again.
+    def __init__(self, time_budget, progress, levels=None, safety_margin=None, smoothing=None, clock=time.monotonic):
+        settings = config.DEADLINE_CONFIG
+        self.time_budget = time_budget
+        self.progress = progress
+        self.levels = levels or settings["levels"]
+        self.safety_margin = safety_margin or settings["safety_margin"]
+        self.smoothing = smoothing or settings["latency_smoothing"]
+        self.clock = clock
+        self.unit_latency = None
+        self.level_counts = {}
+        self._started_at = None
+    
+    def start(self):
+        self._started_at = self.clock()
+    
+    def elapsed(self):
+        return self.clock() - self._started_at if self._started_at is not None else 0.0
+    
+    def choose_level(self):
+        if self.unit_latency is None:
+            return self.levels[0]
+        # The segment about to be translated is still counted as remaining
+        remaining = max(self.progress.total - self.progress.done, 1)
+        available = self.time_budget * self.safety_margin - self.elapsed()
+        for level in self.levels:
+            if remaining * self.unit_latency * level["cost"] <= available:
+                return level
+        return self.levels[-1]
+    
+    def record(self, level, seconds):
+        observed = seconds / level["cost"]
+        if self.unit_latency is None:
+            self.unit_latency = observed
+        else:
+            self.unit_latency = self.smoothing * observed + (1 - self.smoothing) * self.unit_latency
+        self.level_counts[level["name"]] = self.level_counts.get(level["name"], 0) + 1
+    
+    def is_degraded(self, level):
+        return level is not self.levels[0]
+
+
+class DeadlineTranslationManager:
+    # Stands in for a TranslationManager and routes every segment through the scheduler:
+    # the chosen level limits the ensemble, beams and retries, and every segment gets
+    # segment_timeout seconds across all its models and retries. Segments produced below
+    # the full level, or cut short by the timeout, are listed in degraded
+    def __init__(self, translation_manager, scheduler, segment_timeout=None):
+        self.translation_manager = translation_manager
+        self.scheduler = scheduler
+        self.segment_timeout = segment_timeout or config.DEADLINE_CONFIG["segment_timeout_seconds"]
+        self.model_wins = {}
+        self.degraded = []
+    
+    def __getattr__(self, name):
+        return getattr(self.translation_manager, name)
+    
+    def _model_names(self, max_models):
+        names = list(getattr(self.translation_manager, "loaded_models", None) or ())
+        if not names or max_models is None or max_models >= len(names):
+            return None
+        # Keep the models that have won most often on this document; ties keep config order
+        ranked = sorted(names, key=lambda name: -self.model_wins.get(name, 0))
+        return ranked[:max_models]
+    
+    def translate_with_best_model(self, text, generation_kwargs=None, **kwargs):
+        level = self.scheduler.choose_level()
+        generation_kwargs = dict(generation_kwargs or {})
+        if "num_beams" in level:
+            generation_kwargs["num_beams"] = level["num_beams"]
+        if level.get("single_attempt"):
+            kwargs["single_attempt"] = True
+        
+        cached = kwargs.get("use_cache", True) and text in getattr(self.translation_manager, "translation_cache", ())
+        started = self.scheduler.clock()
+        result = self.translation_manager.translate_with_best_model(
+            text, generation_kwargs=generation_kwargs, model_names=self._model_names(level.get("max_models")),
+            time_limit=self.segment_timeout, **kwargs
+        )
+        if cached:
+            return result
+        
+        self.scheduler.record(level, self.scheduler.clock() - started)
+        winner = result.get("best_model_source")
+        if winner:
+            self.model_wins[winner] = self.model_wins.get(winner, 0) + 1
+        degraded = level["name"] if self.scheduler.is_degraded(level) else None
+        if result.get("timed_out"):
+            degraded = "timed_out"
+        if degraded:
+            self.degraded.append((text, degraded))
+            result = {**result, "degraded": degraded}
+        return result
+
+
+def format_deadline_stats(scheduler, degraded):
+    counts = {}
+    for _text, level_name in degraded:
+        counts[level_name] = counts.get(level_name, 0) + 1
+    details = ", ".join(f"{name}={count}" for name, count in sorted(counts.items()))
+    summary = f"Finished in {scheduler.elapsed():.0f}s of a {scheduler.time_budget:.0f}s budget"
+    if not degraded:
+        return summary
+    return f"{summary}; {len(degraded)} segments translated in degraded mode ({details})"
@@ -0,0 +1,161 @@
+import argparse
+import json
+import logging
+import os
+
+from scitrans import config
+
+logger = logging.getLogger(__name__)
+
+STATS_VERSION = 1
+
+
+def length_bucket(text, bounds=None):
+    bounds = bounds or config.ENSEMBLE_STATS_CONFIG["length_buckets"]
+    words = len(text.split())
+    lower = 1
+    for bound in bounds:
+        if words <= bound:
+            return f"{lower}-{bound}"
+        lower = bound + 1
+    return f"{lower}+"
+
+
+def context_key(text, source_lang, target_lang, bounds=None):
+    return f"{source_lang}-{target_lang}/{length_bucket(text, bounds)}"
+
+
+def prune_decisions(context, min_segments=None, min_win_rate=None):
+    # model -> (keep, reason) for one context. A model is dropped once it has enough segments
+    # and wins too rarely, or wins mostly by margins too small to change the output much
+    settings = config.ENSEMBLE_STATS_CONFIG
+    min_segments = min_segments if min_segments is not None else settings["min_segments"]
+    min_win_rate = min_win_rate if min_win_rate is not None else settings["min_win_rate"]
+    
+    decisions = {}
+    for model_name, entry in context["models"].items():
+        segments = entry["segments"]
+        win_rate = entry["wins"] / segments if segments else 0.0
+        clear_win_rate = (entry["wins"] - entry["negligible_wins"]) / segments if segments else 0.0
+        if segments < min_segments:
+            decisions[model_name] = (True, f"only {segments} segments recorded (needs {min_segments})")
+        elif win_rate < min_win_rate:
+            decisions[model_name] = (False, f"won {win_rate:.1%} of {segments} segments (below {min_win_rate:.1%})")
+        elif clear_win_rate < min_win_rate:
+            decisions[model_name] = (False, (
+                f"won {win_rate:.1%} of {segments} segments, but {entry['negligible_wins']} of its "
+                f"{entry['wins']} wins were by a negligible margin"
+            ))
+        else:
+            decisions[model_name] = (True, f"won {win_rate:.1%} of {segments} segments ({clear_win_rate:.1%} by a clear margin)")
+    
+    if decisions and not any(keep for keep, _ in decisions.values()):
+        # Something has to translate; the most frequent winner stays
+        top_model = max(context["models"], key=lambda name: context["models"][name]["wins"])
+        decisions[top_model] = (True, f"{decisions[top_model][1]}; kept as the most frequent winner")
+    return decisions
+
+
+class EnsembleStats:
+    # How often each model's translation was picked as the best one, per direction and
+    # segment-length bucket, with the similarity margin over the runner-up. Only segments
+    # where at least two models competed are counted. Saved between runs so the counts
+    # accumulate, and used to leave out models that rarely make a difference (auto-prune).
+    def __init__(self, contexts=None, negligible_margin=None, path=None):
+        self.contexts = contexts if contexts is not None else {}
+        if negligible_margin is None:
+            negligible_margin = config.ENSEMBLE_STATS_CONFIG["negligible_margin"]
+        self.negligible_margin = negligible_margin
+        self.path = path
+        self.segments_seen = {}
+    
+    @classmethod
+    def load(cls, path=None):
+        path = os.fspath(path or config.ENSEMBLE_STATS_CONFIG["stats_path"])
+        if not os.path.exists(path):
+            return cls(path=path)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable ensemble stats %s: %s", path, e)
+            return cls(path=path)
+        if saved.get("version") != STATS_VERSION:
+            return cls(path=path)
+        # The margin the saved counts were made with is kept, so old and new counts agree
+        return cls(saved["contexts"], saved["negligible_margin"], path=path)
+    
+    def save(self, path=None):
+        path = os.fspath(path or self.path or config.ENSEMBLE_STATS_CONFIG["stats_path"])
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"version": STATS_VERSION, "negligible_margin": self.negligible_margin,
+                       "contexts": self.contexts}, f, indent=2)
+        os.replace(tmp_path, path)
+        return path
+    
+    def record(self, text, source_lang, target_lang, model_names, similarities, best_model):
+        # similarities: similarity_vs_source of each model whose translation was valid
+        if len(model_names) < 2 or best_model is None:
+            return
+        context = self.contexts.setdefault(context_key(text, source_lang, target_lang), {"segments": 0, "models": {}})
+        context["segments"] += 1
+        for model_name in model_names:
+            entry = context["models"].setdefault(
+                model_name, {"segments": 0, "wins": 0, "negligible_wins": 0, "margin_total": 0.0, "margins": 0}
+            )
+            entry["segments"] += 1
+        
+        winner = context["models"][best_model]
+        winner["wins"] += 1
+        best_similarity = similarities.get(best_model)
+        runner_up = [similarity for name, similarity in similarities.items()
+                     if name != best_model and similarity is not None]
+        if best_similarity is not None and runner_up:
+            margin = best_similarity - max(runner_up)
+            winner["margin_total"] += margin
+            winner["margins"] += 1
+            if margin < self.negligible_margin:
+                winner["negligible_wins"] += 1
+    
+    def select_models(self, model_names, text, source_lang, target_lang, explore_every=None):
+        # The models worth running for this segment; every explore_every-th segment of a
+        # context runs them all so a dropped model's counts keep up with the others
+        if explore_every is None:
+            explore_every = config.ENSEMBLE_STATS_CONFIG["explore_every"]
+        key = context_key(text, source_lang, target_lang)
+        self.segments_seen[key] = self.segments_seen.get(key, 0) + 1
+        context = self.contexts.get(key)
+        if context is None or (explore_every and self.segments_seen[key] % explore_every == 0):
+            return list(model_names)
+        
+        decisions = prune_decisions(context)
+        selected = [name for name in model_names if decisions.get(name, (True, None))[0]]
+        return selected or list(model_names)
+
+
+def format_ensemble_report(stats, min_segments=None, min_win_rate=None):
+    lines = [f"Ensemble wins (negligible margin < {stats.negligible_margin})"]
+    for key in sorted(stats.contexts):
+        context = stats.contexts[key]
+        lines.append(f"{key}: {context['segments']} segments")
+        decisions = prune_decisions(context, min_segments, min_win_rate)
+        for model_name, entry in sorted(context["models"].items(), key=lambda item: -item[1]["wins"]):
+            keep, reason = decisions[model_name]
+            mean_margin = entry["margin_total"] / entry["margins"] if entry["margins"] else float("nan")
+            lines.append(
+                f"  {model_name}: {entry['wins']}/{entry['segments']} wins, mean margin {mean_margin:.4f}, "
+                f"{'keep' if keep else 'drop'} ({reason})"
+            )
+    return "\n".join(lines)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--path', help='Stats file (defaults to ENSEMBLE_STATS_CONFIG["stats_path"])')
+    parser.add_argument('--min-segments', type=int)
+    parser.add_argument('--min-win-rate', type=float)
+    args = parser.parse_args()
+    
+    print(format_ensemble_report(EnsembleStats.load(args.path), args.min_segments, args.min_win_rate))
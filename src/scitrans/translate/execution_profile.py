@@ -0,0 +1,207 @@
+import argparse
+import json
+import logging
+import os
+import socket
+import time
+
+import torch
+
+from scitrans import config
+from scitrans.translate.models import TranslationManager, get_model_config
+
+logger = logging.getLogger(__name__)
+
+PROFILE_VERSION = 1
+
+
+def profile_path_for(host=None, profile_dir=None):
+    profile_dir = profile_dir or config.EXECUTION_PROFILE_CONFIG["profile_dir"]
+    return os.path.join(profile_dir, f"{host or socket.gethostname()}.json")
+
+
+def _hardware():
+    # A profile is only trusted on the hardware and torch build it was measured with
+    return {"cpu_count": os.cpu_count(), "torch_version": torch.__version__}
+
+
+def load_execution_profile(path=None):
+    path = path or profile_path_for()
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            profile = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning("Ignoring unreadable execution profile %s: %s", path, e)
+        return None
+    if profile.get("version") != PROFILE_VERSION or profile.get("hardware") != _hardware():
+        logger.info("Execution profile %s was tuned on different hardware; using the defaults", path)
+        return None
+    return profile
+
+
+def save_execution_profile(profile, path=None):
+    path = path or profile_path_for()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(profile, f, indent=2)
+    os.replace(tmp_path, path)
+    return path
+
+
+def _set_interop_threads(num_threads):
+    if torch.get_num_interop_threads() == num_threads:
+        return
+    try:
+        torch.set_num_interop_threads(num_threads)
+    except RuntimeError:
+        # torch only accepts this before the first inter-op parallel work in the process
+        logger.warning("Could not set inter-op threads to %d; keeping %d", num_threads, torch.get_num_interop_threads())
+
+
+def apply_execution_profile(profile, all_models):
+    torch.set_num_threads(profile["num_threads"])
+    _set_interop_threads(profile["interop_threads"])
+    for name, settings in profile["models"].items():
+        if name in all_models:
+            all_models[name]["params"] = {**all_models[name].get("params", {}), **settings}
+    return all_models
+
+
+def _time_segments(manager, model_name, segments, source_lang, target_lang, num_beams, clock):
+    # Times the document path: find/replace with its retries, which widen the beam from the
+    # model's own num_beams, as a profile would set it
+    manager.loaded_models[model_name].parameters["num_beams"] = num_beams
+    started = clock()
+    outputs = [
+        manager.translate_single(
+            text, model_name, source_lang=source_lang, target_lang=target_lang, use_find_replace=True
+        )["translated_text"]
+        for text in segments
+    ]
+    return clock() - started, outputs
+
+
+def _agreement(outputs, reference):
+    return sum(output == expected for output, expected in zip(outputs, reference)) / len(reference)
+
+
+def _choose_profile(timings, model_names, thread_counts, interop_threads, segment_count):
+    def fastest(model_name, num_threads):
+        candidates = [
+            (seconds, dtype, num_beams) for (name, dtype, num_beams, threads), seconds in timings.items()
+            if name == model_name and threads == num_threads
+        ]
+        return min(candidates) if candidates else None
+    
+    def ensemble_seconds(num_threads):
+        best = [fastest(name, num_threads) for name in model_names]
+        return sum(b[0] for b in best) if all(best) else float("inf")
+    
+    # Thread counts are process-wide, so one count is chosen for the whole ensemble
+    num_threads = min(thread_counts, key=ensemble_seconds)
+    models = {}
+    throughput = {}
+    for name in model_names:
+        seconds, dtype, num_beams = fastest(name, num_threads)
+        models[name] = {"dtype": dtype, "num_beams": num_beams}
+        throughput[name] = round(segment_count / seconds, 2) if seconds else None
+    return {
+        "version": PROFILE_VERSION,
+        "hardware": _hardware(),
+        "num_threads": num_threads,
+        "interop_threads": interop_threads,
+        "models": models,
+        "segments_per_second": throughput,
+    }
+
+
+def tune_execution_profile(
+        sample_segments,
+        source_lang="en",
+        all_models=None,
+        thread_counts=None,
+        dtypes=None,
+        beam_sizes=None,
+        min_agreement=None,
+        clock=time.perf_counter
+):
+    # Loads each model once per dtype, warms it up on the sample segments and times them for
+    # every beam size and thread count. The first dtype and beam size are the defaults the models otherwise run
+    # with, and their output is the reference: a faster setting that changes more than
+    # 1 - min_agreement of the translations is not considered.
+    settings = config.EXECUTION_PROFILE_CONFIG
+    if source_lang not in ["en", "fr"]:
+        raise ValueError('source_lang must be either "fr" or "en"')
+    if not sample_segments:
+        raise ValueError("sample_segments must not be empty")
+    target_lang = "fr" if source_lang == "en" else "en"
+    all_models = all_models if all_models is not None else get_model_config()
+    thread_counts = thread_counts or [n for n in settings["thread_counts"] if n <= (os.cpu_count() or 1)] or [1]
+    dtypes = dtypes or settings["dtypes"]
+    beam_sizes = beam_sizes or settings["beam_sizes"]
+    min_agreement = min_agreement if min_agreement is not None else settings["min_agreement"]
+    
+    _set_interop_threads(settings["interop_threads"])
+    original_threads = torch.get_num_threads()
+    timings = {}
+    try:
+        for model_name, model_config in all_models.items():
+            reference = None
+            for dtype in dtypes:
+                params = {**model_config.get("params", {}), "dtype": dtype}
+                manager = TranslationManager({model_name: {**model_config, "params": params}})
+                manager.load_models()
+                # One untimed pass first, so the spaCy load, the glossary matcher build and the
+                # first generate are not charged to the first beam size and thread count
+                _time_segments(manager, model_name, sample_segments, source_lang, target_lang, beam_sizes[0], clock)
+                for num_beams in beam_sizes:
+                    for num_threads in thread_counts:
+                        torch.set_num_threads(num_threads)
+                        seconds, outputs = _time_segments(
+                            manager, model_name, sample_segments, source_lang, target_lang, num_beams, clock
+                        )
+                        if reference is None:
+                            reference = outputs
+                        if _agreement(outputs, reference) < min_agreement:
+                            # The output does not depend on the thread count, so the other counts are not timed
+                            logger.info("%s: %s with %d beams changes the output; skipped", model_name, dtype, num_beams)
+                            break
+                        timings[(model_name, dtype, num_beams, num_threads)] = seconds
+                manager.loaded_models[model_name].clear_cache()
+    finally:
+        torch.set_num_threads(original_threads)
+    
+    return _choose_profile(
+        timings, list(all_models), thread_counts, torch.get_num_interop_threads(), len(sample_segments)
+    )
+
+
+def format_execution_profile(profile):
+    lines = [f"Threads: {profile['num_threads']} (inter-op {profile['interop_threads']})"]
+    for name, settings in profile["models"].items():
+        rate = profile.get("segments_per_second", {}).get(name)
+        lines.append(f"  {name}: {settings['dtype']}, {settings['num_beams']} beams, {rate} segments/s")
+    return "\n".join(lines)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('samples', help='Text file with one sample segment per line')
+    parser.add_argument('--source-lang', choices=['en', 'fr'], default='en')
+    parser.add_argument('--models', nargs='+', help='Model variants to tune (all configured variants if omitted)')
+    parser.add_argument('--base-only', action='store_true', help='Skip the finetuned variants')
+    parser.add_argument('--output', help='Profile path (defaults to the one create_translator reads on this host)')
+    args = parser.parse_args()
+    
+    with open(args.samples, 'r', encoding='utf-8') as f:
+        samples = [line.strip() for line in f if line.strip()]
+    
+    tuned = tune_execution_profile(
+        samples, source_lang=args.source_lang,
+        all_models=get_model_config(use_finetuned=not args.base_only, models_to_use=args.models)
+    )
+    print(format_execution_profile(tuned))
+    print(f'Saved to: {save_execution_profile(tuned, args.output)}')
@@ -1,4 +1,5 @@
 import os
+import time
 
 os.environ['TRANSFORMERS_OFFLINE'] = '1'
 os.environ['HF_HUB_OFFLINE'] = '1'
@@ -9,6 +10,11 @@ import torch
 from sentence_transformers.util import pytorch_cos_sim
 from transformers import AutoTokenizer, AutoModelForSeq2SeqLM, AutoModelForCausalLM, BitsAndBytesConfig
 from scitrans.rules_based_replacements.preferential_translations import apply_preferential_translations, reverse_preferential_translations
+from scitrans.rules_based_replacements.replacements import prefetch_person_names, clear_person_name_cache, scan_tokens
+from scitrans.rules_based_replacements.replacements import PlaceholderScheme
+from scitrans.translate.shortlist import LexicalShortlist, shortlisted_output_layer
+from scitrans.translate.ensemble_stats import EnsembleStats
+from scitrans.model_finetuning.trim_vocab import TRIMMABLE_MODEL_CLASSES, load_trimmed_tokenizer, trimmed_model_paths
 from huggingface_hub import try_to_load_from_cache
 
 
@@ -29,6 +35,7 @@ class BaseTranslationModel:
         self.model = None
         self.tokenizer = None
         self.finetuned_model = None
+        self.placeholder_schemes = {}
         if self.parameters.get("debug"):
             logging.basicConfig(level=logging.DEBUG)
         self.logger = logging.getLogger(__name__)
@@ -39,11 +46,23 @@ class BaseTranslationModel:
             "local_files_only": self.parameters.get("local_files_only", False),
         }
     
+    def _torch_dtype(self):
+        dtype = self.parameters.get("dtype", torch.bfloat16)
+        if dtype == "int8":
+            # Loaded in float32; the linear layers are quantized once the model is loaded
+            return torch.float32
+        return getattr(torch, dtype) if isinstance(dtype, str) else dtype
+    
+    def _finish_loading(self, model):
+        if self.parameters.get("dtype") == "int8":
+            model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        return model
+    
     def _model_kwargs(self, allow_device_map=True):
         kwargs = {
             "trust_remote_code": True,
             "local_files_only": self.parameters.get("local_files_only", False),
-            "torch_dtype": self.parameters.get("dtype", torch.bfloat16),
+            "torch_dtype": self._torch_dtype(),
         }
         if allow_device_map:
             kwargs["device_map"] = self.parameters.get("device_map", "auto")
@@ -57,7 +76,7 @@ class BaseTranslationModel:
                 load_in_4bit=True,
                 bnb_4bit_use_double_quant=True,
                 bnb_4bit_quant_type="nf4",
-                bnb_4bit_compute_dtype=self.parameters.get("dtype", torch.bfloat16),
+                bnb_4bit_compute_dtype=self._torch_dtype(),
             )
         return kwargs
     
@@ -73,6 +92,7 @@ class BaseTranslationModel:
                     self.tokenizer, "eos_token", None
             ):
                 self.tokenizer.pad_token = self.tokenizer.eos_token
+            self.tokenizer = load_trimmed_tokenizer(tokenizer_path, self.tokenizer)
         return self.tokenizer
     
     def load_model(self):
@@ -88,6 +108,7 @@ class BaseTranslationModel:
             tokenizer = self.load_tokenizer()
             if hasattr(self.model.config, "vocab_size") and len(tokenizer) > self.model.config.vocab_size:
                 self.model.resize_token_embeddings(len(tokenizer), mean_resizing=False)
+            self.model = self._finish_loading(self.model)
         return self.model
     
     def translate_text(self, input_text, input_language="en", target_language="fr",
@@ -95,6 +116,19 @@ class BaseTranslationModel:
         tokenizer = self.load_tokenizer()
         model = self.load_model()
     
+    def count_tokens(self, input_text, input_language="en", target_language="fr"):
+        tokenizer = self.load_tokenizer()
+        return len(tokenizer(input_text)["input_ids"])
+    
+    def tokenizer_for(self, input_language="en", target_language="fr"):
+        return self.load_tokenizer()
+    
+    def placeholder_scheme(self, input_language="en", target_language="fr"):
+        key = (input_language, target_language)
+        if key not in self.placeholder_schemes:
+            self.placeholder_schemes[key] = PlaceholderScheme.for_tokenizer(self.tokenizer_for(input_language, target_language))
+        return self.placeholder_schemes[key]
+    
     def clean_output(self, text):
         import re
         patterns = [
@@ -121,6 +155,9 @@ class OpusTranslationModel(BaseTranslationModel):
     def __init__(self, base_model_id, model_type="seq2seq", **parameters):
         super().__init__(base_model_id, model_type, **parameters)
         self.directional_cache = {}
+        self.shortlists = {}
+        # None follows SHORTLIST_CONFIG; True or False overrides it (e.g. for benchmarks)
+        self.use_shortlist = None
     
     def _root_model_id(self):
         parts = self.base_model_id.split("-")
@@ -134,14 +171,16 @@ class OpusTranslationModel(BaseTranslationModel):
         target_alias = self.LANGUAGE_ALIASES[target_language]
         return f"{root_id}-{source_alias}-{target_alias}"
     
+    def _directional_model_path(self, source_language, target_language):
+        merged_path = self.parameters.get(f"merged_model_path_{source_language}_{target_language}")
+        return merged_path if merged_path else self._directional_model_id(source_language, target_language)
+    
     def _load_directional(self, source_language, target_language):
         cache_key = f"{source_language}-{target_language}"
         if cache_key in self.directional_cache:
             return self.directional_cache[cache_key]
         
-        merged_path = self.parameters.get(f"merged_model_path_{source_language}_{target_language}")
-        model_id = merged_path if merged_path else self._directional_model_id(source_language, target_language)
-        model_id = resolve_cached_model_path(model_id)
+        model_id = resolve_cached_model_path(self._directional_model_path(source_language, target_language))
         
         tokenizer = AutoTokenizer.from_pretrained(model_id, **self._tokenizer_kwargs())
         model = AutoModelForSeq2SeqLM.from_pretrained(
@@ -151,10 +190,31 @@ class OpusTranslationModel(BaseTranslationModel):
             model = model.cuda()
         if hasattr(model.config, "vocab_size") and len(tokenizer) > model.config.vocab_size:
             model.resize_token_embeddings(len(tokenizer), mean_resizing=False)
+        model = self._finish_loading(model)
         
         self.directional_cache[cache_key] = (tokenizer, model)
         return tokenizer, model
     
+    def count_tokens(self, input_text, input_language="en", target_language="fr"):
+        tokenizer, _model = self._load_directional(input_language, target_language)
+        return len(tokenizer(input_text)["input_ids"])
+    
+    def tokenizer_for(self, input_language="en", target_language="fr"):
+        return self._load_directional(input_language, target_language)[0]
+    
+    def _shortlist(self, tokenizer, source_language, target_language):
+        use_shortlist = self.use_shortlist
+        if use_shortlist is None:
+            # The saving is in the CPU matmul; on a GPU the full projection is cheap
+            use_shortlist = config.SHORTLIST_CONFIG.get("enabled", False) and not torch.cuda.is_available()
+        if not use_shortlist:
+            return None
+        key = (source_language, target_language)
+        if key not in self.shortlists:
+            model_name = os.path.basename(os.path.normpath(self._directional_model_path(source_language, target_language)))
+            self.shortlists[key] = LexicalShortlist.load(tokenizer, model_name, source_language, target_language)
+        return self.shortlists[key]
+    
     def translate_text(
             self,
             input_text,
@@ -169,14 +229,23 @@ class OpusTranslationModel(BaseTranslationModel):
         
         generation_arguments = {
             "max_new_tokens": 512,
-            "num_beams": 4,
+            "num_beams": self.parameters.get("num_beams", 4),
             "do_sample": False,
             "pad_token_id": tokenizer.pad_token_id,
         }
         if generation_kwargs:
             generation_arguments.update(generation_kwargs)
         
-        output_token_ids = model.generate(**model_inputs, **generation_arguments)
+        shortlist = self._shortlist(tokenizer, input_language, target_language)
+        if shortlist is None:
+            output_token_ids = model.generate(**model_inputs, **generation_arguments)
+        else:
+            allowed_ids = shortlist.allowed_ids(
+                model_inputs["input_ids"][0].tolist(),
+                tokenizer(text_target=input_text, add_special_tokens=False)["input_ids"]
+            )
+            with shortlisted_output_layer(model, allowed_ids):
+                output_token_ids = model.generate(**model_inputs, **generation_arguments)
         text_output = tokenizer.batch_decode(output_token_ids, skip_special_tokens=True)[0].strip()
         return self.clean_output(text_output)
 
@@ -184,6 +253,11 @@ class OpusTranslationModel(BaseTranslationModel):
 class M2M100TranslationModel(BaseTranslationModel):
     LANGUAGE_CODES = {"en": "en", "fr": "fr"}
     
+    def count_tokens(self, input_text, input_language="en", target_language="fr"):
+        tokenizer = self.load_tokenizer()
+        tokenizer.src_lang = self.LANGUAGE_CODES[input_language]
+        return len(tokenizer(input_text)["input_ids"])
+    
     def translate_text(self, input_text, input_language="en", target_language="fr", generation_kwargs=None):
         tokenizer = self.load_tokenizer()
         model = self.load_model()
@@ -197,7 +271,7 @@ class M2M100TranslationModel(BaseTranslationModel):
         
         generation_arguments = {
             "max_new_tokens": 512,
-            "num_beams": 4,
+            "num_beams": self.parameters.get("num_beams", 4),
             "do_sample": False,
             "pad_token_id": tokenizer.pad_token_id,
             "forced_bos_token_id": tokenizer.get_lang_id(target_code),
@@ -235,6 +309,7 @@ class MBART50TranslationModel(BaseTranslationModel):
         tokenizer = AutoTokenizer.from_pretrained(model_path, **self._tokenizer_kwargs())
         if getattr(tokenizer, "pad_token", None) is None and getattr(tokenizer, "eos_token", None):
             tokenizer.pad_token = tokenizer.eos_token
+        tokenizer = load_trimmed_tokenizer(model_path, tokenizer)
         
         model = AutoModelForSeq2SeqLM.from_pretrained(
             model_path, **self._model_kwargs(allow_device_map=False)
@@ -244,10 +319,19 @@ class MBART50TranslationModel(BaseTranslationModel):
         
         if hasattr(model.config, "vocab_size") and len(tokenizer) > model.config.vocab_size:
             model.resize_token_embeddings(len(tokenizer), mean_resizing=False)
+        model = self._finish_loading(model)
         
         self.directional_cache[cache_key] = (tokenizer, model)
         return tokenizer, model
     
+    def count_tokens(self, input_text, input_language="en", target_language="fr"):
+        tokenizer, _model = self._load_directional(input_language, target_language)
+        tokenizer.src_lang = self.LANGUAGE_CODES[input_language]
+        return len(tokenizer(input_text)["input_ids"])
+    
+    def tokenizer_for(self, input_language="en", target_language="fr"):
+        return self._load_directional(input_language, target_language)[0]
+    
     def translate_text(self, input_text, input_language="en", target_language="fr",
                        generation_kwargs=None):
         tokenizer, model = self._load_directional(input_language, target_language)
@@ -265,7 +349,7 @@ class MBART50TranslationModel(BaseTranslationModel):
         
         generation_arguments = {
             "max_new_tokens": 512,
-            "num_beams": 4,
+            "num_beams": self.parameters.get("num_beams", 4),
             "do_sample": False,
             "pad_token_id": tokenizer.pad_token_id,
             "forced_bos_token_id": target_id,
@@ -282,6 +366,24 @@ class MBART50TranslationModel(BaseTranslationModel):
         super().clear_cache()
 
 
+def retry_beam_sizes(num_beams):
+    return list(dict.fromkeys([num_beams, num_beams + max(num_beams // 2, 1), num_beams * 2]))
+
+
+def _within_deadline(generation_kwargs, deadline):
+    # Caps a generate call at what is left of the segment's time (a monotonic deadline)
+    if deadline is None:
+        return generation_kwargs
+    remaining = max(deadline - time.monotonic(), 0.0)
+    generation_kwargs = dict(generation_kwargs or {})
+    generation_kwargs["max_time"] = min(generation_kwargs.get("max_time", remaining), remaining)
+    return generation_kwargs
+
+
+def _past_deadline(deadline):
+    return deadline is not None and time.monotonic() >= deadline
+
+
 class TranslationManager:
     TOKEN_PREFIXES = ['NOMENCLATURE', 'TAXON', 'ACRONYM', 'SITE', 'NAME']
     
@@ -294,6 +396,13 @@ class TranslationManager:
         self.extra_token_errors = {}
         self.token_retry_debug = {}
         self.translation_cache = {}
+        self.preprocess_cache = {}
+        # None follows PLACEHOLDER_CONFIG; "category" or "auto" overrides it (e.g. for benchmarks)
+        self.placeholder_scheme = None
+        # EnsembleStats that records which model wins each segment; None records nothing
+        self.ensemble_stats = None
+        # None follows ENSEMBLE_STATS_CONFIG; True or False overrides it
+        self.auto_prune = None
     
     def load_models(self, model_names=None):
         if model_names is None:
@@ -307,11 +416,11 @@ class TranslationManager:
     
     def translate_with_retries(self, model, text, source_lang, target_lang,
                                token_mapping=None, base_generation_kwargs=None,
-                               model_name=None, idx=None, single_attempt=False):
+                               model_name=None, idx=None, single_attempt=False, deadline=None):
+        # Retries widen the beam from the model's own (possibly tuned) setting: 4, 6, 8 by default
+        model_beams = (getattr(model, "parameters", None) or {}).get("num_beams", 4)
         param_variations = [
-            {"num_beams": 4},
-            {"num_beams": 6},
-            {"num_beams": 8},
+            {"num_beams": num_beams} for num_beams in retry_beam_sizes(model_beams)
             
             # NOTE: more attempts is rarely successful, just try 3x for now
             # {"num_beams": 2},
@@ -323,12 +432,15 @@ class TranslationManager:
         ]
         
         base_kwargs = base_generation_kwargs or {}
+        if "num_beams" in base_kwargs:
+            # A beam size pinned by the caller (a degraded deadline level) leaves nothing to vary
+            param_variations = [{}]
         
         debug_key = f"{model_name}_{idx}" if model_name and idx is not None else None
         retry_log = [] if self.debug and debug_key and token_mapping else None
         
         for i, params in enumerate(param_variations):
-            generation_kwargs = {**base_kwargs, **params}
+            generation_kwargs = _within_deadline({**base_kwargs, **params}, deadline)
             
             translated = model.translate_text(
                 text, input_language=source_lang, target_language=target_lang, generation_kwargs=generation_kwargs
@@ -362,6 +474,8 @@ class TranslationManager:
             
             if single_attempt:
                 return None, 1, None
+            if _past_deadline(deadline):
+                return None, i + 1, None
         
         if self.debug and retry_log and debug_key:
             print(f'entry added (failed after {i + 1}):', model_name)
@@ -395,19 +509,45 @@ class TranslationManager:
             return False
         
         if token_mapping:
-            from scitrans.rules_based_replacements.replacements import find_corrupted_token
-            
-            for key in token_mapping.keys():
-                found, _, _ = find_corrupted_token(translated_text, key)
-                if not found:
-                    return False
+            found, _ = scan_tokens(translated_text, token_mapping.keys())
+            if len(found) != len(token_mapping):
+                return False
         
         return True
     
+    def preprocess_text(self, text, source_lang="en", target_lang="fr", preferential_dict=None):
+        return apply_preferential_translations(
+            source_text=text, source_language=source_lang, target_language=target_lang,
+            translations_file=preferential_dict if preferential_dict is not None else config.PREFERENTIAL_JSON_PATH
+        )
+    
+    def prepare_segment(self, text, source_lang="en", target_lang="fr", preferential_dict=None):
+        # Preprocesses a segment ahead of translate_with_all_models, which picks the result up once
+        key = (text, source_lang, target_lang)
+        if text and text.strip() and key not in self.preprocess_cache:
+            self.preprocess_cache[key] = self.preprocess_text(text, source_lang, target_lang, preferential_dict)
+    
+    def placeholder_scheme_for(self, model, source_lang="en", target_lang="fr"):
+        scheme = self.placeholder_scheme or config.PLACEHOLDER_CONFIG.get("scheme", "category")
+        if scheme == "category" or not hasattr(model, "placeholder_scheme"):
+            return None
+        return model.placeholder_scheme(source_lang, target_lang)
+    
+    def count_tokens(self, text, source_lang="en", target_lang="fr"):
+        # The longest tokenization across the ensemble, so a chunk fits every model
+        return max(
+            (model.count_tokens(text, input_language=source_lang, target_language=target_lang)
+             for model in self.loaded_models.values()),
+            default=0
+        )
+    
+    def prefetch_segments(self, texts, source_lang="en"):
+        return prefetch_person_names(texts, source_lang, **config.PERSON_NAME_DETECTION_CONFIG)
+    
     def translate_single(self, text, model_name, source_lang="en", target_lang="fr",
                          use_find_replace=True, generation_kwargs=None, idx=None,
                          target_text=None, debug=False, single_attempt=False,
-                         preferential_dict=None):
+                         preferential_dict=None, preprocessed=None, deadline=None):
         
         if not text or not text.strip():
             if self.debug:
@@ -430,20 +570,23 @@ class TranslationManager:
         retry_params = None
         
         if use_find_replace:
-            preprocessed_text, token_mapping = apply_preferential_translations(
-                source_text=text, source_language=source_lang, target_language=target_lang,
-                translations_file=preferential_dict if preferential_dict is not None else config.PREFERENTIAL_JSON_PATH
-            )
+            # translate_with_all_models preprocesses once and shares the result across models
+            if preprocessed is None:
+                preprocessed = self.preprocess_text(text, source_lang, target_lang, preferential_dict)
+            preprocessed_text, token_mapping = preprocessed
+            # Each model gets the placeholders its own tokenizer keeps as single subwords
+            scheme = self.placeholder_scheme_for(model, source_lang, target_lang)
+            if scheme is not None:
+                preprocessed_text, token_mapping = scheme.apply(preprocessed_text, token_mapping)
             
             translated_with_tokens, retry_attempts, retry_params = self.translate_with_retries(
                 model, preprocessed_text, source_lang, target_lang,
                 token_mapping=token_mapping, base_generation_kwargs=generation_kwargs,
-                model_name=model_name, idx=idx, single_attempt=single_attempt
+                model_name=model_name, idx=idx, single_attempt=single_attempt, deadline=deadline
             )
             
-            if translated_with_tokens and self.is_valid_translation(
-                    translated_with_tokens, preprocessed_text, token_mapping
-            ):
+            # translate_with_retries only returns token-valid output, so restoring is the one remaining scan
+            if translated_with_tokens:
                 translated_text = reverse_preferential_translations(
                     translated_text=translated_with_tokens, token_mapping=token_mapping
                 )
@@ -459,7 +602,8 @@ class TranslationManager:
                         "error_type": "reverse_translation_validation_failed",
                     }
                     translated_text = model.translate_text(
-                        text, input_language=source_lang, target_language=target_lang, generation_kwargs=generation_kwargs
+                        text, input_language=source_lang, target_language=target_lang,
+                        generation_kwargs=_within_deadline(generation_kwargs, deadline)
                     )
             else:
                 find_replace_error = True
@@ -472,14 +616,16 @@ class TranslationManager:
                     "final_retry_params": retry_params,
                 }
                 translated_text = model.translate_text(
-                    text, input_language=source_lang, target_language=target_lang, generation_kwargs=generation_kwargs
+                    text, input_language=source_lang, target_language=target_lang,
+                    generation_kwargs=_within_deadline(generation_kwargs, deadline)
                 )
         else:
             preprocessed_text = None
             translated_with_tokens = None
             token_mapping = None
             translated_text = model.translate_text(
-                text, input_language=source_lang, target_language=target_lang, generation_kwargs=generation_kwargs
+                text, input_language=source_lang, target_language=target_lang,
+                generation_kwargs=_within_deadline(generation_kwargs, deadline)
             )
         
         token_prefix_error = self.check_token_prefix_error(translated_text, text)
@@ -532,23 +678,52 @@ class TranslationManager:
     def translate_with_all_models(self, text, source_lang="en", target_lang="fr",
                                   use_find_replace=True, generation_kwargs=None,
                                   idx=None, target_text=None, debug=False,
-                                  single_attempt=False, preferential_dict=None):
-        model_names = list(self.loaded_models.keys())
+                                  single_attempt=False, preferential_dict=None, model_names=None, time_limit=None):
+        # time_limit (seconds) bounds the whole segment across models and retries: every generate
+        # call is capped at the time left, and once it is used up the remaining models and
+        # retries are skipped and the best result is marked timed_out
+        deadline = time.monotonic() + time_limit if time_limit is not None else None
+        timed_out = False
+        # Only runs that chose their own models count toward the ensemble stats; a caller's
+        # subset (a deadline level's top models) would feed its own picks back into them
+        record_stats = model_names is None and self.ensemble_stats is not None
+        if model_names is None:
+            model_names = list(self.loaded_models.keys())
+            auto_prune = self.auto_prune
+            if auto_prune is None:
+                auto_prune = config.ENSEMBLE_STATS_CONFIG.get("auto_prune", False)
+            if auto_prune and self.ensemble_stats is not None and text and text.strip():
+                model_names = self.ensemble_stats.select_models(model_names, text, source_lang, target_lang)
+        else:
+            model_names = [name for name in self.loaded_models if name in model_names]
         
         all_results = {}
         best_result = None
         best_similarity = float('-inf')
+        valid_similarities = {}
+        
+        preprocessed = None
+        if use_find_replace and text and text.strip():
+            if preferential_dict is None:
+                preprocessed = self.preprocess_cache.pop((text, source_lang, target_lang), None)
+            if preprocessed is None:
+                preprocessed = self.preprocess_text(text, source_lang, target_lang, preferential_dict)
         
         for model_name in model_names:
+            if _past_deadline(deadline):
+                timed_out = True
+                break
             result = self.translate_single(
                 text, model_name, source_lang=source_lang, target_lang=target_lang,
                 use_find_replace=use_find_replace, generation_kwargs=generation_kwargs,
                 idx=idx, target_text=target_text, debug=debug,
-                single_attempt=single_attempt, preferential_dict=preferential_dict
+                single_attempt=single_attempt, preferential_dict=preferential_dict,
+                preprocessed=preprocessed, deadline=deadline
             )
             all_results[model_name] = result
             
             if self.is_valid_translation(result['translated_text'], text):
+                valid_similarities[model_name] = result["similarity_vs_source"]
                 if result["similarity_vs_source"] is None:
                     if best_result is None:
                         best_result = result.copy()
@@ -560,6 +735,8 @@ class TranslationManager:
                     best_result["model_name"] = "best_model"
                     best_result["best_model_source"] = model_name
         
+        # A generate call that ran to the deadline was cut off by max_time
+        timed_out = timed_out or _past_deadline(deadline)
         if best_result is None:
             best_result = {
                 "error": "No valid translations from any model",
@@ -569,7 +746,13 @@ class TranslationManager:
                 "model_name": "best_model",
                 "best_model_source": None
             }
+        elif record_stats and not timed_out and text and text.strip():
+            self.ensemble_stats.record(
+                text, source_lang, target_lang, model_names, valid_similarities, best_result["best_model_source"]
+            )
         
+        if timed_out:
+            best_result["timed_out"] = True
         all_results['best_model'] = best_result
         
         return all_results
@@ -578,16 +761,18 @@ class TranslationManager:
                                   use_find_replace=True, generation_kwargs=None,
                                   idx=None, target_text=None, debug=False,
                                   single_attempt=False, preferential_dict=None,
-                                  use_cache=True):
+                                  use_cache=True, model_names=None, time_limit=None):
         if use_cache and text in self.translation_cache:
             return self.translation_cache[text]
         result = self.translate_with_all_models(
             text, source_lang=source_lang, target_lang=target_lang,
             use_find_replace=use_find_replace, generation_kwargs=generation_kwargs,
             idx=idx, target_text=target_text, debug=debug,
-            single_attempt=single_attempt, preferential_dict=preferential_dict
+            single_attempt=single_attempt, preferential_dict=preferential_dict,
+            model_names=model_names, time_limit=time_limit
         )["best_model"]
-        if use_cache:
+        # A subset of the ensemble or a timed-out run is a degraded result; later repeats should get the full one
+        if use_cache and model_names is None and not result.get("timed_out"):
             self.translation_cache[text] = result
         return result
     
@@ -604,15 +789,20 @@ class TranslationManager:
         self.find_replace_errors.clear()
         self.token_retry_debug.clear()
         self.translation_cache.clear()
+        self.preprocess_cache.clear()
+        clear_person_name_cache()
 
 
-def get_model_config(use_finetuned=True, models_to_use=None):
+def get_model_config(use_finetuned=True, models_to_use=None, use_trimmed_vocab=None):
     model_class_map = {
         "OpusTranslationModel": OpusTranslationModel,
         "M2M100TranslationModel": M2M100TranslationModel,
         "MBART50TranslationModel": MBART50TranslationModel,
     }
     
+    if use_trimmed_vocab is None:
+        use_trimmed_vocab = config.VOCAB_TRIM_CONFIG.get("enabled", False)
+    
     all_models = {}
     for variant_name, variant_config in config.TRANSLATION_MODEL_VARIANTS.items():
         if not use_finetuned and variant_config["use_finetuned"]:
@@ -630,6 +820,12 @@ def get_model_config(use_finetuned=True, models_to_use=None):
             for path_key, model_name in variant_config["merged_model_names"].items():
                 params[path_key] = os.path.join(config.MERGED_MODEL_DIR, model_name)
         
+        if use_trimmed_vocab and variant_config["model_class"] in TRIMMABLE_MODEL_CLASSES:
+            # Variants whose trimmed checkpoint has not been built keep the full model
+            for path_key, trimmed_path in trimmed_model_paths(variant_name).items():
+                if os.path.isdir(trimmed_path):
+                    params[path_key] = trimmed_path
+        
         all_models[variant_name] = {
             "cls": model_class_map[variant_config["model_class"]],
             "params": params
@@ -641,10 +837,19 @@ def get_model_config(use_finetuned=True, models_to_use=None):
     return all_models
 
 
-def create_translator(use_finetuned=True, models_to_use=None, use_embedder=True, load_models=True, debug=False):
+def create_translator(use_finetuned=True, models_to_use=None, use_embedder=True, load_models=True, debug=False,
+                      use_execution_profile=None, use_trimmed_vocab=None, use_ensemble_stats=None):
     from sentence_transformers import SentenceTransformer
+    from scitrans.translate.execution_profile import load_execution_profile, apply_execution_profile
+    
+    all_models = get_model_config(use_finetuned, models_to_use, use_trimmed_vocab=use_trimmed_vocab)
     
-    all_models = get_model_config(use_finetuned, models_to_use)
+    if use_execution_profile is None:
+        use_execution_profile = config.EXECUTION_PROFILE_CONFIG.get("enabled", False)
+    if use_execution_profile and not torch.cuda.is_available():
+        profile = load_execution_profile()
+        if profile is not None:
+            apply_execution_profile(profile, all_models)
     
     embedder = None
     if use_embedder:
@@ -652,6 +857,10 @@ def create_translator(use_finetuned=True, models_to_use=None, use_embedder=True,
         embedder = SentenceTransformer(model_path, local_files_only=True)
     
     manager = TranslationManager(all_models, embedder, debug=debug)
+    if use_ensemble_stats is None:
+        use_ensemble_stats = config.ENSEMBLE_STATS_CONFIG.get("enabled", False)
+    if use_ensemble_stats:
+        manager.ensemble_stats = EnsembleStats.load()
     
     if load_models:
         manager.load_models()
@@ -0,0 +1,195 @@
+import threading
+from concurrent.futures import Future
+
+from scitrans import config
+
+
+class _WalkCacheView:
+    # translation_cache as the document walk sees it: results the pipeline generated
+    # ahead of the walk are not cache hits
+    def __init__(self, pipeline):
+        self.pipeline = pipeline
+    
+    def __contains__(self, text):
+        cache = getattr(self.pipeline.translation_manager, "translation_cache", ())
+        return text in cache and text not in self.pipeline.generated
+
+
+class SegmentPipeline:
+    # Overlaps the per-segment stages of a document run. A planning thread pulls the
+    # (text, idx) pairs the walk is expected to ask for from segments, lazily and only
+    # 2 * lookahead past the walk, a preprocessing thread tokenizes glossary terms and
+    # names for segments up to 2 * lookahead ahead, a generation thread translates
+    # segments up to lookahead ahead, and the walk itself (XML cleanup, write-back,
+    # formatting rules) stays on the calling thread, so results are still applied in
+    # document order. Stands in for the translation manager: a segment the generation
+    # thread has reached is returned from its future when the walk asks for it with the
+    # same arguments, anything else is translated on the spot. Generation and
+    # preprocessing (spaCy) each run one segment at a time under their own lock, so one
+    # segment is preprocessed while another is generated.
+    def __init__(self, translation_manager, segments, lookahead=None, preprocess=False, **translate_kwargs):
+        self.translation_manager = translation_manager
+        self.segments = []
+        self.lookahead = lookahead or config.PIPELINE_CONFIG["lookahead"]
+        self.preprocess = preprocess and hasattr(translation_manager, "prepare_segment")
+        self.translate_kwargs = translate_kwargs
+        self.generated = set()
+        self.hits = 0
+        self._plan = iter(segments)
+        self._planned = set()
+        self._plan_finished = False
+        self._futures = []
+        self._pending = {}
+        self._walk_position = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._model_lock = threading.Lock()
+        self._preprocess_lock = threading.Lock()
+        self._threads = []
+    
+    def __getattr__(self, name):
+        return getattr(self.translation_manager, name)
+    
+    @property
+    def translation_cache(self):
+        return _WalkCacheView(self)
+    
+    def start(self):
+        stages = [self._plan_ahead, self._generate_ahead]
+        if self.preprocess:
+            stages.insert(1, self._preprocess_ahead)
+        for stage in stages:
+            thread = threading.Thread(target=stage, name=f"scitrans{stage.__name__}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+    
+    def _plan_window_full(self):
+        return len(self.segments) >= self._walk_position + 2 * self.lookahead
+    
+    def _plan_ahead(self):
+        try:
+            for text, idx in self._plan:
+                with self._condition:
+                    self._condition.wait_for(lambda: self._closed or not self._plan_window_full())
+                    if self._closed:
+                        return
+                    # Repeats of a text are cache hits and texts the walk already translated
+                    # are done, so only the first occurrence is generated ahead
+                    if text in self._planned:
+                        continue
+                    self._planned.add(text)
+                    self._pending[text] = len(self.segments)
+                    self.segments.append((text, idx))
+                    self._futures.append(Future())
+                    self._condition.notify_all()
+        finally:
+            with self._condition:
+                self._plan_finished = True
+                self._condition.notify_all()
+    
+    def _wait_for_window(self, position, ahead):
+        # Blocks a stage until segment `position` is planned and the walk is within `ahead`
+        # segments of it; False once the pipeline is closed or the plan ends before it
+        with self._condition:
+            self._condition.wait_for(
+                lambda: self._closed or self._plan_finished and position >= len(self.segments)
+                or position < len(self.segments) and position < self._walk_position + ahead
+            )
+            return not self._closed and position < len(self.segments)
+    
+    def _prepare(self, text, source_lang, target_lang):
+        if text in getattr(self.translation_manager, "translation_cache", ()):
+            return
+        with self._preprocess_lock:
+            self.translation_manager.prepare_segment(text, source_lang=source_lang, target_lang=target_lang)
+    
+    def _preprocess_ahead(self):
+        source_lang = self.translate_kwargs.get("source_lang", "en")
+        target_lang = self.translate_kwargs.get("target_lang", "fr")
+        position = 0
+        while self._wait_for_window(position, 2 * self.lookahead):
+            text, _idx = self.segments[position]
+            done = self._futures[position].done()
+            position += 1
+            if done:
+                continue
+            try:
+                self._prepare(text, source_lang, target_lang)
+            except Exception:
+                # Generation preprocesses the segment itself and surfaces the error there
+                continue
+    
+    def _generate_ahead(self):
+        position = 0
+        while self._wait_for_window(position, self.lookahead):
+            text, idx = self.segments[position]
+            future = self._futures[position]
+            position += 1
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                if self.preprocess and self.translate_kwargs.get("use_find_replace"):
+                    # Waits for the preprocessing thread if it is on this segment, so spaCy
+                    # still sees one segment at a time
+                    self._prepare(text, self.translate_kwargs.get("source_lang", "en"),
+                                  self.translate_kwargs.get("target_lang", "fr"))
+                with self._model_lock:
+                    cached = text in getattr(self.translation_manager, "translation_cache", ())
+                    result = self.translation_manager.translate_with_best_model(text, idx=idx, **self.translate_kwargs)
+                    if not cached:
+                        self.generated.add(text)
+            except BaseException as e:
+                future.set_exception(e)
+                self._cancel_pending()
+                return
+            future.set_result(result)
+    
+    def _cancel_pending(self):
+        with self._condition:
+            for future in self._futures:
+                future.cancel()
+            self._closed = True
+            self._condition.notify_all()
+    
+    def translate_with_best_model(self, text, **kwargs):
+        future = None
+        with self._condition:
+            # The plan may not have reached this segment yet; it is never pulled past its window
+            self._condition.wait_for(
+                lambda: text in self._pending or self._closed or self._plan_finished or self._plan_window_full()
+            )
+            self._planned.add(text)
+            position = self._pending.pop(text, None)
+            if position is not None:
+                future = self._futures[position]
+                if position >= self._walk_position:
+                    # Segments the walk passed without asking for (reused, bypassed) are never generated
+                    for skipped in range(self._walk_position, position):
+                        self._futures[skipped].cancel()
+                    self._walk_position = position + 1
+                    self._condition.notify_all()
+        if future is not None and kwargs != {"idx": self.segments[position][1], **self.translate_kwargs}:
+            # Asked for with other arguments than it was generated with: translated the way they say
+            future.cancel()
+            future = None
+            self.generated.discard(text)
+        if future is not None and not future.cancelled():
+            result = future.result()
+            self.hits += 1
+            # Repeats of this segment later in the document are ordinary cache hits
+            self.generated.discard(text)
+            return result
+        if self.preprocess and kwargs.get("use_find_replace") and kwargs.get("preferential_dict") is None:
+            try:
+                self._prepare(text, kwargs.get("source_lang", "en"), kwargs.get("target_lang", "fr"))
+            except Exception:
+                # translate_with_best_model preprocesses the segment again and raises there
+                pass
+        with self._model_lock:
+            return self.translation_manager.translate_with_best_model(text, **kwargs)
+    
+    def close(self):
+        self._cancel_pending()
+        for thread in self._threads:
+            thread.join()
@@ -0,0 +1,133 @@
+import time
+
+from alive_progress import alive_bar
+
+
+def _format_duration(seconds):
+    if seconds is None:
+        return "?"
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}" if hours else f"{minutes}:{secs:02d}"
+
+
+class TranslationProgress:
+    # Counts segments as they are translated and sends an event dict to the callback:
+    # "start" once, "segment" after each segment, "finish" at the end. Segments reused
+    # from a segment map or checkpoint are counted as done but left out of the rate, so
+    # the ETA reflects how fast the models are actually going.
+    def __init__(self, total, callback=None, title=None, clock=time.monotonic):
+        self.total = total
+        self.callback = callback
+        self.title = title
+        self.clock = clock
+        self.done = 0
+        self.cache_hits = 0
+        self.reused = 0
+        self.retries = 0
+        self.model = None
+        self._started_at = None
+    
+    def _emit(self, event):
+        if self.callback is not None:
+            self.callback(self.snapshot(event))
+    
+    def snapshot(self, event="segment"):
+        elapsed = self.clock() - self._started_at if self._started_at is not None else 0.0
+        translated = self.done - self.reused
+        rate = translated / elapsed if elapsed > 0 and translated else 0.0
+        remaining = max(self.total - self.done, 0)
+        eta = remaining / rate if rate else (0.0 if not remaining else None)
+        return {
+            "event": event,
+            "title": self.title,
+            "done": self.done,
+            "total": self.total,
+            "elapsed": elapsed,
+            "segments_per_sec": rate,
+            "eta_seconds": eta,
+            "cache_hits": self.cache_hits,
+            "reused": self.reused,
+            "model": self.model,
+            "retries": self.retries,
+        }
+    
+    def start(self):
+        self._started_at = self.clock()
+        self._emit("start")
+    
+    def update(self, result=None, cached=False):
+        self.done += 1
+        if cached:
+            self.cache_hits += 1
+        if result:
+            self.retries += result.get("retry_attempts", 0) or 0
+            self.model = result.get("best_model_source") or self.model
+        self._emit("segment")
+    
+    def skip(self, count):
+        # Segments that needed no model call at all (segment map or checkpoint hits)
+        if count <= 0:
+            return
+        self.done += count
+        self.reused += count
+        self._emit("segment")
+    
+    def finish(self, completed=True):
+        # Segments still uncounted on a completed run needed no model call (numeric or
+        # glossary table cells, field-only paragraphs), so the bar ends at the total
+        if completed and self.done < self.total:
+            self.reused += self.total - self.done
+            self.done = self.total
+        self._emit("finish")
+
+
+class AliveProgressRenderer:
+    # Default terminal view of TranslationProgress events, as an alive-progress bar
+    def __init__(self, **bar_kwargs):
+        self.bar_kwargs = bar_kwargs
+        self._context = None
+        self._bar = None
+        self._shown = 0
+    
+    def __call__(self, event):
+        if event["event"] == "start":
+            self._context = alive_bar(event["total"], title=event["title"], **self.bar_kwargs)
+            self._bar = self._context.__enter__()
+            self._shown = 0
+            return
+        if self._bar is None:
+            return
+        
+        step = event["done"] - self._shown
+        if step > 0:
+            self._bar(step)
+            self._shown = event["done"]
+        self._bar.text(
+            f"{event['segments_per_sec']:.2f} seg/s | ETA {_format_duration(event['eta_seconds'])} | "
+            f"cache {event['cache_hits']} | reused {event['reused']} | "
+            f"model {event['model'] or '-'} | retries {event['retries']}"
+        )
+        
+        if event["event"] == "finish":
+            self._context.__exit__(None, None, None)
+            self._context = None
+            self._bar = None
+
+
+def resolve_progress_callback(progress):
+    # progress=True uses the terminal renderer; a callable receives the raw events
+    if progress is True:
+        return AliveProgressRenderer()
+    if callable(progress):
+        return progress
+    return None
+
+
+def translate_with_progress(translation_manager, progress, text, **kwargs):
+    if progress is None:
+        return translation_manager.translate_with_best_model(text=text, **kwargs)
+    cached = kwargs.get("use_cache", True) and text in getattr(translation_manager, "translation_cache", ())
+    result = translation_manager.translate_with_best_model(text=text, **kwargs)
+    progress.update(result, cached=cached)
+    return result
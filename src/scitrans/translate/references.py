@@ -0,0 +1,115 @@
+import re
+
+from scitrans import config
+
+_HEADING_STYLE_RE = re.compile(r'^(Heading|Titre|Title)\b', re.IGNORECASE)
+_HEADING_NUMBER_RE = re.compile(r'^(?:\d+(?:\.\d+)*\.?|[IVX]+\.)\s+')
+# Headings that close a reference list even when they are not styled as headings
+_END_HEADING_RE = re.compile(r'^(appendix|appendices|annexe|annexes|tables|tableaux|figures)\b', re.IGNORECASE)
+
+_YEAR = r'\(?(?:(?:1[89]|20)\d{2}[a-z]?|[Ii]n press|[Ss]ous presse|n\.d\.)\)?'
+_PERSON = r"[A-Z][\w'’-]+(?:[ -][A-Z][\w'’-]+)*,? (?:[A-Z]\.[ -]?){1,3}"
+# "Smith, J.A., Brown, K., and Lee, C. 2019." or "DFO. 2019." at the start of a paragraph
+_REFERENCE_ENTRY_RE = re.compile(
+    rf"^(?:(?:{_PERSON},? (?:(?:and|et|&) )?)+{_YEAR}\.? |[A-Z][A-Za-z&'’ -]{{1,60}}\. {_YEAR}\. )"
+)
+# Inside a reference section a year or DOI near the start is enough
+_LOOSE_ENTRY_RE = re.compile(rf'^.{{0,200}}?(?:\b{_YEAR}[.,)]|\bdoi\b|https?://)', re.IGNORECASE)
+
+_REFERENCE_TOKENS = {
+    "fr": ((re.compile(r'\bIn:'), "Dans :"), (re.compile(r'\bIn press\b'), "Sous presse"),
+           (re.compile(r'\bin press\b'), "sous presse")),
+    "en": ((re.compile(r'\bDans ?:'), "In:"), (re.compile(r'\bSous presse\b'), "In press"),
+           (re.compile(r'\bsous presse\b'), "in press")),
+}
+
+
+def _normalize_heading(text):
+    text = _HEADING_NUMBER_RE.sub('', text.strip())
+    return ' '.join(text.rstrip(':').split()).casefold()
+
+
+def is_reference_entry(text):
+    return bool(_REFERENCE_ENTRY_RE.match(text.strip()))
+
+
+class ReferenceSections:
+    # Body paragraphs that belong to a bibliography: everything under a "References
+    # cited" / "Références citées" heading up to the next heading, paragraphs in a
+    # bibliography style, and runs of reference-shaped paragraphs with no heading at
+    # all. These are copied through untranslated, apart from a few fixed tokens.
+    def __init__(self, paragraph_indices, source_lang):
+        self.paragraph_indices = frozenset(paragraph_indices)
+        self.target_lang = "fr" if source_lang == "en" else "en"
+        self.skipped = 0
+        self.token_replacements = 0
+    
+    @classmethod
+    def detect(cls, document, source_lang, headings=None, style_names=None, min_entry_run=None):
+        settings = config.REFERENCE_SECTION_CONFIG
+        headings = {_normalize_heading(h) for h in (headings or settings["headings"])}
+        style_names = {name.casefold() for name in (style_names or settings["style_names"])}
+        min_entry_run = min_entry_run or settings["min_entry_run"]
+        
+        indices = set()
+        in_section = False
+        entry_run = []
+        for para_idx, paragraph in enumerate(document.paragraphs):
+            text = paragraph.text.strip()
+            style_name = paragraph.style.name if paragraph.style is not None else ''
+            is_heading = bool(_HEADING_STYLE_RE.match(style_name))
+            
+            if text and _normalize_heading(text) in headings:
+                in_section = True
+                entry_run = []
+                continue
+            if is_heading or (text and len(text.split()) <= 6 and _END_HEADING_RE.match(text)):
+                in_section = False
+            
+            if style_name.casefold() in style_names:
+                indices.add(para_idx)
+                continue
+            if not text:
+                continue
+            
+            if in_section:
+                if _LOOSE_ENTRY_RE.match(text):
+                    indices.add(para_idx)
+                continue
+            
+            if not is_heading and is_reference_entry(text):
+                entry_run.append(para_idx)
+                if len(entry_run) >= min_entry_run:
+                    indices.update(entry_run)
+            else:
+                entry_run = []
+        return cls(indices, source_lang)
+    
+    def __contains__(self, location):
+        return location.get("section") == "paragraphs" and location.get("index") in self.paragraph_indices
+    
+    def __len__(self):
+        return len(self.paragraph_indices)
+    
+    def copy_through(self, paragraph):
+        # Leaves the reference as written; only "In:" and "in press" follow the target language
+        self.skipped += 1
+        for run in paragraph.runs:
+            text = run.text
+            if not text:
+                continue
+            for pattern, replacement in _REFERENCE_TOKENS[self.target_lang]:
+                text, count = pattern.subn(replacement, text)
+                self.token_replacements += count
+            if text != run.text:
+                run.text = text
+    
+    def stats(self):
+        return {"skipped": self.skipped, "token_replacements": self.token_replacements}
+
+
+def format_reference_stats(stats):
+    return (
+        f"Copied {stats['skipped']} reference paragraphs untranslated "
+        f"({stats['token_replacements']} rule-based token replacements)"
+    )
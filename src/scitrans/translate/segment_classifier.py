@@ -0,0 +1,241 @@
+import re
+
+from scitrans import config
+from scitrans.create_training_data.language_classifier.language_classifier import LanguageClassifier
+from scitrans.rules_based_replacements.glossary_store import get_glossary_store
+from scitrans.translate.progress import translate_with_progress
+from scitrans.translate.word_formatting import is_numeric, convert_numeric
+
+BYPASS_CLASSES = (
+    "numeric", "range", "measurement", "url", "label", "citation", "species", "glossary", "target_language",
+)
+
+# SI and other symbols written the same way in English and French
+_UNIT_SYMBOLS = (
+    "mm", "cm", "m", "km", "µm", "mg", "g", "kg", "t", "mL", "ml", "L", "l", "ha",
+    "m2", "m²", "km2", "km²", "m3", "m³", "°C", "°", "%", "‰", "psu", "ppt",
+    "s", "min", "h", "Hz", "kHz", "nm", "µg", "ng",
+)
+_UNIT_RE = '|'.join(re.escape(unit) for unit in sorted(_UNIT_SYMBOLS, key=len, reverse=True))
+_NUMBER_RE = r'[<>≤≥~±]?\s*-?\d[\d\s.,\u00a0\u202f]*'
+_RANGE_RE = re.compile(rf'^({_NUMBER_RE}?)\s*([-–])\s*({_NUMBER_RE}?)(?:\s*({_UNIT_RE}))?$')
+_MEASUREMENT_RE = re.compile(rf'^({_NUMBER_RE}?)\s*({_UNIT_RE})$')
+
+_YEAR_RE = re.compile(r'^\d{4}$')
+_URL_RE = re.compile(
+    r'^(?:(?:https?://|www\.)\S+|(?:doi:\s*|https?://(?:dx\.)?doi\.org/)?10\.\d{4,9}/\S+|[\w.+-]+@[\w-]+\.[\w.-]+)$',
+    re.IGNORECASE
+)
+_LABEL_RE = re.compile(r'^(Figure|Fig\.|Fig|Table|Tableau)\s*(\d+[A-Za-z]?)(\.?)$', re.IGNORECASE)
+_LABEL_NAMES = {
+    "fr": {"table": "Tableau"},
+    "en": {"tableau": "Table"},
+}
+
+_AUTHOR = r"[A-Z][\w'’-]+"
+_CITATION = (
+    rf"{_AUTHOR}(?: et al\.| (?:and|et|&) {_AUTHOR})?,? (?:\d{{4}}[a-z]?(?:, \d{{4}}[a-z]?)*|n\.d\.|in press|sous presse)"
+)
+_CITATION_RE = re.compile(rf'^\(?{_CITATION}(?:; {_CITATION})*\)?\.?$')
+# Without parentheses, "Automne 2018" or "Sommaire 2020" has the shape of a single-author citation
+_MULTI_AUTHOR_RE = re.compile(rf"^{_AUTHOR}(?: et al\.| (?:and|et|&) {_AUTHOR})")
+# The conjunction is only swapped between two author names, so "et al." stays as written
+_CITATION_CONJUNCTIONS = {
+    "fr": ((re.compile(rf"(?<=\w) and (?={_AUTHOR})"), " et "), (re.compile(r" in press\b"), " sous presse")),
+    "en": ((re.compile(rf"(?<=\w) et (?={_AUTHOR})"), " and "), (re.compile(r" sous presse\b"), " in press")),
+}
+
+# The word lists leave out short function words, which also start "In 2019"-style phrases
+_FUNCTION_WORDS = frozenset((
+    "in", "since", "by", "from", "until", "to", "after", "before", "during", "the", "of", "for",
+    "at", "on", "as", "and", "or", "en", "depuis", "dans", "de", "du", "le", "la", "les", "avant",
+    "après", "pendant", "pour", "par", "et", "ou", "au", "aux",
+))
+_DATE_WORDS = frozenset((
+    "january", "february", "march", "april", "may", "june", "july", "august", "september", "october",
+    "november", "december", "janvier", "février", "mars", "avril", "mai", "juin", "juillet", "août",
+    "septembre", "octobre", "novembre", "décembre", "spring", "summer", "fall", "autumn", "winter",
+    "printemps", "été", "automne", "hiver",
+))
+
+_BINOMIAL_RE = re.compile(r'^([A-Z][a-z]+) ([a-z]+|spp?\.)$')
+_LATIN_EPITHET_ENDINGS = (
+    "us", "um", "is", "ii", "ae", "ensis", "oides", "atus", "ata", "icus", "ica",
+    "inus", "ina", "ella", "orum", "ops",
+)
+
+
+class SegmentClassifier:
+    # Rules for segments a model would only copy or reformat: numbers, ranges and
+    # measurements, URLs/DOIs, "Figure 3." labels, citation keys, species binomials
+    # and segments that are exactly one glossary term or already written in the target
+    # language. translate returns the deterministic translation, or None when the
+    # segment needs the models.
+    def __init__(
+            self, source_lang, glossary=None, scientific_names=None, word_lists=None, classes=None,
+            language_classifier=None, language_threshold=None, language_min_words=None
+    ):
+        self.source_lang = source_lang
+        self.target_lang = "fr" if source_lang == "en" else "en"
+        self.glossary = glossary or {}
+        self.scientific_names = {name.lower() for name in scientific_names or ()}
+        self.genera = {name.split()[0] for name in self.scientific_names if name.split()}
+        self.common_words = word_lists if word_lists is not None else set()
+        self.classes = tuple(classes) if classes is not None else BYPASS_CLASSES
+        self.language_classifier = language_classifier
+        self.language_threshold = language_threshold or config.SEGMENT_BYPASS_CONFIG["target_language_threshold"]
+        self.language_min_words = language_min_words or config.SEGMENT_BYPASS_CONFIG["target_language_min_words"]
+        self.counts = {}
+    
+    @classmethod
+    def from_glossary(cls, json_path=None, source_lang="en", **kwargs):
+        json_path = json_path or config.PREFERENTIAL_JSON_PATH
+        glossary = {}
+        scientific_names = set()
+        try:
+            store = get_glossary_store(json_path)
+            glossary = store.glossary(source_lang)
+            scientific_names = {
+                entry["scientific"] for entry in store.data.get("translations", {}).get("taxon", [])
+                if entry.get("scientific")
+            }
+        except FileNotFoundError:
+            pass
+        language_classifier = LanguageClassifier()
+        word_lists = language_classifier.english_words | language_classifier.french_words
+        return cls(
+            source_lang, glossary=glossary, scientific_names=scientific_names, word_lists=word_lists,
+            language_classifier=language_classifier, **kwargs
+        )
+    
+    def _convert_number(self, text):
+        text = text.strip()
+        if not text or not is_numeric(text):
+            return text
+        return convert_numeric(text, to_fr=self.target_lang == "fr")
+    
+    def _unit_separator(self):
+        return "\u00a0" if self.target_lang == "fr" else " "
+    
+    def _numeric(self, text):
+        # A bare four-digit number is a year and stays as written; with a unit it is a quantity
+        if _YEAR_RE.match(text):
+            return text
+        if is_numeric(text):
+            return self._convert_number(text)
+        return None
+    
+    def _range(self, text):
+        m = _RANGE_RE.match(text)
+        if not m or not is_numeric(m.group(1)) or not is_numeric(m.group(3)):
+            return None
+        translated = f"{self._convert_number(m.group(1))}{m.group(2)}{self._convert_number(m.group(3))}"
+        if m.group(4):
+            translated += self._unit_separator() + m.group(4)
+        return translated
+    
+    def _measurement(self, text):
+        m = _MEASUREMENT_RE.match(text)
+        if not m or not is_numeric(m.group(1)):
+            return None
+        return f"{self._convert_number(m.group(1))}{self._unit_separator()}{m.group(2)}"
+    
+    def _url(self, text):
+        return text if _URL_RE.match(text) else None
+    
+    def _label(self, text):
+        m = _LABEL_RE.match(text)
+        if not m:
+            return None
+        name = _LABEL_NAMES[self.target_lang].get(m.group(1).lower(), m.group(1))
+        return f"{name} {m.group(2)}{m.group(3)}"
+    
+    def _citation(self, text):
+        if not _CITATION_RE.match(text):
+            return None
+        citations = text.strip('().').split('; ')
+        if not text.startswith('(') and not all(_MULTI_AUTHOR_RE.match(citation) for citation in citations):
+            return None
+        # "In 2019" and "(Automne 2018)" have the shape of a single-author citation
+        for citation in citations:
+            first_word = citation.split()[0].lower()
+            if first_word in self.common_words or first_word in _FUNCTION_WORDS or first_word in _DATE_WORDS:
+                return None
+        for pattern, target in _CITATION_CONJUNCTIONS[self.target_lang]:
+            text = pattern.sub(target, text)
+        return text
+    
+    def _species(self, text):
+        if text.lower() in self.scientific_names:
+            return text
+        m = _BINOMIAL_RE.match(text)
+        if not m:
+            return None
+        genus, epithet = (part.lower() for part in m.groups())
+        if any(part in self.common_words or part in _FUNCTION_WORDS for part in (genus, epithet)):
+            return None
+        if epithet in ("sp.", "spp."):
+            return text
+        # Endings like "-us" also fit English words ("Stock status"), so only genera from the taxon glossary qualify
+        if genus in self.genera and epithet.endswith(_LATIN_EPITHET_ENDINGS):
+            return text
+        return None
+    
+    def _glossary(self, text):
+        return self.glossary.get(text)
+    
+    def _target_language(self, text):
+        # French quotes, titles and abstracts inside an English source (and the reverse)
+        if self.language_classifier is None:
+            return None
+        lang, confidence, recognised = self.language_classifier.language_confidence(text)
+        if lang == self.target_lang and confidence >= self.language_threshold and recognised >= self.language_min_words:
+            return text
+        return None
+    
+    def classify(self, text):
+        # (class name, translation) for the first rule that matches, else (None, None)
+        stripped = text.strip()
+        if not stripped:
+            return None, None
+        for name in self.classes:
+            translated = getattr(self, f"_{name}")(stripped)
+            if translated is not None:
+                return name, translated
+        return None, None
+    
+    def translate(self, text):
+        name, translated = self.classify(text)
+        if name is None:
+            return None
+        self.counts[name] = self.counts.get(name, 0) + 1
+        leading = text[:len(text) - len(text.lstrip())]
+        trailing = text[len(text.rstrip()):]
+        return f"{leading}{translated}{trailing}"
+    
+    def stats(self):
+        return dict(self.counts)
+
+
+def translate_segment(translation_manager, text, classifier=None, progress=None, corpus=None, **kwargs):
+    # The single entry point for one segment: human reference translations first, then rules, then the model ensemble
+    if corpus is not None:
+        matched = corpus.translate(text)
+        if matched is not None:
+            if progress is not None:
+                progress.skip(1)
+            _source_text, corpus_name = corpus.matches[-1]
+            return {"translated_text": matched, "corpus_match": corpus_name}
+    if classifier is not None:
+        bypassed = classifier.translate(text)
+        if bypassed is not None:
+            if progress is not None:
+                progress.skip(1)
+            return {"translated_text": bypassed, "bypass": True}
+    return translate_with_progress(translation_manager, progress, text=text, **kwargs)
+
+
+def format_bypass_stats(stats):
+    total = sum(stats.values())
+    details = ", ".join(f"{name}={count}" for name, count in sorted(stats.items()))
+    return f"Bypassed the models for {total} segments ({details})"
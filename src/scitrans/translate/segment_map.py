@@ -0,0 +1,99 @@
+import hashlib
+import json
+import os
+import unicodedata
+
+from scitrans.translate.word_reader import iter_keyed_paragraph_texts
+
+SEGMENT_MAP_VERSION = 1
+
+
+def normalize_segment(text):
+    return ' '.join(unicodedata.normalize('NFC', text).split())
+
+
+def segment_hash(text):
+    return hashlib.sha256(normalize_segment(text).encode('utf-8')).hexdigest()[:20]
+
+
+class SegmentMap:
+    # Source-segment hash -> translated text, from a previous run of the same document.
+    # Segments are the paragraph (or tab-separated group) texts that _chunk_and_translate
+    # receives, so an unchanged paragraph is reused whole and only edited ones go to the
+    # models. New translations are recorded so the map can be saved for the next draft.
+    def __init__(self, translations=None, source_lang=None):
+        self.translations = dict(translations or {})
+        self.source_lang = source_lang
+        self.recorded = {}
+        self.reused = 0
+        self.retranslated = 0
+    
+    def __contains__(self, source_text):
+        # A peek that leaves the reuse counts alone
+        return bool(normalize_segment(source_text)) and segment_hash(source_text) in self.translations
+    
+    def lookup(self, source_text):
+        if not normalize_segment(source_text):
+            return None
+        key = segment_hash(source_text)
+        translated = self.translations.get(key)
+        if translated is not None:
+            self.reused += 1
+            self.recorded[key] = translated
+        return translated
+    
+    def record(self, source_text, translated_text):
+        if not normalize_segment(source_text):
+            return
+        self.retranslated += 1
+        self.recorded[segment_hash(source_text)] = translated_text
+    
+    def remember(self, source_text, translated_text):
+        # Keeps a translation for the saved map without counting it as reused or new
+        if normalize_segment(source_text):
+            self.recorded[segment_hash(source_text)] = translated_text
+    
+    def stats(self):
+        return {"reused": self.reused, "retranslated": self.retranslated}
+    
+    def save(self, path):
+        data = {
+            "version": SEGMENT_MAP_VERSION,
+            "source_lang": self.source_lang,
+            "segments": self.recorded,
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+    
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get("version") != SEGMENT_MAP_VERSION:
+            raise ValueError(f"Unsupported segment map version in {path}: {data.get('version')!r}")
+        return cls(data["segments"], source_lang=data.get("source_lang"))
+    
+    @classmethod
+    def from_documents(cls, previous_source_docx, previous_translated_docx, source_lang=None):
+        # Pairs paragraphs by structural position; positions missing from either side
+        # (e.g. header parts python-docx adds on save) are simply not paired
+        translated_by_key = dict(iter_keyed_paragraph_texts(previous_translated_docx))
+        translations = {}
+        for key, source_text in iter_keyed_paragraph_texts(previous_source_docx):
+            translated_text = translated_by_key.get(key)
+            if translated_text is None or not normalize_segment(source_text):
+                continue
+            translations.setdefault(segment_hash(source_text), translated_text)
+            
+            # tab-separated groups are translated one at a time, so index them too
+            source_groups = source_text.split('\t')
+            translated_groups = translated_text.split('\t')
+            if len(source_groups) > 1 and len(source_groups) == len(translated_groups):
+                for source_group, translated_group in zip(source_groups, translated_groups):
+                    if normalize_segment(source_group):
+                        translations.setdefault(segment_hash(source_group), translated_group)
+        return cls(translations, source_lang=source_lang)
+
+
+def segment_map_path_for(output_docx_file):
+    return os.path.splitext(output_docx_file)[0] + '_segments.json'
@@ -0,0 +1,148 @@
+import json
+import logging
+import os
+import pickle
+from collections import Counter
+from contextlib import contextmanager
+
+import torch
+
+from scitrans import config
+
+logger = logging.getLogger(__name__)
+
+SHORTLIST_VERSION = 1
+
+
+def _encode_source(tokenizer, text):
+    return tokenizer(text, add_special_tokens=False)["input_ids"]
+
+
+def _encode_target(tokenizer, text):
+    # Marian keeps a separate target vocabulary model; text_target selects it
+    return tokenizer(text_target=text, add_special_tokens=False)["input_ids"]
+
+
+def _iter_training_pairs(jsonl_paths, source_lang):
+    for path in jsonl_paths:
+        if not os.path.exists(path):
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if record.get("source_lang") == source_lang and record.get("source") and record.get("target"):
+                    yield record["source"], record["target"]
+
+
+def build_shortlist_table(pairs, encode_source, encode_target, top_k, frequent_targets, min_cooccurrence):
+    # Target tokens ranked for each source token by their Dice coefficient over sentence
+    # pairs, which keeps frequent function words from crowding out the real translations;
+    # those frequent words are allowed for every input instead
+    source_counts = Counter()
+    target_counts = Counter()
+    cooccurrence = {}
+    for source_text, target_text in pairs:
+        source_ids = set(encode_source(source_text))
+        target_ids = set(encode_target(target_text))
+        source_counts.update(source_ids)
+        target_counts.update(target_ids)
+        for source_id in source_ids:
+            cooccurrence.setdefault(source_id, Counter()).update(target_ids)
+    
+    table = {}
+    for source_id, counts in cooccurrence.items():
+        scored = [
+            (2 * count / (source_counts[source_id] + target_counts[target_id]), target_id)
+            for target_id, count in counts.items() if count >= min_cooccurrence
+        ]
+        scored.sort(reverse=True)
+        table[source_id] = [target_id for _, target_id in scored[:top_k]]
+    frequent = [target_id for target_id, _ in target_counts.most_common(frequent_targets)]
+    return table, frequent
+
+
+class LexicalShortlist:
+    # Source token -> likely target tokens for one model direction. The decoder only scores
+    # the union of the candidates for the current input, the most frequent target tokens,
+    # the special tokens and the input's own tokens (placeholders, numbers and names are
+    # copied through).
+    def __init__(self, table, frequent, special_ids=()):
+        self.table = table
+        self.always = set(frequent) | set(special_ids)
+    
+    @classmethod
+    def load(cls, tokenizer, model_name, source_lang, target_lang, jsonl_paths=None, cache_dir=None):
+        settings = config.SHORTLIST_CONFIG
+        jsonl_paths = [os.fspath(path) for path in (jsonl_paths or settings["jsonl_paths"])]
+        cache_dir = os.fspath(cache_dir or settings["cache_dir"])
+        build_settings = {key: settings[key] for key in ("top_k", "frequent_targets", "min_cooccurrence")}
+        corpus_key = [(path, os.stat(path).st_mtime_ns, os.stat(path).st_size) for path in jsonl_paths if os.path.exists(path)]
+        if not corpus_key:
+            return None
+        
+        cache_path = os.path.join(cache_dir, f"{model_name}_{source_lang}-{target_lang}.pickle")
+        key = {"version": SHORTLIST_VERSION, "corpus": corpus_key, "settings": build_settings}
+        if os.path.exists(cache_path):
+            try:
+                with open(cache_path, 'rb') as f:
+                    payload = pickle.load(f)
+                if payload.get("key") == key:
+                    return cls(payload["table"], payload["frequent"], tokenizer.all_special_ids)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                pass
+        
+        table, frequent = build_shortlist_table(
+            _iter_training_pairs(jsonl_paths, source_lang),
+            lambda text: _encode_source(tokenizer, text), lambda text: _encode_target(tokenizer, text),
+            **build_settings
+        )
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            with open(cache_path, 'wb') as f:
+                pickle.dump({"key": key, "table": table, "frequent": frequent}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError as e:
+            logger.warning("could not write shortlist %s: %s", cache_path, e)
+        return cls(table, frequent, tokenizer.all_special_ids)
+    
+    def allowed_ids(self, source_ids, extra_ids=()):
+        allowed = set(self.always)
+        allowed.update(source_ids)
+        allowed.update(extra_ids)
+        for source_id in source_ids:
+            allowed.update(self.table.get(source_id, ()))
+        return torch.tensor(sorted(allowed), dtype=torch.long)
+
+
+class _ShortlistOutputLayer(torch.nn.Module):
+    # Projects onto the shortlisted rows only and scatters the scores into a full-vocabulary
+    # tensor, so generate still sees ordinary token ids and the other tokens score -inf
+    def __init__(self, output_layer, allowed_ids):
+        super().__init__()
+        weight, bias = output_layer.weight, getattr(output_layer, "bias", None)
+        if not isinstance(output_layer, torch.nn.Linear):
+            # An int8 head (quantize_dynamic) keeps its packed weight and bias behind methods;
+            # only the shortlisted rows are dequantized
+            weight, bias = weight(), bias()
+        self.vocab_size = weight.shape[0]
+        self.allowed_ids = allowed_ids.to(weight.device)
+        self.weight = weight.index_select(0, self.allowed_ids)
+        if self.weight.is_quantized:
+            self.weight = self.weight.dequantize()
+        self.bias = bias.index_select(0, self.allowed_ids) if bias is not None else None
+    
+    def forward(self, hidden_states):
+        logits = torch.nn.functional.linear(hidden_states, self.weight, self.bias)
+        scores = logits.new_full((*logits.shape[:-1], self.vocab_size), float("-inf"))
+        return scores.index_copy_(-1, self.allowed_ids, logits)
+
+
+@contextmanager
+def shortlisted_output_layer(model, allowed_ids):
+    output_layer = model.get_output_embeddings()
+    model.set_output_embeddings(_ShortlistOutputLayer(output_layer, allowed_ids))
+    try:
+        yield model
+    finally:
+        model.set_output_embeddings(output_layer)
@@ -1,8 +1,13 @@
 import logging
 import os
 
+from scitrans.translate.corpus_lookup import CorpusLookup, format_corpus_stats
 from scitrans.translate.models import create_translator
-from scitrans.translate.utils import split_into_chunks, reassemble_chunks, normalize_apostrophes
+from scitrans.translate.pipeline import SegmentPipeline
+from scitrans import config
+from scitrans.translate.progress import TranslationProgress, resolve_progress_callback
+from scitrans.translate.segment_classifier import SegmentClassifier, translate_segment, format_bypass_stats
+from scitrans.translate.utils import split_into_chunks, reassemble_chunks, normalize_apostrophes, ChunkPlanner
 
 logger = logging.getLogger(__name__)
 
@@ -18,7 +23,11 @@ def translate_txt_document(
         translation_manager=None,
         start_idx=0,
         single_attempt=False,
-        use_cache=True
+        use_cache=True,
+        progress=None,
+        bypass_rules=None,
+        pipeline=None,
+        corpus_lookup=None
 ):
     if not output_text_file:
         base, ext = os.path.splitext(input_text_file)
@@ -32,8 +41,6 @@ def translate_txt_document(
     with open(input_text_file, 'r', encoding='utf-8') as f:
         text = f.read()
     
-    chunks, chunk_metadata = split_into_chunks(text, chunk_by=chunk_by)
-    
     if not translation_manager:
         translation_manager = create_translator(
             use_finetuned=use_finetuned,
@@ -42,27 +49,84 @@ def translate_txt_document(
             load_models=True
         )
     
+    if chunk_by == "tokens":
+        chunk_by = ChunkPlanner.for_manager(translation_manager, source_lang=source_lang, target_lang=target_lang)
+    chunks, chunk_metadata = split_into_chunks(text, chunk_by=chunk_by)
+    
+    if use_find_replace and hasattr(translation_manager, 'prefetch_segments'):
+        translation_manager.prefetch_segments(
+            [chunk for chunk, metadata in zip(chunks, chunk_metadata) if not metadata.get('is_empty', False)],
+            source_lang=source_lang
+        )
+    
+    if bypass_rules is None:
+        bypass_rules = config.SEGMENT_BYPASS_CONFIG.get("enabled", False)
+    classifier = SegmentClassifier.from_glossary(source_lang=source_lang) if bypass_rules else None
+    
+    if corpus_lookup is None:
+        corpus_lookup = config.CORPUS_LOOKUP_CONFIG.get("enabled", False)
+    corpus = CorpusLookup.load(source_lang=source_lang) if corpus_lookup else None
+    
+    translation_progress = None
+    progress_callback = resolve_progress_callback(progress)
+    if progress_callback is not None:
+        translation_progress = TranslationProgress(
+            sum(1 for metadata in chunk_metadata if not metadata.get('is_empty', False)),
+            callback=progress_callback, title=os.path.basename(input_text_file)
+        )
+        translation_progress.start()
+    
+    if pipeline is None:
+        pipeline = config.PIPELINE_CONFIG.get("enabled", False)
+    segment_pipeline = None
+    if pipeline:
+        segment_pipeline = SegmentPipeline(
+            translation_manager,
+            [
+                (chunk, i) for i, (chunk, metadata) in enumerate(zip(chunks, chunk_metadata), start_idx + 1)
+                if not metadata.get('is_empty', False) and (corpus is None or chunk not in corpus)
+                and (classifier is None or classifier.classify(chunk)[0] is None)
+            ],
+            preprocess=use_find_replace, source_lang=source_lang, target_lang=target_lang,
+            use_find_replace=use_find_replace, single_attempt=single_attempt, use_cache=use_cache
+        )
+        translation_manager = segment_pipeline.start()
+    
     translated_chunks = []
     next_idx = start_idx
-    for i, (chunk, metadata) in enumerate(zip(chunks, chunk_metadata), start_idx + 1):
-        if metadata.get('is_empty', False):
-            translated_chunks.append('')
-            continue
-        
-        result = translation_manager.translate_with_best_model(
-            text=chunk,
-            source_lang=source_lang,
-            target_lang=target_lang,
-            use_find_replace=use_find_replace,
-            idx=i,
-            single_attempt=single_attempt,
-            use_cache=use_cache
-        )
-        
-        translated_text = result.get("translated_text", "[TRANSLATION FAILED]")
-        translated_text = normalize_apostrophes(translated_text)
-        translated_chunks.append(translated_text)
-        next_idx = i
+    completed = False
+    try:
+        for i, (chunk, metadata) in enumerate(zip(chunks, chunk_metadata), start_idx + 1):
+            if metadata.get('is_empty', False):
+                translated_chunks.append('')
+                continue
+            
+            result = translate_segment(
+                translation_manager, classifier=classifier, progress=translation_progress, corpus=corpus,
+                text=chunk,
+                source_lang=source_lang,
+                target_lang=target_lang,
+                use_find_replace=use_find_replace,
+                idx=i,
+                single_attempt=single_attempt,
+                use_cache=use_cache
+            )
+            
+            translated_text = result.get("translated_text", "[TRANSLATION FAILED]")
+            translated_text = normalize_apostrophes(translated_text)
+            translated_chunks.append(translated_text)
+            next_idx = i
+        completed = True
+    finally:
+        if segment_pipeline is not None:
+            segment_pipeline.close()
+        if translation_progress is not None:
+            translation_progress.finish(completed=completed)
+    
+    if corpus is not None and corpus.matches:
+        print(format_corpus_stats(corpus.matches))
+    if classifier is not None and classifier.counts:
+        print(format_bypass_stats(classifier.stats()))
     
     translated_document = reassemble_chunks(translated_chunks, chunk_metadata)
     
@@ -1,5 +1,7 @@
 import re
 
+from scitrans import config
+
 _PROTECTED_LABEL_PATTERN = re.compile(r'\b(Figure|Fig|Table|Tableau)\.?\s*\d+\.?', re.IGNORECASE)
 _LABEL_PREFIX_RE = re.compile(r'^((?:Figure|Fig|Table|Tableau)\.?\s*\d+)\.\s+', re.IGNORECASE)
 _PLACEHOLDER = '\x00'
@@ -90,7 +92,111 @@ def split_by_paragraphs(text):
     return chunks, chunk_metadata
 
 
+_CLAUSE_BOUNDARY_RE = re.compile(r'(?<=[,;:])\s+|\s+(?=[–—]\s)')
+
+
+def estimate_tokens(text, chars_per_token=None):
+    chars_per_token = chars_per_token or config.CHUNK_PLANNER_CONFIG["chars_per_token"]
+    return -(-len(text) // chars_per_token)
+
+
+class ChunkPlanner:
+    # Token-aware alternative to chunk_by="sentences": sentences longer than max_tokens
+    # are split at clause boundaries (then between words), and adjacent short sentences
+    # of the same line are packed into one model input up to max_tokens. Chunks carry
+    # the same metadata as split_by_sentences, so reassemble_chunks is unchanged.
+    def __init__(self, count_tokens=None, max_tokens=None, pack_sentences=None):
+        settings = config.CHUNK_PLANNER_CONFIG
+        self.count_tokens = count_tokens or estimate_tokens
+        self.max_tokens = max_tokens or settings["max_tokens"]
+        self.pack_sentences = settings["pack_sentences"] if pack_sentences is None else pack_sentences
+        self._token_counts = {}
+    
+    @classmethod
+    def for_manager(cls, translation_manager, source_lang="en", target_lang="fr", **kwargs):
+        # Measures with the longest tokenization across the loaded models' tokenizers
+        count_tokens = None
+        if hasattr(translation_manager, "count_tokens"):
+            def count_tokens(text):
+                return translation_manager.count_tokens(text, source_lang=source_lang, target_lang=target_lang)
+        return cls(count_tokens, **kwargs)
+    
+    def __str__(self):
+        # Stands in for the chunk_by name in checkpoint fingerprints
+        return f"tokens:{self.max_tokens}:{'packed' if self.pack_sentences else 'single'}"
+    
+    def tokens(self, text):
+        count = self._token_counts.get(text)
+        if count is None:
+            count = self.count_tokens(text)
+            self._token_counts[text] = count
+        return count
+    
+    def _split_long(self, sentence):
+        # Clause boundaries first; a clause that is still too long is split between words
+        pieces = []
+        for clause in _CLAUSE_BOUNDARY_RE.split(sentence):
+            if not clause:
+                continue
+            if self.tokens(clause) > self.max_tokens:
+                pieces.extend(clause.split())
+            else:
+                pieces.append(clause)
+        return self._pack(pieces)
+    
+    def _pack(self, pieces, keep_separate=None):
+        packed = []
+        current = []
+        current_tokens = 0
+        for piece in pieces:
+            piece_tokens = self.tokens(piece)
+            starts_new = keep_separate is not None and keep_separate(piece)
+            if current and (starts_new or current_tokens + piece_tokens > self.max_tokens):
+                packed.append(' '.join(current))
+                current = []
+                current_tokens = 0
+            current.append(piece)
+            current_tokens += piece_tokens
+        if current:
+            packed.append(' '.join(current))
+        return packed
+    
+    def plan(self, text):
+        chunks = []
+        chunk_metadata = []
+        for line_idx, line in enumerate(text.split('\n')):
+            if not line.strip():
+                chunks.append('')
+                chunk_metadata.append({'line_idx': line_idx, 'sent_idx': 0, 'is_last_in_line': True, 'is_empty': True})
+                continue
+            
+            pieces = []
+            for sentence in _split_into_sentences(line):
+                stripped = sentence.strip()
+                if not stripped:
+                    continue
+                if self.tokens(stripped) > self.max_tokens:
+                    pieces.extend(self._split_long(stripped))
+                else:
+                    pieces.append(stripped)
+            if self.pack_sentences:
+                # A "Table 1." label has to stay at the start of its chunk to keep its period
+                pieces = self._pack(pieces, keep_separate=lambda piece: split_label_prefix(piece)[0] is not None)
+            
+            for sent_idx, piece in enumerate(pieces):
+                chunks.append(piece)
+                chunk_metadata.append({
+                    'line_idx': line_idx,
+                    'sent_idx': sent_idx,
+                    'is_last_in_line': sent_idx == len(pieces) - 1,
+                    'is_empty': False
+                })
+        return chunks, chunk_metadata
+
+
 def split_into_chunks(text, chunk_by="sentences"):
+    if isinstance(chunk_by, ChunkPlanner):
+        return chunk_by.plan(text)
     if chunk_by == "paragraphs":
         return split_by_paragraphs(text)
     return split_by_sentences(text)
@@ -1,5 +1,5 @@
 import copy
-import json
+import dataclasses
 import os
 import re
 from datetime import datetime
@@ -10,27 +10,54 @@ from docx.oxml import OxmlElement
 from docx.oxml.ns import qn
 
 from scitrans import config
+from scitrans.translate.checkpoint import TranslationCheckpoint, checkpoint_path_for
+from scitrans.translate.corpus_lookup import CorpusLookup, format_corpus_stats
+from scitrans.translate.deadline import DeadlineScheduler, DeadlineTranslationManager, format_deadline_stats
 from scitrans.translate.models import create_translator
+from scitrans.translate.pipeline import SegmentPipeline
+from scitrans.translate.progress import TranslationProgress, resolve_progress_callback
+from scitrans.translate.references import ReferenceSections, format_reference_stats
+from scitrans.translate.segment_classifier import SegmentClassifier, translate_segment, format_bypass_stats
+from scitrans.translate.segment_map import SegmentMap, segment_map_path_for
 from scitrans.translate.utils import normalize_apostrophes
-from scitrans.translate.utils import split_into_chunks, reassemble_sentences, reassemble_paragraphs
+from scitrans.translate.utils import split_into_chunks, reassemble_sentences, reassemble_paragraphs, ChunkPlanner
 from scitrans.translate.utils import split_label_prefix, ensure_label_period
-from scitrans.translate.word_formatting import FormattedRun
-from scitrans.translate.word_formatting import apply_formatting_rules, RuleRegistry
-from scitrans.translate.word_notes import add_formatting_notes, extract_hyperlink_notes, write_notes_json, json_to_word_tables, _filter_notes
+from scitrans.translate.word_formatting import apply_formatting_rules, ParagraphAnalysis
+from scitrans.translate.word_notes import add_formatting_notes, extract_hyperlink_notes, write_notes_json, write_notes_docx, _filter_notes
+from scitrans.translate.word_notes import add_degraded_notes, add_corpus_notes
 from scitrans.translate.word_formatting import is_numeric, convert_numeric, parse_formatted_string
 from scitrans.rules_based_replacements.token_utils import get_translation_value, normalize_translations
+from scitrans.rules_based_replacements.glossary_store import get_glossary_store
 
 _MC_NS = 'http://schemas.openxmlformats.org/markup-compatibility/2006'
 
+_MAX_CACHED_CELL_LOOKUPS = 8
+_cell_lookup_cache = {}
 
-def _iter_document_elements(document):
+
+def _iter_unique_cells(table, stats=None):
+    # row.cells repeats a merged <w:tc> once per grid column (and per row for vertical
+    # merges); yield each physical cell once, at its first grid position
+    seen_tcs = set()
+    for row_idx, row in enumerate(table.rows):
+        for cell_idx, cell in enumerate(row.cells):
+            if stats is not None:
+                stats["grid_cells"] = stats.get("grid_cells", 0) + 1
+            if cell._tc in seen_tcs:
+                continue
+            seen_tcs.add(cell._tc)
+            if stats is not None:
+                stats["table_cells"] = stats.get("table_cells", 0) + 1
+            yield row_idx, cell_idx, cell
+
+
+def _iter_document_elements(document, stats=None):
     for para_idx, paragraph in enumerate(document.paragraphs):
         yield paragraph, {"section": "paragraphs", "index": para_idx}, "paragraph"
     
     for table_idx, table in enumerate(document.tables):
-        for row_idx, row in enumerate(table.rows):
-            for cell_idx, cell in enumerate(row.cells):
-                yield cell, {"section": "tables", "table": table_idx, "row": row_idx, "cell": cell_idx}, "cell"
+        for row_idx, cell_idx, cell in _iter_unique_cells(table, stats):
+            yield cell, {"section": "tables", "table": table_idx, "row": row_idx, "cell": cell_idx}, "cell"
     
     translated_hf_ids = set()
     header_footer_attrs = [
@@ -50,16 +77,93 @@ def _iter_document_elements(document):
                 yield paragraph, {"section": "headers_footers", "type": attr}, "paragraph"
             
             for table in hf.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        yield cell, {"section": "headers_footers", "type": attr, "in_table": True}, "cell"
+                for _row_idx, _cell_idx, cell in _iter_unique_cells(table, stats):
+                    yield cell, {"section": "headers_footers", "type": attr, "in_table": True}, "cell"
+
+
+def _iter_indexed_segments(text, chunk_by, idx=1):
+    # Mirrors the chunking in _chunk_and_translate: (segment, idx) for each model call
+    chunks, _ = split_into_chunks(text, chunk_by=chunk_by)
+    for i, chunk in enumerate(chunks, idx):
+        if not chunk.strip():
+            continue
+        label, rest = split_label_prefix(chunk)
+        if label and rest.strip():
+            yield label, i
+            yield rest, i
+        else:
+            yield chunk, i
+
+
+def _iter_text_segments(text, chunk_by):
+    for segment, _idx in _iter_indexed_segments(text, chunk_by):
+        yield segment
 
 
-def _has_formatting_differences(paragraph):
-    if not paragraph.runs:
+def _iter_segment_texts(document, chunk_by, skip=None, cell_lookups=None):
+    # Per-segment work (prefetching, progress totals) can be batched up front from this.
+    # cell_lookups=(source_lang, preferential_dict, table_translations_dict) leaves out the
+    # cells _translate_table_cell fills without the models, which never report progress
+    for element, location, elem_type in _iter_document_elements(document):
+        if skip is not None and location in skip:
+            continue
+        if elem_type == "cell" and cell_lookups is not None:
+            stripped = element.text.strip()
+            if not stripped or not _cell_needs_models(stripped, *cell_lookups):
+                continue
+        paragraphs = element.paragraphs if elem_type == "cell" else [element]
+        for paragraph in paragraphs:
+            yield from _iter_text_segments(paragraph.text, chunk_by)
+
+
+def _cell_needs_models(stripped, source_lang, preferential_dict, table_translations_dict):
+    # The branches of _translate_table_cell that end in a model call
+    if config.NUMERIC_CONVERSION_CONFIG.get("enabled") and is_numeric(stripped):
+        return False
+    if table_translations_dict and stripped in table_translations_dict:
+        return False
+    if preferential_dict and _find_preferential_match(stripped, source_lang, preferential_dict):
         return False
-    first_format = FormattedRun.create(paragraph.runs[0])
-    return any(run.text.strip() and FormattedRun.create(run) != first_format for run in paragraph.runs[1:])
+    return len(stripped) >= config.TABLE_TRANSLATION_CONFIG.get("min_cell_length_for_ai", 20)
+
+
+def _iter_model_segments(
+        docx_file, chunk_by, source_lang, skip=None, classifier=None, segment_map=None, checkpoint=None,
+        preferential_dict=None, table_translations_dict=None, corpus=None
+):
+    # (segment, idx) for each call a run will send to the models, in document order, for the
+    # pipeline to translate ahead. The paragraphs get the same run cleanup as in the walk, so
+    # this reads its own copy of the document, on the pipeline's planning thread and only as
+    # far ahead of the walk as the pipeline asks; texts reused from a segment map or
+    # checkpoint are left out
+    idx = 1
+    for element, location, elem_type in _iter_document_elements(Document(docx_file)):
+        if skip is not None and location in skip:
+            continue
+        if elem_type == "cell":
+            stripped = element.text.strip()
+            if not stripped or not _cell_needs_models(stripped, source_lang, preferential_dict, table_translations_dict):
+                continue
+        paragraphs = element.paragraphs if elem_type == "cell" else [element]
+        for paragraph in paragraphs:
+            texts = _paragraph_source_texts(paragraph)
+            if texts is None:
+                continue
+            for text in texts:
+                if segment_map is not None and text in segment_map:
+                    continue
+                if checkpoint is not None and checkpoint.contains(location, text):
+                    continue
+                for segment, segment_idx in _iter_indexed_segments(text, chunk_by, idx):
+                    if corpus is not None and segment in corpus:
+                        continue
+                    if classifier is None or classifier.classify(segment)[0] is None:
+                        yield segment, segment_idx
+            idx += 1
+
+
+def _has_formatting_differences(paragraph, analysis=None):
+    return ParagraphAnalysis.of(paragraph, analysis).has_formatting_differences
 
 
 def _isolate_run_tabs(paragraph):
@@ -89,31 +193,27 @@ def _isolate_run_tabs(paragraph):
 
 
 def _collapse_runs_preserving_shapes(paragraph):
-    if len(paragraph.runs) < 2:
+    analysis = ParagraphAnalysis(paragraph)
+    if len(analysis.runs) < 2:
         return
     p_element = paragraph._element
-    runs = list(paragraph.runs)
-    current_run = runs[0]
+    current = 0
+    current_format = analysis.formatted_runs[0]
     
-    for next_run in runs[1:]:
-        current_elem = current_run._element
-        next_elem = next_run._element
-        
-        has_special = (
-                next_elem.findall(qn('w:drawing')) or current_elem.findall(qn('w:drawing')) or
-                next_elem.findall(qn('w:fldChar')) or current_elem.findall(qn('w:fldChar')) or
-                next_elem.findall(qn('w:instrText')) or current_elem.findall(qn('w:instrText')) or
-                next_elem.findall(qn('w:tab')) or current_elem.findall(qn('w:tab'))
-        )
-        if has_special:
-            current_run = next_run
+    for i in range(1, len(analysis.runs)):
+        if analysis.special_runs[i] or analysis.special_runs[current]:
+            current = i
+            current_format = analysis.formatted_runs[i]
             continue
         
-        if FormattedRun.create(current_run) == FormattedRun.create(next_run):
-            current_run.text += next_run.text
-            p_element.remove(next_run._element)
+        next_format = analysis.formatted_runs[i]
+        if current_format == next_format:
+            analysis.runs[current].text += next_format.text
+            current_format = dataclasses.replace(current_format, text=current_format.text + next_format.text)
+            p_element.remove(analysis.runs[i]._element)
         else:
-            current_run = next_run
+            current = i
+            current_format = next_format
 
 
 def _remove_orphaned_field_runs(paragraph):
@@ -193,7 +293,37 @@ def _extract_non_run_elements(paragraph):
     return saved
 
 
-def _chunk_and_translate(source_text, translation_manager, source_lang, target_lang, use_find_replace, idx, use_cache, preferential_dict, chunk_by):
+def _chunk_and_translate(source_text, translation_manager, source_lang, target_lang, use_find_replace, idx, use_cache, preferential_dict, chunk_by, segment_map=None, checkpoint=None, location=None, progress=None, classifier=None, corpus=None, segment_results=None):
+    if checkpoint is not None:
+        resumed = checkpoint.lookup(location, source_text)
+        if resumed is not None:
+            if segment_map is not None:
+                segment_map.remember(source_text, resumed)
+            if progress is not None:
+                progress.skip(sum(1 for _ in _iter_text_segments(source_text, chunk_by)))
+            return resumed
+        translated = _chunk_and_translate(
+            source_text, translation_manager, source_lang, target_lang, use_find_replace,
+            idx, use_cache, preferential_dict, chunk_by, segment_map=segment_map, progress=progress,
+            classifier=classifier, corpus=corpus, segment_results=segment_results
+        )
+        checkpoint.record(location, source_text, translated)
+        return translated
+    
+    if segment_map is not None:
+        reused = segment_map.lookup(source_text)
+        if reused is not None:
+            if progress is not None:
+                progress.skip(sum(1 for _ in _iter_text_segments(source_text, chunk_by)))
+            return reused
+        translated = _chunk_and_translate(
+            source_text, translation_manager, source_lang, target_lang, use_find_replace,
+            idx, use_cache, preferential_dict, chunk_by, progress=progress, classifier=classifier, corpus=corpus,
+            segment_results=segment_results
+        )
+        segment_map.record(source_text, translated)
+        return translated
+    
     chunks, chunk_metadata = split_into_chunks(source_text, chunk_by=chunk_by)
     translated_chunks = []
     
@@ -204,7 +334,8 @@ def _chunk_and_translate(source_text, translation_manager, source_lang, target_l
         
         label, rest = split_label_prefix(chunk)
         if label and rest.strip():
-            label_result = translation_manager.translate_with_best_model(
+            label_result = translate_segment(
+                translation_manager, classifier=classifier, progress=progress, corpus=corpus,
                 text=label,
                 source_lang=source_lang,
                 target_lang=target_lang,
@@ -212,7 +343,8 @@ def _chunk_and_translate(source_text, translation_manager, source_lang, target_l
                 idx=i,
                 use_cache=use_cache
             )
-            rest_result = translation_manager.translate_with_best_model(
+            rest_result = translate_segment(
+                translation_manager, classifier=classifier, progress=progress, corpus=corpus,
                 text=rest,
                 source_lang=source_lang,
                 target_lang=target_lang,
@@ -220,11 +352,14 @@ def _chunk_and_translate(source_text, translation_manager, source_lang, target_l
                 idx=i,
                 use_cache=use_cache
             )
+            if segment_results is not None:
+                segment_results.extend([(label, label_result), (rest, rest_result)])
             translated_label = ensure_label_period(label_result.get("translated_text", label))
             translated_rest = rest_result.get("translated_text", rest)
             translated_chunks.append(translated_label + ' ' + translated_rest.lstrip())
         else:
-            result = translation_manager.translate_with_best_model(
+            result = translate_segment(
+                translation_manager, classifier=classifier, progress=progress, corpus=corpus,
                 text=chunk,
                 source_lang=source_lang,
                 target_lang=target_lang,
@@ -232,6 +367,8 @@ def _chunk_and_translate(source_text, translation_manager, source_lang, target_l
                 idx=i,
                 use_cache=use_cache
             )
+            if segment_results is not None:
+                segment_results.append((chunk, result))
             translated_chunks.append(result.get("translated_text", chunk))
     
     if chunk_by == "paragraphs":
@@ -261,6 +398,37 @@ def _convert_newlines_to_breaks(paragraph):
                     run._element.append(t)
 
 
+def _prepare_paragraph_runs(paragraph):
+    # The run cleanup done before a paragraph is translated. Returns the non-run elements
+    # taken out and the run groups between tabs, or None for the groups when only field
+    # runs are left to translate
+    saved_elements = _extract_non_run_elements(paragraph)
+    _remove_orphaned_field_runs(paragraph)
+    
+    _isolate_run_tabs(paragraph)
+    _collapse_runs_preserving_shapes(paragraph)
+    
+    if _has_only_field_runs(paragraph):
+        return saved_elements, None
+    return saved_elements, _group_text_runs_between_tabs(paragraph)
+
+
+def _paragraph_source_texts(paragraph):
+    # The texts _translate_paragraph passes to _chunk_and_translate, or None when it returns
+    # without translating (and without advancing idx)
+    extract_hyperlink_notes(paragraph, [])
+    if not paragraph.text.strip():
+        return None
+    _saved_elements, groups = _prepare_paragraph_runs(paragraph)
+    if groups is None:
+        return None
+    if any(group is None for group in groups):
+        texts = [''.join(run.text or '' for run in group) for group in groups if group is not None]
+    else:
+        texts = [paragraph.text]
+    return [text for text in texts if text and text.strip()]
+
+
 def _group_text_runs_between_tabs(paragraph):
     groups = []
     current_group = []
@@ -280,31 +448,27 @@ def _group_text_runs_between_tabs(paragraph):
 def _translate_paragraph(
         paragraph, translation_manager, source_lang, target_lang,
         use_find_replace, idx, use_cache=True, formatting_records=None,
-        preferential_dict=None, chunk_by="sentences", location=None
+        preferential_dict=None, chunk_by="sentences", location=None, segment_map=None,
+        checkpoint=None, progress=None, classifier=None, corpus=None, segment_results=None
 ):
     has_hl = extract_hyperlink_notes(paragraph, formatting_records, location=location)
-    detected = RuleRegistry.detect_all(paragraph)
-    has_fmt = _has_formatting_differences(paragraph)
+    analysis = ParagraphAnalysis(paragraph)
+    detected = analysis.detected
+    has_fmt = _has_formatting_differences(paragraph, analysis)
     records_before = len(formatting_records) if formatting_records is not None else 0
     
     if has_fmt:
-        add_formatting_notes(paragraph, formatting_records, detected_rules=detected, location=location)
+        add_formatting_notes(paragraph, formatting_records, detected_rules=detected, location=location, analysis=analysis)
     
-    source_text = paragraph.text
+    source_text = analysis.text
     if not source_text or not source_text.strip():
         return idx
     
-    saved_elements = _extract_non_run_elements(paragraph)
-    _remove_orphaned_field_runs(paragraph)
-    
-    _isolate_run_tabs(paragraph)
-    _collapse_runs_preserving_shapes(paragraph)
-    
-    if _has_only_field_runs(paragraph):
+    saved_elements, groups = _prepare_paragraph_runs(paragraph)
+    if groups is None:
         _reinsert_non_run_elements(paragraph, saved_elements)
         return idx
     
-    groups = _group_text_runs_between_tabs(paragraph)
     has_tabs = any(g is None for g in groups)
     
     if has_tabs:
@@ -318,7 +482,9 @@ def _translate_paragraph(
                 source_text=group_text, translation_manager=translation_manager,
                 source_lang=source_lang, target_lang=target_lang,
                 use_find_replace=use_find_replace, idx=idx, use_cache=use_cache,
-                preferential_dict=preferential_dict, chunk_by=chunk_by
+                preferential_dict=preferential_dict, chunk_by=chunk_by, segment_map=segment_map,
+                checkpoint=checkpoint, location=location, progress=progress,
+                classifier=classifier, corpus=corpus, segment_results=segment_results
             )
             group[0].text = normalize_apostrophes(translated_segment)
             for run in group[1:]:
@@ -330,7 +496,9 @@ def _translate_paragraph(
                 source_text=full_text, translation_manager=translation_manager,
                 source_lang=source_lang, target_lang=target_lang,
                 use_find_replace=use_find_replace, idx=idx, use_cache=use_cache,
-                preferential_dict=preferential_dict, chunk_by=chunk_by
+                preferential_dict=preferential_dict, chunk_by=chunk_by, segment_map=segment_map,
+                checkpoint=checkpoint, location=location, progress=progress,
+                classifier=classifier, corpus=corpus, segment_results=segment_results
             )
             normalized = normalize_apostrophes(translated_text)
             runs = paragraph.runs
@@ -367,7 +535,8 @@ def _translate_table_cell(
         cell, translation_manager, source_lang, target_lang,
         use_find_replace, idx, use_cache=True, formatting_records=None,
         preferential_dict=None, table_translations_dict=None,
-        chunk_by="sentences", location=None
+        chunk_by="sentences", location=None, segment_map=None, checkpoint=None,
+        progress=None, classifier=None, corpus=None, segment_results=None
 ):
     to_fr = target_lang == "fr"
     cell_text = cell.text
@@ -416,7 +585,9 @@ def _translate_table_cell(
                     idx=idx, use_cache=use_cache,
                     formatting_records=formatting_records,
                     preferential_dict=preferential_dict,
-                    chunk_by=chunk_by, location=location
+                    chunk_by=chunk_by, location=location, segment_map=segment_map,
+                    checkpoint=checkpoint, progress=progress, classifier=classifier, corpus=corpus,
+                    segment_results=segment_results
                 )
             return idx
     elif len(stripped) >= config.TABLE_TRANSLATION_CONFIG.get("min_cell_length_for_ai", 20):
@@ -426,28 +597,55 @@ def _translate_table_cell(
                 use_find_replace, idx, use_cache=use_cache,
                 formatting_records=formatting_records,
                 preferential_dict=preferential_dict,
-                chunk_by=chunk_by, location=location
+                chunk_by=chunk_by, location=location, segment_map=segment_map,
+                checkpoint=checkpoint, progress=progress, classifier=classifier, corpus=corpus,
+                segment_results=segment_results
             )
         return idx
     
     return idx
 
 
-def _find_preferential_match(stripped, source_lang, preferential_dict):
-    lookup_key = stripped.lower()
+def _build_cell_lookup(preferential_dict, source_lang):
     pref_translations = preferential_dict.get("translations", preferential_dict)
     pref_translations = normalize_translations(pref_translations)
+    lookup = {}
     for category, terms in pref_translations.items():
         for term_key, term_data in terms.items():
-            if term_key.lower() == lookup_key:
-                if source_lang == "en":
-                    match_translation = get_translation_value(term_data)
-                else:
-                    match_translation = term_key if source_lang == "fr" else None
-                if match_translation:
-                    if stripped[0].isupper() and match_translation[0].islower():
-                        match_translation = match_translation[0].upper() + match_translation[1:]
-                    return match_translation
+            lookup_key = term_key.lower()
+            if lookup_key in lookup:
+                continue
+            if source_lang == "en":
+                match_translation = get_translation_value(term_data)
+            else:
+                match_translation = term_key if source_lang == "fr" else None
+            # the first key with a usable translation wins, as in the original category/term scan
+            if match_translation:
+                lookup[lookup_key] = match_translation
+    return lookup
+
+
+def _get_cell_lookup(preferential_dict, source_lang):
+    cache_key = (id(preferential_dict), source_lang)
+    cached = _cell_lookup_cache.get(cache_key)
+    # holding the dict in the cache entry keeps its id from being reused
+    if cached and cached[0] is preferential_dict:
+        return cached[1]
+    
+    lookup = _build_cell_lookup(preferential_dict, source_lang)
+    _cell_lookup_cache.pop(cache_key, None)
+    while len(_cell_lookup_cache) >= _MAX_CACHED_CELL_LOOKUPS:
+        _cell_lookup_cache.pop(next(iter(_cell_lookup_cache)))
+    _cell_lookup_cache[cache_key] = (preferential_dict, lookup)
+    return lookup
+
+
+def _find_preferential_match(stripped, source_lang, preferential_dict):
+    match_translation = _get_cell_lookup(preferential_dict, source_lang).get(stripped.lower())
+    if match_translation:
+        if stripped[0].isupper() and match_translation[0].islower():
+            match_translation = match_translation[0].upper() + match_translation[1:]
+        return match_translation
     return None
 
 
@@ -488,7 +686,9 @@ def translate_word_document(
         input_docx_file, output_docx_file=None, source_lang="en", chunk_by="sentences",
         models_to_use=None, use_find_replace=False, use_finetuned=True,
         translation_manager=None, include_timestamp=True, use_cache=True,
-        preserve_json_notes=False
+        preserve_json_notes=False, previous_segment_map=None, previous_source_docx=None,
+        previous_translated_docx=None, save_segment_map=False, checkpoint=False, progress=None,
+        bypass_rules=None, skip_references=None, time_budget=None, pipeline=None, corpus_lookup=None
 ):
     if not output_docx_file:
         base, ext = os.path.splitext(input_docx_file)
@@ -500,59 +700,188 @@ def translate_word_document(
     
     target_lang = "fr" if source_lang == "en" else "en"
     
+    # Incremental mode: unchanged segments are copied from a previous translation of this document
+    segment_map = None
+    if previous_segment_map is not None:
+        if isinstance(previous_segment_map, SegmentMap):
+            segment_map = previous_segment_map
+        else:
+            segment_map = SegmentMap.load(previous_segment_map)
+        if segment_map.source_lang and segment_map.source_lang != source_lang:
+            raise ValueError(f'segment map was built for source_lang "{segment_map.source_lang}", not "{source_lang}"')
+    elif previous_source_docx or previous_translated_docx:
+        if not (previous_source_docx and previous_translated_docx):
+            raise ValueError('previous_source_docx and previous_translated_docx must be given together')
+        segment_map = SegmentMap.from_documents(previous_source_docx, previous_translated_docx, source_lang=source_lang)
+    elif save_segment_map:
+        segment_map = SegmentMap(source_lang=source_lang)
+    is_incremental = segment_map is not None and bool(segment_map.translations)
+    
     if not translation_manager:
         translation_manager = create_translator(
             use_finetuned=use_finetuned, models_to_use=models_to_use,
             use_embedder=True, load_models=True
         )
     
+    # chunk_by="tokens" measures chunks with the loaded models' own tokenizers
+    if chunk_by == "tokens":
+        chunk_by = ChunkPlanner.for_manager(translation_manager, source_lang=source_lang, target_lang=target_lang)
+    
     document = Document(input_docx_file)
     idx = 1
     formatting_records = []
     
     preferential_dict = None
+    table_translations_dict = None
     if os.path.exists(config.PREFERENTIAL_JSON_PATH):
-        with open(config.PREFERENTIAL_JSON_PATH, 'r', encoding='utf-8') as f:
-            preferential_dict = json.load(f)
+        glossary_store = get_glossary_store(config.PREFERENTIAL_JSON_PATH)
+        preferential_dict = glossary_store.data
+        table_translations_dict = glossary_store.table_translations(source_lang) or None
+    
+    # Bibliography entries stay in their original form
+    if skip_references is None:
+        skip_references = config.REFERENCE_SECTION_CONFIG.get("enabled", False)
+    references = ReferenceSections.detect(document, source_lang) if skip_references else None
+    
+    cell_lookups = (source_lang, preferential_dict, table_translations_dict)
+    if use_find_replace and hasattr(translation_manager, 'prefetch_segments'):
+        translation_manager.prefetch_segments(
+            list(_iter_segment_texts(document, chunk_by, skip=references, cell_lookups=cell_lookups)),
+            source_lang=source_lang
+        )
     
-    table_translations_dict = None
-    if preferential_dict:
-        table_entries = preferential_dict.get("translations", {}).get("table", [])
-        if table_entries:
-            source_key = "english" if source_lang == "en" else "french"
-            target_formatted_key = "fr_formatted" if target_lang == "fr" else "en_formatted"
-            table_translations_dict = {}
-            for entry in table_entries:
-                plain_key = entry.get(source_key, "")
-                formatted_value = entry.get(target_formatted_key, "")
-                if plain_key and formatted_value and plain_key not in table_translations_dict:
-                    table_translations_dict[plain_key] = formatted_value
+    # Resume mode: finished segments from an interrupted run are written back without a model call
+    translation_checkpoint = None
+    if checkpoint:
+        translation_checkpoint = TranslationCheckpoint.open(
+            checkpoint_path_for(input_docx_file, target_lang), input_docx_file,
+            source_lang=source_lang, chunk_by=chunk_by, use_find_replace=use_find_replace
+        )
     
-    for element, location, elem_type in _iter_document_elements(document):
-        if elem_type == "paragraph":
-            idx = _translate_paragraph(
-                element, translation_manager, source_lang=source_lang,
-                target_lang=target_lang, use_find_replace=use_find_replace,
-                idx=idx, use_cache=use_cache, formatting_records=formatting_records,
-                preferential_dict=preferential_dict, chunk_by=chunk_by,
-                location=location
-            )
-        elif elem_type == "cell":
-            idx = _translate_table_cell(
-                element, translation_manager, source_lang=source_lang,
-                target_lang=target_lang, use_find_replace=use_find_replace,
-                idx=idx, use_cache=use_cache, formatting_records=formatting_records,
-                preferential_dict=preferential_dict,
-                table_translations_dict=table_translations_dict,
-                chunk_by=chunk_by, location=location
-            )
+    # Segments the rules can translate deterministically never reach the models
+    if bypass_rules is None:
+        bypass_rules = config.SEGMENT_BYPASS_CONFIG.get("enabled", False)
+    classifier = SegmentClassifier.from_glossary(source_lang=source_lang) if bypass_rules else None
+    
+    # Segments found word for word in the aligned corpora take the human translation
+    if corpus_lookup is None:
+        corpus_lookup = config.CORPUS_LOOKUP_CONFIG.get("enabled", False)
+    corpus = CorpusLookup.load(source_lang=source_lang) if corpus_lookup else None
+    
+    translation_progress = None
+    progress_callback = resolve_progress_callback(progress)
+    if progress_callback is not None or time_budget is not None:
+        translation_progress = TranslationProgress(
+            sum(1 for _ in _iter_segment_texts(document, chunk_by, skip=references, cell_lookups=cell_lookups)),
+            callback=progress_callback,
+            title=os.path.basename(input_docx_file)
+        )
+        translation_progress.start()
+    
+    # Deadline mode: time_budget is in seconds; the scheduler reads the remaining work from the progress counts
+    deadline_manager = None
+    if time_budget is not None:
+        scheduler = DeadlineScheduler(time_budget, translation_progress)
+        scheduler.start()
+        deadline_manager = DeadlineTranslationManager(translation_manager, scheduler)
+        translation_manager = deadline_manager
+    
+    # Pipelined mode: segments are preprocessed and translated ahead of the walk below
+    if pipeline is None:
+        pipeline = config.PIPELINE_CONFIG.get("enabled", False)
+    segment_pipeline = None
+    if pipeline:
+        segment_pipeline = SegmentPipeline(
+            translation_manager,
+            _iter_model_segments(
+                input_docx_file, chunk_by, source_lang, skip=references, classifier=classifier, segment_map=segment_map,
+                checkpoint=translation_checkpoint, preferential_dict=preferential_dict,
+                table_translations_dict=table_translations_dict, corpus=corpus
+            ),
+            preprocess=use_find_replace, source_lang=source_lang, target_lang=target_lang,
+            use_find_replace=use_find_replace, use_cache=use_cache
+        )
+        translation_manager = segment_pipeline.start()
+    
+    traversal_stats = {}
+    completed = False
+    try:
+        for element, location, elem_type in _iter_document_elements(document, stats=traversal_stats):
+            if references is not None and location in references:
+                references.copy_through(element)
+                continue
+            # Degraded and corpus-matched segments are noted from their own results
+            segment_results = None
+            if deadline_manager is not None or corpus is not None:
+                element_source_text = element.text
+                segment_results = []
+            if elem_type == "paragraph":
+                idx = _translate_paragraph(
+                    element, translation_manager, source_lang=source_lang,
+                    target_lang=target_lang, use_find_replace=use_find_replace,
+                    idx=idx, use_cache=use_cache, formatting_records=formatting_records,
+                    preferential_dict=preferential_dict, chunk_by=chunk_by,
+                    location=location, segment_map=segment_map, checkpoint=translation_checkpoint,
+                    progress=translation_progress, classifier=classifier, corpus=corpus,
+                    segment_results=segment_results
+                )
+            elif elem_type == "cell":
+                idx = _translate_table_cell(
+                    element, translation_manager, source_lang=source_lang,
+                    target_lang=target_lang, use_find_replace=use_find_replace,
+                    idx=idx, use_cache=use_cache, formatting_records=formatting_records,
+                    preferential_dict=preferential_dict,
+                    table_translations_dict=table_translations_dict,
+                    chunk_by=chunk_by, location=location, segment_map=segment_map,
+                    checkpoint=translation_checkpoint, progress=translation_progress,
+                    classifier=classifier, corpus=corpus, segment_results=segment_results
+                )
+            if segment_results:
+                degraded = [(text, result["degraded"]) for text, result in segment_results if result.get("degraded")]
+                matched = [(text.strip(), result["corpus_match"]) for text, result in segment_results
+                           if result.get("corpus_match")]
+                add_degraded_notes(degraded, element_source_text, formatting_records, location=location)
+                add_corpus_notes(matched, element_source_text, formatting_records, location=location)
+        completed = True
+    finally:
+        if segment_pipeline is not None:
+            segment_pipeline.close()
+        if translation_checkpoint is not None:
+            translation_checkpoint.save()
+        if translation_progress is not None:
+            translation_progress.finish(completed=completed)
     
     _set_proofing_language(document, target_lang)
     document.save(output_docx_file)
     
+    if traversal_stats and traversal_stats["grid_cells"] > traversal_stats["table_cells"]:
+        print(
+            f"Translated {traversal_stats['table_cells']} table cells for {traversal_stats['grid_cells']} grid positions "
+            f"({traversal_stats['grid_cells'] - traversal_stats['table_cells']} merged duplicates skipped)"
+        )
+    if corpus is not None and corpus.matches:
+        print(format_corpus_stats(corpus.matches))
+    if classifier is not None and classifier.counts:
+        print(format_bypass_stats(classifier.stats()))
+    if references is not None and references.skipped:
+        print(format_reference_stats(references.stats()))
+    if deadline_manager is not None:
+        print(format_deadline_stats(deadline_manager.scheduler, deadline_manager.degraded))
+    if is_incremental:
+        stats = segment_map.stats()
+        print(f"Reused {stats['reused']} unchanged segments, retranslated {stats['retranslated']}")
+    if save_segment_map:
+        segment_map.save(segment_map_path_for(output_docx_file))
+    
     if formatting_records:
-        json_notes_path = os.path.splitext(output_docx_file)[0] + '_translation_notes.json'
-        write_notes_json(formatting_records, json_notes_path)
-        json_to_word_tables(json_notes_path, preserve_json_notes=preserve_json_notes)
+        notes_base = os.path.splitext(output_docx_file)[0] + '_translation_notes'
+        write_notes_docx(formatting_records, notes_base + '.docx')
+        if preserve_json_notes:
+            write_notes_json(formatting_records, notes_base + '.json')
+    
+    if translation_checkpoint is not None:
+        if translation_checkpoint.resumed:
+            print(f"Resumed {translation_checkpoint.resumed} segments from checkpoint")
+        translation_checkpoint.discard()
     
     return output_docx_file
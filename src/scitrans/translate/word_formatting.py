@@ -2,7 +2,9 @@ import re
 from copy import deepcopy
 from dataclasses import dataclass
 
+from docx.enum.text import WD_UNDERLINE
 from docx.oxml.ns import qn
+from docx.oxml.simpletypes import ST_HexColorAuto
 from lxml import etree
 
 BRACKET_PATTERN = re.compile(r'\([^)]+\)')
@@ -11,6 +13,8 @@ _SPP_PATTERN = re.compile(r'\b(spp?\.)$')
 _SENTENCE_BOUNDARY = re.compile(r'(?<=[.!?])\s+')
 _FR_ORDINAL_SUFFIXES = re.compile(r'(\d+)(e|er|ère)\b')
 _EN_ORDINAL_SUFFIXES = re.compile(r'(\d+)(th|st|nd|rd)\b')
+# Run children that keep a run from being merged with its neighbours
+_SPECIAL_RUN_TAGS = frozenset(qn(tag) for tag in ('w:drawing', 'w:fldChar', 'w:instrText', 'w:tab'))
 
 
 @dataclass(frozen=True)
@@ -40,6 +44,34 @@ class FormattedRun:
             colour=colour,
         )
     
+    @classmethod
+    def from_element(cls, r_elem):
+        # Same values as create(Run(r_elem, ...)), read straight from <w:rPr> without
+        # building the Run/Font/ColorFormat proxies
+        rPr = r_elem.rPr
+        if rPr is None:
+            return cls(text=r_elem.text, bold=None, italic=None, underline=None)
+        underline = rPr.u_val
+        if underline == WD_UNDERLINE.INHERITED:
+            underline = None
+        elif underline == WD_UNDERLINE.SINGLE:
+            underline = True
+        elif underline == WD_UNDERLINE.NONE:
+            underline = False
+        colour = "default"
+        color = rPr.color
+        if color is not None and color.val != ST_HexColorAuto.AUTO and color.val:
+            colour = str(color.val)
+        return cls(
+            text=r_elem.text,
+            bold=rPr.b.val if rPr.b is not None else None,
+            italic=rPr.i.val if rPr.i is not None else None,
+            underline=underline,
+            superscript=rPr.superscript or False,
+            subscript=rPr.subscript or False,
+            colour=colour,
+        )
+    
     @property
     def has_formatting(self):
         return any(getattr(self, attr) for attr in self._FORMATTING_BOOLS) or self.colour != self._DEFAULT_COLOUR
@@ -52,6 +84,46 @@ class FormattedRun:
         return ", ".join(notes) if notes else "no formatting"
 
 
+class ParagraphAnalysis:
+    # One walk over a paragraph's runs, shared by rule detection, the formatting-notes
+    # pass and run collapsing instead of each rebuilding FormattedRun for every run.
+    # It is a snapshot: code that restructures the runs needs a fresh analysis.
+    def __init__(self, paragraph):
+        self.paragraph = paragraph
+        self.runs = paragraph.runs
+        self.formatted_runs = []
+        self.special_runs = []
+        for run in self.runs:
+            r_elem = run._element
+            self.formatted_runs.append(FormattedRun.from_element(r_elem))
+            self.special_runs.append(any(child.tag in _SPECIAL_RUN_TAGS for child in r_elem))
+        self._text = None
+        self._detected = None
+    
+    @classmethod
+    def of(cls, paragraph, analysis=None):
+        return analysis if analysis is not None else cls(paragraph)
+    
+    @property
+    def text(self):
+        if self._text is None:
+            self._text = self.paragraph.text
+        return self._text
+    
+    @property
+    def has_formatting_differences(self):
+        if not self.formatted_runs:
+            return False
+        first_format = self.formatted_runs[0]
+        return any(fr.text.strip() and fr != first_format for fr in self.formatted_runs[1:])
+    
+    @property
+    def detected(self):
+        if self._detected is None:
+            self._detected = RuleRegistry.detect_all(self.paragraph, analysis=self)
+        return self._detected
+
+
 class RuleRegistry:
     _rules = []
     
@@ -72,10 +144,11 @@ class RuleRegistry:
                     rule.add_notes(formatting_records, source_text, location)
     
     @classmethod
-    def detect_all(cls, paragraph):
+    def detect_all(cls, paragraph, analysis=None):
+        analysis = ParagraphAnalysis.of(paragraph, analysis)
         detected = {}
         for rule in cls._rules:
-            matches = rule.detect(paragraph)
+            matches = rule.detect(paragraph, analysis=analysis)
             if matches is not None and matches != []:
                 detected[rule] = matches
         return detected
@@ -98,7 +171,7 @@ class RuleRegistry:
 class FormattingRule:
     note_message = "Formatting applied or failed"
     
-    def detect(self, paragraph):
+    def detect(self, paragraph, analysis=None):
         raise NotImplementedError
     
     def apply(self, paragraph, matches):
@@ -180,8 +253,9 @@ def _split_run_for_vertical_align(paragraph, run, text_fragment, align_type, off
 
 @RuleRegistry.register
 class SuperscriptNumbersRule(FormattingRule):
-    def detect(self, paragraph):
-        return [run.text.strip() for run in paragraph.runs if run.font.superscript and run.text.strip() and is_numeric(run.text.strip())]
+    def detect(self, paragraph, analysis=None):
+        runs = ParagraphAnalysis.of(paragraph, analysis).formatted_runs
+        return [run.text.strip() for run in runs if run.superscript and run.text.strip() and is_numeric(run.text.strip())]
     
     def handles_run(self, formatted_run):
         return formatted_run.superscript and is_numeric(formatted_run.text.strip())
@@ -199,12 +273,12 @@ class SuperscriptNumbersRule(FormattingRule):
 class SubscriptOrdinalsRule(FormattingRule):
     note_message = "Subscript ordinal could not be matched in translated text"
     
-    def detect(self, paragraph):
+    def detect(self, paragraph, analysis=None):
         _ordinal_suffixes = {'th', 'st', 'nd', 'rd'}
         matches = []
-        runs = paragraph.runs
+        runs = ParagraphAnalysis.of(paragraph, analysis).formatted_runs
         for i, run in enumerate(runs):
-            if run.font.subscript and run.text.strip().lower() in _ordinal_suffixes and i > 0:
+            if run.subscript and run.text.strip().lower() in _ordinal_suffixes and i > 0:
                 prev_text = runs[i - 1].text.rstrip()
                 if prev_text and prev_text[-1].isdigit():
                     matches.append(prev_text.split()[-1] + run.text.strip())
@@ -245,12 +319,12 @@ class SubscriptOrdinalsRule(FormattingRule):
 class SuperscriptOrdinalsRule(FormattingRule):
     note_message = "Superscript ordinal could not be matched in translated text"
     
-    def detect(self, paragraph):
+    def detect(self, paragraph, analysis=None):
         _ordinal_suffixes = {'th', 'st', 'nd', 'rd'}
         matches = []
-        runs = paragraph.runs
+        runs = ParagraphAnalysis.of(paragraph, analysis).formatted_runs
         for i, run in enumerate(runs):
-            if run.font.superscript and run.text.strip().lower() in _ordinal_suffixes and i > 0:
+            if run.superscript and run.text.strip().lower() in _ordinal_suffixes and i > 0:
                 prev_text = runs[i - 1].text.rstrip()
                 if prev_text and prev_text[-1].isdigit():
                     matches.append(prev_text.split()[-1] + run.text.strip())
@@ -302,8 +376,9 @@ class ItalicBracketsRule(FormattingRule):
             record['location'] = location
         formatting_records.append(record)
     
-    def detect(self, paragraph):
-        runs = paragraph.runs
+    def detect(self, paragraph, analysis=None):
+        analysis = ParagraphAnalysis.of(paragraph, analysis)
+        runs = analysis.formatted_runs
         merged = []
         i = 0
         while i < len(runs):
@@ -324,7 +399,7 @@ class ItalicBracketsRule(FormattingRule):
         if not merged:
             return None
         
-        full_text = paragraph.text
+        full_text = analysis.text
         bracket_matches = list(BRACKET_PATTERN.finditer(full_text))
         all_italic_count = 0
         any_partial = False
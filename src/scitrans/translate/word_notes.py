@@ -7,7 +7,7 @@ from docx.oxml.ns import qn
 from docx.oxml.ns import qn as oxml_qn
 from docx.shared import Inches
 
-from scitrans.translate.word_formatting import FormattedRun, RuleRegistry
+from scitrans.translate.word_formatting import ParagraphAnalysis, RuleRegistry
 
 
 def strip_hyperlink_xml(paragraph):
@@ -84,20 +84,26 @@ def _location_section(record):
 
 def _group_notes_by_paragraph(records):
     groups = {}
+    seen = set()
     for record in records:
         key = record.get('full_paragraph', '')
-        if key not in groups:
-            groups[key] = []
-        dedup_key = (record.get('notes', ''), _location_section(record))
-        existing = [(r.get('notes', ''), _location_section(r)) for r in groups[key]]
-        if dedup_key not in existing:
-            groups[key].append(record)
+        group = groups.setdefault(key, [])
+        dedup_key = (key, record.get('notes', ''), _location_section(record))
+        if dedup_key not in seen:
+            seen.add(dedup_key)
+            group.append(record)
     return groups
 
 
 def _get_note_type(details_list):
     has_formatting = any(d.get('type') == 'formatting' for d in details_list)
     has_url = any(d.get('type') == 'url' for d in details_list)
+    has_degraded = any(d.get('type') == 'degraded' for d in details_list)
+    has_corpus = any(d.get('type') == 'corpus' for d in details_list)
+    if has_degraded:
+        return 'mixed' if has_formatting or has_url or has_corpus else 'degraded'
+    if has_corpus:
+        return 'mixed' if has_formatting or has_url else 'corpus'
     if has_formatting and has_url:
         return 'mixed'
     if has_url:
@@ -105,10 +111,10 @@ def _get_note_type(details_list):
     return 'formatting'
 
 
-def write_notes_json(formatting_records, output_path):
+def build_notes_report(formatting_records):
     filtered = _filter_notes(formatting_records)
     if not filtered:
-        return
+        return None
     
     grouped = _group_notes_by_paragraph(filtered)
     paragraphs_section = []
@@ -136,26 +142,41 @@ def write_notes_json(formatting_records, output_path):
         else:
             paragraphs_section.append(entry)
     
-    output = {
+    return {
         'paragraphs': paragraphs_section,
         'tables': tables_section,
     }
+
+
+def write_notes_json(formatting_records, output_path):
+    report = build_notes_report(formatting_records)
+    if report is None:
+        return
     
     with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(output, f, indent=2, ensure_ascii=False)
+        json.dump(report, f, indent=2, ensure_ascii=False)
 
 
-def add_formatting_notes(paragraph, formatting_records, detected_rules=None, location=None):
-    full_paragraph_text = paragraph.text
+def write_notes_docx(formatting_records, output_path):
+    # Builds the notes report straight from the in-memory records; returns None when
+    # every record was filtered out and there is nothing to report
+    report = build_notes_report(formatting_records)
+    if report is None:
+        return None
+    save_notes_report(report, output_path)
+    return output_path
+
+
+def add_formatting_notes(paragraph, formatting_records, detected_rules=None, location=None, analysis=None):
+    analysis = ParagraphAnalysis.of(paragraph, analysis)
+    full_paragraph_text = analysis.text
     
-    for run in list(paragraph.runs):
-        formatted_run = FormattedRun.create(run)
-        
+    for formatted_run in analysis.formatted_runs:
         if formatted_run.has_formatting and formatted_run.text.strip():
             if detected_rules and RuleRegistry.is_auto_handled(formatted_run, detected_rules):
                 continue
             record = {
-                'original_text': run.text,
+                'original_text': formatted_run.text,
                 'full_paragraph': full_paragraph_text,
                 'notes': formatted_run.formatting_notes,
                 'type': 'formatting',
@@ -165,11 +186,103 @@ def add_formatting_notes(paragraph, formatting_records, detected_rules=None, loc
             formatting_records.append(record)
 
 
-def json_to_word_tables(json_file, preserve_json_notes=False):
-    json_path = Path(json_file)
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+def add_degraded_notes(degraded_segments, full_paragraph, formatting_records, location=None):
+    # Segments a deadline-limited run translated with a cheaper strategy, for review
+    for source_text, level_name in degraded_segments:
+        record = {
+            'original_text': source_text,
+            'full_paragraph': full_paragraph,
+            'notes': f'translated in degraded mode ({level_name}) to meet the time budget',
+            'type': 'degraded',
+        }
+        if location:
+            record['location'] = location
+        formatting_records.append(record)
+
+
+def add_corpus_notes(corpus_matches, full_paragraph, formatting_records, location=None):
+    # Segments whose translation was copied from the aligned bilingual corpus rather than generated
+    for source_text, corpus_name in corpus_matches:
+        record = {
+            'original_text': source_text,
+            'full_paragraph': full_paragraph,
+            'notes': f'human reference translation from the bilingual corpus ({corpus_name})',
+            'type': 'corpus',
+        }
+        if location:
+            record['location'] = location
+        formatting_records.append(record)
+
+
+_COLOR_YELLOW = "FFFF00"
+_COLOR_CYAN = "00FFFF"
+_COLOR_GREEN = "00FF00"
+_COLOR_ORANGE = "FFC000"
+_COLOR_BLUE = "9DC3E6"
+
+
+def _cell_color_for_notes(notes):
+    types = {n.get('type', 'formatting') for n in notes}
+    if 'degraded' in types:
+        return _COLOR_ORANGE
+    if types == {'corpus'}:
+        return _COLOR_BLUE
+    if 'url' in types and 'formatting' in types:
+        return _COLOR_GREEN
+    if 'url' in types:
+        return _COLOR_CYAN
+    return _COLOR_YELLOW
+
+
+def _shade_cell(cell, hex_color):
+    shading = cell._element.get_or_add_tcPr()
+    shd = shading.makeelement(oxml_qn('w:shd'), {
+        oxml_qn('w:fill'): hex_color,
+        oxml_qn('w:val'): 'clear',
+    })
+    shading.append(shd)
+
+
+def _add_row_property(row, tag):
+    tr_pr = row._tr.get_or_add_trPr()
+    tr_pr.append(tr_pr.makeelement(oxml_qn(tag), {}))
+
+
+def _build_notes_table(doc, entries, heading_text, bullet_style_id):
+    doc.add_heading(heading_text, level=1)
+    if not entries:
+        doc.add_paragraph("No notes.")
+        return
     
+    table = doc.add_table(rows=1, cols=2)
+    table.style = 'Table Grid'
+    header_cells = table.rows[0].cells
+    header_cells[0].paragraphs[0].add_run("Full Paragraph (original language)").bold = True
+    header_cells[1].paragraphs[0].add_run("Details").bold = True
+    _add_row_property(table.rows[0], 'w:tblHeader')
+    _add_row_property(table.rows[0], 'w:cantSplit')
+    
+    for entry in entries:
+        row = table.add_row()
+        cells = row.cells
+        cells[0].text = entry.get('full_paragraph', '')
+        
+        notes = entry.get('notes', [])
+        details_cell = cells[1]
+        details_cell.text = ''
+        for i, note in enumerate(notes):
+            original = note.get('original_text', '')
+            detail = note.get('detail', '')
+            p = details_cell.paragraphs[0] if i == 0 else details_cell.add_paragraph()
+            p._p.style = bullet_style_id
+            p.text = f'"{original}": {detail}'
+        
+        if notes:
+            _shade_cell(details_cell, _cell_color_for_notes(notes))
+        _add_row_property(row, 'w:cantSplit')
+
+
+def save_notes_report(report, output_path):
     doc = Document()
     
     for section in doc.sections:
@@ -178,73 +291,21 @@ def json_to_word_tables(json_file, preserve_json_notes=False):
         section.left_margin = Inches(0.5)
         section.right_margin = Inches(0.5)
     
-    COLOR_YELLOW = "FFFF00"
-    COLOR_CYAN = "00FFFF"
-    COLOR_GREEN = "00FF00"
-    
-    def _cell_color_for_notes(notes):
-        types = {n.get('type', 'formatting') for n in notes}
-        if 'url' in types and 'formatting' in types:
-            return COLOR_GREEN
-        if 'url' in types:
-            return COLOR_CYAN
-        return COLOR_YELLOW
-    
-    def _shade_cell(cell, hex_color):
-        shading = cell._element.get_or_add_tcPr()
-        shd = shading.makeelement(oxml_qn('w:shd'), {
-            oxml_qn('w:fill'): hex_color,
-            oxml_qn('w:val'): 'clear',
-        })
-        shading.append(shd)
-    
-    def _build_table(entries, heading_text):
-        doc.add_heading(heading_text, level=1)
-        if not entries:
-            doc.add_paragraph("No notes.")
-            return
-        
-        table = doc.add_table(rows=1, cols=2)
-        table.style = 'Table Grid'
-        header_row = table.rows[0]
-        for cell in header_row.cells:
-            for paragraph in cell.paragraphs:
-                for run in paragraph.runs:
-                    run.bold = True
-        header_row.cells[0].paragraphs[0].add_run("Full Paragraph (original language)").bold = True
-        header_row.cells[1].paragraphs[0].add_run("Details").bold = True
-        
-        row_elem = header_row._tr
-        tr_pr = row_elem.get_or_add_trPr()
-        tr_pr.append(tr_pr.makeelement(oxml_qn('w:tblHeader'), {}))
-        
-        for entry in entries:
-            row = table.add_row()
-            row.cells[0].text = entry.get('full_paragraph', '')
-            
-            notes = entry.get('notes', [])
-            details_cell = row.cells[1]
-            details_cell.text = ''
-            for i, note in enumerate(notes):
-                original = note.get('original_text', '')
-                detail = note.get('detail', '')
-                text = f'"{original}": {detail}'
-                p = details_cell.paragraphs[0] if i == 0 else details_cell.add_paragraph()
-                p.style = 'List Bullet'
-                p.text = text
-            
-            if notes:
-                _shade_cell(details_cell, _cell_color_for_notes(notes))
-        
-        for row in table.rows:
-            tr_pr = row._tr.get_or_add_trPr()
-            tr_pr.append(tr_pr.makeelement(oxml_qn('w:cantSplit'), {}))
-    
-    _build_table(data.get('paragraphs', []), 'Paragraphs')
-    _build_table(data.get('tables', []), 'Tables')
+    # Paragraph.style re-resolves the name against every style in the part on each
+    # assignment; resolve the id once and set it on each bullet directly
+    bullet_style_id = doc.styles['List Bullet'].style_id
+    _build_notes_table(doc, report.get('paragraphs', []), 'Paragraphs', bullet_style_id)
+    _build_notes_table(doc, report.get('tables', []), 'Tables', bullet_style_id)
     
-    output_path = json_path.with_suffix('.docx')
     doc.save(str(output_path))
+
+
+def json_to_word_tables(json_file, preserve_json_notes=False):
+    json_path = Path(json_file)
+    with open(json_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    
+    save_notes_report(data, json_path.with_suffix('.docx'))
     
     if not preserve_json_notes:
         os.remove(json_path)
@@ -0,0 +1,318 @@
+import posixpath
+import zipfile
+
+from lxml import etree
+
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+W = f'{{{W_NS}}}'
+R_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships'
+PKG_REL_NS = 'http://schemas.openxmlformats.org/package/2006/relationships'
+OFFICE_DOCUMENT_REL = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument'
+
+# (python-docx section attribute, reference tag, reference type)
+HEADER_FOOTER_REFS = {
+    'header': ('headerReference', 'default'),
+    'first_page_header': ('headerReference', 'first'),
+    'even_page_header': ('headerReference', 'even'),
+    'footer': ('footerReference', 'default'),
+    'first_page_footer': ('footerReference', 'first'),
+    'even_page_footer': ('footerReference', 'even'),
+}
+# Same order as _iter_header_footer_paragraphs in proofreader/extract_text.py
+PROOFREADER_HF_ORDER = [
+    'header', 'first_page_header', 'even_page_header',
+    'footer', 'first_page_footer', 'even_page_footer',
+]
+# Same order as _iter_document_elements in translate/word_document.py
+TRANSLATION_HF_ORDER = [
+    'header', 'footer', 'first_page_header', 'first_page_footer',
+    'even_page_header', 'even_page_footer',
+]
+
+_RUN_CHAR_TAGS = {f'{W}tab': '\t', f'{W}ptab': '\t', f'{W}cr': '\n', f'{W}noBreakHyphen': '-'}
+
+
+class TableText:
+    # Plain-text snapshot of a <w:tbl>. cells holds one tuple of paragraph texts per
+    # physical <w:tc>; rows maps each layout-grid position to its cell index, so a
+    # merged cell appears once per grid column it spans, as python-docx's row.cells does.
+    def __init__(self, cells, rows):
+        self.cells = cells
+        self.rows = rows
+    
+    def row_texts(self, row_idx):
+        return ['\n'.join(self.cells[cell_idx]) for cell_idx in self.rows[row_idx]]
+    
+    def unique_cell_indexes(self):
+        seen = set()
+        for row in self.rows:
+            for cell_idx in row:
+                if cell_idx not in seen:
+                    seen.add(cell_idx)
+                    yield cell_idx
+
+
+def _run_text(r_elem):
+    parts = []
+    for child in r_elem:
+        tag = child.tag
+        if tag == f'{W}t':
+            parts.append(child.text or '')
+        elif tag == f'{W}br':
+            if child.get(f'{W}type', 'textWrapping') == 'textWrapping':
+                parts.append('\n')
+        elif tag in _RUN_CHAR_TAGS:
+            parts.append(_RUN_CHAR_TAGS[tag])
+    return ''.join(parts)
+
+
+def paragraph_text(p_elem):
+    # Matches python-docx Paragraph.text: direct runs and hyperlink runs only
+    parts = []
+    for child in p_elem:
+        if child.tag == f'{W}r':
+            parts.append(_run_text(child))
+        elif child.tag == f'{W}hyperlink':
+            parts.extend(_run_text(r_elem) for r_elem in child.iterchildren(f'{W}r'))
+    return ''.join(parts)
+
+
+def _int_val(parent, tag, default):
+    if parent is None:
+        return default
+    elem = parent.find(tag)
+    if elem is None:
+        return default
+    value = elem.get(f'{W}val')
+    return int(value) if value is not None else default
+
+
+def _tc_props(tc):
+    tc_pr = tc.find(f'{W}tcPr')
+    grid_span = _int_val(tc_pr, f'{W}gridSpan', 1)
+    v_merge = None
+    if tc_pr is not None:
+        v_merge_elem = tc_pr.find(f'{W}vMerge')
+        if v_merge_elem is not None:
+            v_merge = v_merge_elem.get(f'{W}val', 'continue')
+    return grid_span, v_merge
+
+
+def table_text(tbl_elem):
+    cells = []
+    rows = []
+    # grid offset -> cell index for the previous row, to resolve vMerge="continue"
+    above = {}
+    for tr in tbl_elem.iterchildren(f'{W}tr'):
+        offset = _int_val(tr.find(f'{W}trPr'), f'{W}gridBefore', 0)
+        row = []
+        current = {}
+        for tc in tr.iterchildren(f'{W}tc'):
+            grid_span, v_merge = _tc_props(tc)
+            if v_merge == 'continue' and offset in above:
+                cell_idx = above[offset]
+            else:
+                cell_idx = len(cells)
+                cells.append(tuple(paragraph_text(p) for p in tc.iterchildren(f'{W}p')))
+            current[offset] = cell_idx
+            row.extend([cell_idx] * grid_span)
+            offset += grid_span
+        rows.append(row)
+        above = current
+    return TableText(cells, rows)
+
+
+def _resolve_target(source_part, target):
+    if target.startswith('/'):
+        return target.lstrip('/')
+    return posixpath.normpath(posixpath.join(posixpath.dirname(source_part), target))
+
+
+def _read_rels(archive, part_name):
+    rels_name = posixpath.join(posixpath.dirname(part_name), '_rels', posixpath.basename(part_name) + '.rels')
+    if rels_name not in archive.namelist():
+        return {}
+    root = etree.fromstring(archive.read(rels_name))
+    return {
+        rel.get('Id'): (rel.get('Type'), rel.get('Target'), rel.get('TargetMode'))
+        for rel in root.iterchildren(f'{{{PKG_REL_NS}}}Relationship')
+    }
+
+
+def _main_document_part(archive):
+    for rel_type, target, _ in _read_rels(archive, '').values():
+        if rel_type == OFFICE_DOCUMENT_REL:
+            return target.lstrip('/')
+    return 'word/document.xml'
+
+
+def _section_references(sect_pr):
+    references = {}
+    for attr, (ref_tag, ref_type) in HEADER_FOOTER_REFS.items():
+        for ref in sect_pr.iterchildren(f'{W}{ref_tag}'):
+            if ref.get(f'{W}type') == ref_type:
+                references[attr] = ref.get(f'{{{R_NS}}}id')
+                break
+    return references
+
+
+def _iter_body(stream):
+    # Body-level elements are cleared as soon as they are read, so memory stays flat on
+    # long documents; tables are read whole since cells need their neighbours for merges
+    p_idx = 0
+    t_idx = 0
+    for _, elem in etree.iterparse(stream, events=('end',), tag=(f'{W}p', f'{W}tbl', f'{W}sectPr')):
+        parent = elem.getparent()
+        if elem.tag == f'{W}sectPr':
+            grandparent = parent.getparent() if parent is not None else None
+            if parent is not None and (
+                    parent.tag == f'{W}body'
+                    or (parent.tag == f'{W}pPr' and grandparent is not None
+                        and grandparent.getparent() is not None and grandparent.getparent().tag == f'{W}body')
+            ):
+                yield 'section', None, _section_references(elem)
+            continue
+        if parent is None or parent.tag != f'{W}body':
+            continue
+        
+        if elem.tag == f'{W}p':
+            yield 'paragraph', p_idx, paragraph_text(elem)
+            p_idx += 1
+        else:
+            yield 'table', t_idx, table_text(elem)
+            t_idx += 1
+        
+        elem.clear()
+        while elem.getprevious() is not None:
+            del parent[0]
+
+
+def _read_header_footer(archive, part_name):
+    root = etree.fromstring(archive.read(part_name))
+    paragraphs = [paragraph_text(p) for p in root.iterchildren(f'{W}p')]
+    tables = [table_text(tbl) for tbl in root.iterchildren(f'{W}tbl')]
+    return paragraphs, tables
+
+
+class DocxReader:
+    # Read-only text access to a .docx without building a python-docx Document. Body
+    # paragraphs stream from word/document.xml; tables and header/footer parts are
+    # small enough to snapshot whole.
+    def __init__(self, docx_path):
+        self.docx_path = docx_path
+        self.tables = []
+        self.sections = []
+        self._document_part = None
+    
+    def iter_paragraphs(self):
+        # Yields (index, text) for every body paragraph, empty ones included, so indexes
+        # line up with python-docx's document.paragraphs. Tables and section references
+        # are collected along the way and available once iteration finishes.
+        self.tables = []
+        self.sections = []
+        with zipfile.ZipFile(self.docx_path) as archive:
+            self._document_part = _main_document_part(archive)
+            with archive.open(self._document_part) as stream:
+                for kind, index, value in _iter_body(stream):
+                    if kind == 'paragraph':
+                        yield index, value
+                    elif kind == 'table':
+                        self.tables.append(value)
+                    else:
+                        self.sections.append(value)
+    
+    def iter_header_footers(self, order):
+        # Yields (attr, paragraphs, tables) for each distinct header/footer part that a
+        # section defines, skipping references linked to the previous section. Needs
+        # iter_paragraphs to have run, since section references live in the body.
+        for _section_idx, attr, paragraphs, tables in self.iter_section_header_footers(order):
+            yield attr, paragraphs, tables
+    
+    def iter_section_header_footers(self, order):
+        with zipfile.ZipFile(self.docx_path) as archive:
+            rels = _read_rels(archive, self._document_part)
+            seen_parts = set()
+            for section_idx, references in enumerate(self.sections):
+                for attr in order:
+                    r_id = references.get(attr)
+                    if r_id is None or r_id not in rels:
+                        continue
+                    part_name = _resolve_target(self._document_part, rels[r_id][1])
+                    if part_name in seen_parts:
+                        continue
+                    seen_parts.add(part_name)
+                    paragraphs, tables = _read_header_footer(archive, part_name)
+                    yield section_idx, attr, paragraphs, tables
+
+
+def iter_header_footer_locations(reader):
+    counters = {'H': 0, 'F': 0}
+    for attr, paragraphs, tables in reader.iter_header_footers(PROOFREADER_HF_ORDER):
+        prefix = 'H' if attr.endswith('header') else 'F'
+        hf_texts = list(paragraphs)
+        for table in tables:
+            for row in table.rows:
+                for cell_idx in row:
+                    hf_texts.extend(table.cells[cell_idx])
+        for text in hf_texts:
+            if not text.strip():
+                continue
+            yield f'{prefix}{counters[prefix]}', text
+            counters[prefix] += 1
+
+
+def iter_location_texts(docx_path):
+    # (location_id, text) in the proofreader's P/T/H/F scheme, as extract_locations has
+    # always produced them from python-docx
+    reader = DocxReader(docx_path)
+    for p_idx, text in reader.iter_paragraphs():
+        if text.strip():
+            yield f'P{p_idx}', text
+    
+    for t_idx, table in enumerate(reader.tables):
+        for r_idx in range(len(table.rows)):
+            yield f'T{t_idx}-R{r_idx}', ' | '.join(table.row_texts(r_idx))
+    
+    yield from iter_header_footer_locations(reader)
+
+
+def iter_translatable_texts(docx_path):
+    # Paragraph texts in the order translate_word_document visits them: body paragraphs,
+    # then each physical table cell once, then headers and footers
+    reader = DocxReader(docx_path)
+    for _p_idx, text in reader.iter_paragraphs():
+        yield text
+    
+    for table in reader.tables:
+        for cell_idx in table.unique_cell_indexes():
+            yield from table.cells[cell_idx]
+    
+    for _attr, paragraphs, tables in reader.iter_header_footers(TRANSLATION_HF_ORDER):
+        yield from paragraphs
+        for table in tables:
+            for cell_idx in table.unique_cell_indexes():
+                yield from table.cells[cell_idx]
+
+
+def _iter_table_paragraphs(prefix, tables):
+    for t_idx, table in enumerate(tables):
+        for cell_idx in table.unique_cell_indexes():
+            for p_idx, text in enumerate(table.cells[cell_idx]):
+                yield f'{prefix}T{t_idx}-C{cell_idx}-P{p_idx}', text
+
+
+def iter_keyed_paragraph_texts(docx_path):
+    # Every paragraph, empty ones included, keyed by its structural position. A translated
+    # document keeps the structure of its source, so equal keys pair a source paragraph
+    # with its translation.
+    reader = DocxReader(docx_path)
+    for p_idx, text in reader.iter_paragraphs():
+        yield f'P{p_idx}', text
+    
+    yield from _iter_table_paragraphs('', reader.tables)
+    
+    for section_idx, attr, paragraphs, tables in reader.iter_section_header_footers(TRANSLATION_HF_ORDER):
+        prefix = f'S{section_idx}-{attr}-'
+        for p_idx, text in enumerate(paragraphs):
+            yield f'{prefix}P{p_idx}', text
+        yield from _iter_table_paragraphs(prefix, tables)
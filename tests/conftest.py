@@ -5,6 +5,7 @@ import tempfile
 
 import pytest
 from docx import Document
+from scitrans.translate.models import TranslationManager
 from scitrans.translate.word_document import translate_word_document
 
 FIXTURE_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
@@ -21,6 +22,18 @@ class MockTranslator:
         return {"translated_text": f"[TR:{text}]"}
 
 
+class EchoModel:
+    # A loaded model that returns its input and records what it was called with
+    def __init__(self):
+        self.inputs = []
+        self.generation_kwargs = []
+    
+    def translate_text(self, input_text, input_language="en", target_language="fr", generation_kwargs=None):
+        self.inputs.append(input_text)
+        self.generation_kwargs.append(generation_kwargs)
+        return input_text
+
+
 class PeriodDroppingMockTranslator(MockTranslator):
     # Only drops the trailing period after the number, not the abbreviation
     # period in "Fig." — realistic model behavior.
@@ -41,6 +54,14 @@ def mock_translator():
     return MockTranslator()
 
 
+@pytest.fixture
+def stub_manager(mocker):
+    # A TranslationManager without models or embedder; tests fill loaded_models with stubs.
+    # Person-name detection needs the spaCy models, so find/replace runs without it
+    mocker.patch('scitrans.rules_based_replacements.replacements.detect_person_names', return_value=[])
+    return TranslationManager(all_models={}, embedder=None, debug=False)
+
+
 @pytest.fixture
 def fixture_dir():
     return FIXTURE_DIR
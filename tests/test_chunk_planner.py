@@ -0,0 +1,90 @@
+import pytest
+from docx import Document
+
+from scitrans.translate.models import TranslationManager
+from scitrans.translate.utils import ChunkPlanner, reassemble_chunks, split_by_sentences
+from scitrans.translate.word_document import translate_word_document
+from tests.conftest import MockTranslator
+
+
+def word_count(text):
+    return len(text.split())
+
+
+@pytest.fixture
+def planner():
+    return ChunkPlanner(word_count, max_tokens=8)
+
+
+def test_short_sentences_packed_per_line(planner):
+    text = "Catch rose. Effort fell. Biomass was stable.\nA new line starts here."
+    
+    chunks, metadata = planner.plan(text)
+    
+    assert chunks == ["Catch rose. Effort fell. Biomass was stable.", "A new line starts here."]
+    assert [m['line_idx'] for m in metadata] == [0, 1]
+    assert reassemble_chunks(chunks, metadata) == text
+
+
+def test_long_sentence_split_at_clauses(planner):
+    text = "In the southern area, recruitment was low for three years; the northern area, however, improved."
+    
+    chunks, metadata = planner.plan(text)
+    
+    assert chunks == [
+        "In the southern area,", "recruitment was low for three years;", "the northern area, however, improved."
+    ]
+    assert all(word_count(chunk) <= 8 for chunk in chunks)
+    assert reassemble_chunks(chunks, metadata) == text
+
+
+def test_clause_longer_than_budget_split_between_words(planner):
+    text = "one two three four five six seven eight nine ten eleven"
+    
+    chunks, _ = planner.plan(text)
+    
+    assert chunks == ["one two three four five six seven eight", "nine ten eleven"]
+
+
+def test_label_sentence_starts_its_own_chunk(planner):
+    chunks, _ = planner.plan("Results follow. Table 1. Catch by area.")
+    
+    assert chunks == ["Results follow.", "Table 1. Catch by area."]
+
+
+def test_without_packing_matches_sentence_split():
+    text = "Catch rose. Effort fell.\n\nBiomass was stable."
+    
+    assert ChunkPlanner(word_count, max_tokens=8, pack_sentences=False).plan(text) == split_by_sentences(text)
+
+
+class CountingModel:
+    def __init__(self, tokens_per_word):
+        self.tokens_per_word = tokens_per_word
+    
+    def count_tokens(self, input_text, input_language="en", target_language="fr"):
+        return len(input_text.split()) * self.tokens_per_word
+
+
+def test_manager_counts_longest_tokenization():
+    manager = TranslationManager(all_models={}, embedder=None, debug=False)
+    manager.loaded_models = {"model_a": CountingModel(1), "model_b": CountingModel(3)}
+    
+    assert manager.count_tokens("Catch rose sharply.", source_lang="en", target_lang="fr") == 9
+
+
+def test_word_document_token_chunking(tmp_path):
+    input_path = str(tmp_path / 'input.docx')
+    output_path = str(tmp_path / 'output.docx')
+    doc = Document()
+    doc.add_paragraph("Catch rose. Effort fell. Biomass was stable.")
+    doc.save(input_path)
+    mock = MockTranslator()
+    
+    translate_word_document(
+        input_docx_file=input_path, output_docx_file=output_path, source_lang="en",
+        translation_manager=mock, chunk_by="tokens", bypass_rules=False
+    )
+    
+    assert mock.source_texts == ["Catch rose. Effort fell. Biomass was stable."]
+    assert Document(output_path).paragraphs[0].text == "[TR:Catch rose. Effort fell. Biomass was stable.]"
@@ -0,0 +1,117 @@
+import json
+
+import pandas as pd
+import pytest
+from docx import Document
+
+from scitrans import config
+from scitrans.translate.corpus_lookup import CorpusLookup, format_corpus_stats
+from scitrans.translate.word_document import translate_word_document
+from tests.conftest import MockTranslator
+
+BOILERPLATE_EN = "This report is available from the Canadian Science Advisory Secretariat."
+BOILERPLATE_FR = "Ce rapport est disponible auprès du Secrétariat canadien des avis scientifiques."
+
+
+@pytest.fixture
+def corpus_paths(tmp_path):
+    jsonl_path = tmp_path / "training_data.jsonl"
+    records = [
+        {"source": BOILERPLATE_EN, "target": BOILERPLATE_FR, "source_lang": "en"},
+        {"source": BOILERPLATE_FR, "target": BOILERPLATE_EN, "source_lang": "fr"},
+        {"source": "Results are shown below.", "target": "Les résultats figurent ci-dessous.", "source_lang": "en"},
+        {"source": "Results are shown below.", "target": "Les résultats sont présentés ci-dessous.", "source_lang": "en"},
+        {"source": "Methods", "target": "Méthodes", "source_lang": "en"},
+    ]
+    jsonl_path.write_text("\n".join(json.dumps(r, ensure_ascii=False) for r in records), encoding="utf-8")
+    pickle_path = tmp_path / "matched.pickle"
+    pd.DataFrame({
+        "fr": ["Les prises ont augmenté dans la zone nord.", None, "L'effort de relevé a diminué dans la plupart des strates."],
+        "en": ["Catches increased in the northern area.", "Orphan sentence without a match.", "Landings were reported late."],
+        "similarity": [0.93, 0.4, 0.62],
+    }).to_pickle(pickle_path)
+    return [jsonl_path], [pickle_path]
+
+
+def test_exact_matches_indexed_per_direction(corpus_paths):
+    jsonl_paths, pickle_paths = corpus_paths
+    corpus = CorpusLookup.load("en", jsonl_paths=jsonl_paths, pickle_paths=pickle_paths, min_words=3)
+    
+    assert corpus.translate(f"  {BOILERPLATE_EN.replace(' ', '   ', 2)}\n") == f"  {BOILERPLATE_FR}\n"
+    assert corpus.translate("Catches increased in the northern area.") == "Les prises ont augmenté dans la zone nord."
+    assert corpus.translate(BOILERPLATE_FR) is None
+    assert corpus.matches == [
+        (BOILERPLATE_EN.replace(' ', '   ', 2), "training_data.jsonl"),
+        ("Catches increased in the northern area.", "matched.pickle"),
+    ]
+
+
+def test_ambiguous_and_short_entries_left_to_models(corpus_paths):
+    jsonl_paths, pickle_paths = corpus_paths
+    corpus = CorpusLookup.load("en", jsonl_paths=jsonl_paths, pickle_paths=pickle_paths, min_words=3)
+    
+    assert "Results are shown below." not in corpus
+    assert "Methods" not in corpus
+    assert "Orphan sentence without a match." not in corpus
+    assert len(corpus) == 2
+
+
+def test_held_out_test_pairs_never_matched(tmp_path, corpus_paths):
+    jsonl_paths, pickle_paths = corpus_paths
+    testing_path = tmp_path / "testing_data.jsonl"
+    testing_path.write_text(json.dumps({
+        "source": "Les prises ont augmenté dans la zone nord.", "target": "Catches increased in the northern area.",
+        "source_lang": "fr"
+    }, ensure_ascii=False), encoding="utf-8")
+    
+    corpus = CorpusLookup.load("en", jsonl_paths=jsonl_paths, pickle_paths=pickle_paths, min_words=3,
+                               exclude_jsonl_paths=[testing_path])
+    
+    assert corpus.translate("Catches increased in the northern area.") is None
+    assert corpus.translate(BOILERPLATE_EN) == BOILERPLATE_FR
+
+
+def test_low_similarity_pairs_left_to_models(corpus_paths):
+    jsonl_paths, pickle_paths = corpus_paths
+    corpus = CorpusLookup.load("en", jsonl_paths=jsonl_paths, pickle_paths=pickle_paths, min_words=3)
+    unfiltered = CorpusLookup.load("en", jsonl_paths=jsonl_paths, pickle_paths=pickle_paths, min_words=3,
+                                   min_similarity=0.5)
+    
+    assert corpus.translate("Landings were reported late.") is None
+    assert corpus.translate("Catches increased in the northern area.") == "Les prises ont augmenté dans la zone nord."
+    assert "Landings were reported late." in unfiltered
+
+
+def test_format_corpus_stats():
+    matches = [("a", "worddoc.jsonl"), ("b", "training.jsonl"), ("c", "worddoc.jsonl")]
+    
+    assert format_corpus_stats(matches) == (
+        "Used reference translations from the bilingual corpus for 3 segments (training.jsonl=1, worddoc.jsonl=2)"
+    )
+
+
+@pytest.mark.parametrize("pipeline", [False, True])
+def test_word_document_uses_reference_and_notes_provenance(tmp_path, monkeypatch, corpus_paths, pipeline):
+    jsonl_paths, pickle_paths = corpus_paths
+    monkeypatch.setitem(config.CORPUS_LOOKUP_CONFIG, "jsonl_paths", jsonl_paths)
+    monkeypatch.setitem(config.CORPUS_LOOKUP_CONFIG, "pickle_paths", pickle_paths)
+    input_path = str(tmp_path / 'input.docx')
+    output_path = str(tmp_path / 'output.docx')
+    doc = Document()
+    doc.add_paragraph(f"{BOILERPLATE_EN} Recruitment was low.")
+    doc.save(input_path)
+    mock = MockTranslator()
+    
+    translate_word_document(
+        input_docx_file=input_path, output_docx_file=output_path, source_lang="en",
+        translation_manager=mock, preserve_json_notes=True, pipeline=pipeline, corpus_lookup=True
+    )
+    
+    assert mock.source_texts == ["Recruitment was low."]
+    assert Document(output_path).paragraphs[0].text == f"{BOILERPLATE_FR} [TR:Recruitment was low.]"
+    with open(str(tmp_path / 'output_translation_notes.json'), encoding='utf-8') as f:
+        notes = json.load(f)
+    entry = notes['paragraphs'][0]
+    assert entry['type'] == 'corpus'
+    assert entry['notes'][0]['original_text'] == BOILERPLATE_EN
+    assert "training_data.jsonl" in entry['notes'][0]['detail']
@@ -0,0 +1,210 @@
+import json
+import time
+
+import pytest
+from docx import Document
+
+from scitrans.translate.deadline import DeadlineScheduler, DeadlineTranslationManager
+from scitrans.translate.progress import TranslationProgress
+from scitrans.translate.word_document import translate_word_document
+from tests.conftest import EchoModel, MockTranslator
+
+LEVELS = [
+    {"name": "full", "cost": 1.0},
+    {"name": "fewer_models", "cost": 2 / 3, "max_models": 2},
+    {"name": "single_model", "cost": 1 / 3, "max_models": 1, "single_attempt": True, "num_beams": 1},
+]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+class TimedMockTranslator(MockTranslator):
+    # Each call advances the fake clock by the latency of the ensemble size it was given
+    def __init__(self, clock, seconds_per_model=1.0):
+        super().__init__()
+        self.clock = clock
+        self.seconds_per_model = seconds_per_model
+        self.loaded_models = {"model_a": None, "model_b": None, "model_c": None}
+        self.translation_cache = {}
+        self.calls = []
+    
+    def translate_with_best_model(self, text, source_lang="en", target_lang="fr", use_find_replace=False, idx=None,
+                                  **kwargs):
+        self.calls.append(kwargs)
+        model_names = kwargs.get("model_names") or list(self.loaded_models)
+        self.clock.now += self.seconds_per_model * len(model_names)
+        result = super().translate_with_best_model(text, source_lang, target_lang, use_find_replace, idx)
+        return {**result, "best_model_source": model_names[-1]}
+
+
+def _scheduler(time_budget, total, clock):
+    progress = TranslationProgress(total, clock=clock)
+    progress.start()
+    scheduler = DeadlineScheduler(time_budget, progress, levels=LEVELS, safety_margin=1.0, smoothing=1.0, clock=clock)
+    scheduler.start()
+    return scheduler, progress
+
+
+@pytest.mark.parametrize("time_budget, expected_level", [
+    (100.0, "full"),
+    (30.0, "fewer_models"),
+    (5.0, "single_model"),
+])
+def test_level_fits_projected_finish(time_budget, expected_level):
+    clock = FakeClock()
+    scheduler, progress = _scheduler(time_budget, total=11, clock=clock)
+    clock.now = 3.0
+    scheduler.record(LEVELS[0], 3.0)
+    progress.update()
+    
+    assert scheduler.choose_level()["name"] == expected_level
+
+
+def test_first_segment_uses_full_level():
+    scheduler, _progress = _scheduler(0.001, total=10, clock=FakeClock())
+    
+    assert scheduler.choose_level()["name"] == "full"
+
+
+def test_manager_degrades_and_recovers():
+    clock = FakeClock()
+    scheduler, progress = _scheduler(10.0, total=6, clock=clock)
+    mock = TimedMockTranslator(clock)
+    manager = DeadlineTranslationManager(mock, scheduler, segment_timeout=5)
+    
+    levels = []
+    for i in range(6):
+        result = manager.translate_with_best_model(f"Segment {i}.", source_lang="en", target_lang="fr",
+                                                   use_find_replace=False, idx=i)
+        progress.update(result)
+        levels.append(result.get("degraded", "full"))
+    
+    assert levels == ["full", "single_model", "single_model", "single_model", "fewer_models", "fewer_models"]
+    assert clock.now <= 10.0
+    assert [text for text, _level in manager.degraded] == [f"Segment {i}." for i, level in enumerate(levels)
+                                                          if level != "full"]
+    assert all(call["time_limit"] == 5 for call in mock.calls)
+    single = next(call for call in mock.calls if call["model_names"] and len(call["model_names"]) == 1)
+    assert single["single_attempt"] is True
+    assert single["generation_kwargs"]["num_beams"] == 1
+    assert single["model_names"] == ["model_c"]
+
+
+def test_translation_manager_limits_ensemble_and_skips_cache(stub_manager):
+    stub_manager.loaded_models = {"model_a": EchoModel(), "model_b": EchoModel()}
+    
+    result = stub_manager.translate_with_best_model(
+        "Le stock.", source_lang="fr", target_lang="en", use_find_replace=False,
+        generation_kwargs={"num_beams": 1}, model_names=["model_b"]
+    )
+    
+    assert result["best_model_source"] == "model_b"
+    assert stub_manager.loaded_models["model_a"].generation_kwargs == []
+    assert stub_manager.loaded_models["model_b"].generation_kwargs == [{"num_beams": 1}]
+    assert "Le stock." not in stub_manager.translation_cache
+
+
+def test_timed_out_segment_listed_as_degraded():
+    clock = FakeClock()
+    scheduler, _progress = _scheduler(100.0, total=1, clock=clock)
+    mock = TimedMockTranslator(clock)
+    mock.translate_with_best_model = lambda text, **kwargs: {"translated_text": text, "timed_out": True}
+    manager = DeadlineTranslationManager(mock, scheduler)
+    
+    result = manager.translate_with_best_model("Segment.", source_lang="en", target_lang="fr", use_find_replace=False)
+    
+    assert result["degraded"] == "timed_out"
+    assert manager.degraded == [("Segment.", "timed_out")]
+
+
+class SlowModel(EchoModel):
+    def translate_text(self, input_text, input_language="en", target_language="fr", generation_kwargs=None):
+        time.sleep(0.05)
+        return super().translate_text(input_text, input_language, target_language, generation_kwargs)
+
+
+def test_segment_time_limit_spans_models(stub_manager):
+    stub_manager.loaded_models = {"model_a": SlowModel(), "model_b": SlowModel()}
+    
+    result = stub_manager.translate_with_best_model(
+        "Le stock.", source_lang="fr", target_lang="en", use_find_replace=False, time_limit=0.01
+    )
+    
+    assert result["timed_out"] is True
+    assert result["best_model_source"] == "model_a"
+    assert stub_manager.loaded_models["model_a"].generation_kwargs[0]["max_time"] <= 0.01
+    assert stub_manager.loaded_models["model_b"].inputs == []
+    assert "Le stock." not in stub_manager.translation_cache
+
+
+class RejectingModel(EchoModel):
+    def translate_text(self, input_text, input_language="en", target_language="fr", generation_kwargs=None):
+        super().translate_text(input_text, input_language, target_language, generation_kwargs)
+        return "Le stock."
+
+
+def test_retries_vary_beams_unless_pinned(stub_manager):
+    model = RejectingModel()
+    mapping = {"ACRONYM0001": {"original_text": "MPO"}}
+    
+    stub_manager.translate_with_retries(model, "Le ACRONYM0001.", "fr", "en", token_mapping=mapping,
+                                        base_generation_kwargs={"max_time": 5})
+    stub_manager.translate_with_retries(model, "Le ACRONYM0001.", "fr", "en", token_mapping=mapping,
+                                        base_generation_kwargs={"num_beams": 2})
+    
+    assert model.generation_kwargs == [
+        {"max_time": 5, "num_beams": 4}, {"max_time": 5, "num_beams": 6}, {"max_time": 5, "num_beams": 8},
+        {"num_beams": 2},
+    ]
+
+
+class SleepingMockTranslator(MockTranslator):
+    def translate_with_best_model(self, text, source_lang, target_lang, use_find_replace, idx, **kwargs):
+        time.sleep(0.01)
+        return super().translate_with_best_model(text, source_lang, target_lang, use_find_replace, idx)
+
+
+def test_word_document_notes_degraded_segments(tmp_path, capsys):
+    input_path = str(tmp_path / 'input.docx')
+    output_path = str(tmp_path / 'output.docx')
+    doc = Document()
+    for i in range(4):
+        doc.add_paragraph(f"Recruitment was low in area {i}.")
+    doc.save(input_path)
+    
+    translate_word_document(
+        input_docx_file=input_path, output_docx_file=output_path, source_lang="en",
+        translation_manager=SleepingMockTranslator(), time_budget=0.001, preserve_json_notes=True
+    )
+    
+    assert [p.text for p in Document(output_path).paragraphs][3] == "[TR:Recruitment was low in area 3.]"
+    assert "3 segments translated in degraded mode (single_model=3)" in capsys.readouterr().out
+    notes_text = (tmp_path / 'output_translation_notes.json').read_text(encoding='utf-8')
+    assert notes_text.count("degraded mode (single_model)") == 3
+
+
+def test_pipelined_degraded_notes_stay_with_their_segment(tmp_path):
+    input_path = str(tmp_path / 'input.docx')
+    output_path = str(tmp_path / 'output.docx')
+    doc = Document()
+    for i in range(6):
+        doc.add_paragraph(f"Recruitment was low in area {i}.")
+    doc.save(input_path)
+    
+    translate_word_document(
+        input_docx_file=input_path, output_docx_file=output_path, source_lang="en",
+        translation_manager=SleepingMockTranslator(), time_budget=0.001, preserve_json_notes=True, pipeline=True
+    )
+    
+    notes = json.loads((tmp_path / 'output_translation_notes.json').read_text(encoding='utf-8'))
+    degraded = [note for entry in notes['paragraphs'] for note in entry['notes']
+                if 'degraded mode' in note.get('detail', '')]
+    assert degraded
+    assert all(note['original_text'] in entry['full_paragraph'] for entry in notes['paragraphs']
+               for note in entry['notes'])
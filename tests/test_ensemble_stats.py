@@ -0,0 +1,107 @@
+import pytest
+
+from scitrans import config
+from scitrans.translate.ensemble_stats import EnsembleStats, format_ensemble_report, length_bucket, prune_decisions
+
+SIMILARITIES = {"model_a": 0.90, "model_b": 0.85, "model_c": 0.899}
+
+
+@pytest.fixture
+def model_calls(stub_manager, mocker):
+    # stub_manager with three models that score SIMILARITIES; the list records which ones ran
+    stub_manager.loaded_models = {name: None for name in SIMILARITIES}
+    stub_manager.ensemble_stats = EnsembleStats(negligible_margin=0.005)
+    calls = []
+    
+    def translate_single(text, model_name, **kwargs):
+        calls.append(model_name)
+        return {"translated_text": f"{model_name}: {text}", "similarity_vs_source": SIMILARITIES[model_name]}
+    
+    mocker.patch.object(stub_manager, "translate_single", side_effect=translate_single)
+    return calls
+
+
+def _entry(segments, wins, negligible_wins=0):
+    return {"segments": segments, "wins": wins, "negligible_wins": negligible_wins, "margin_total": 0.0, "margins": wins}
+
+
+def test_length_buckets():
+    assert [length_bucket(" ".join(["w"] * n), [8, 24]) for n in (1, 8, 9, 24, 25)] == ["1-8", "1-8", "9-24", "9-24", "25+"]
+
+
+def test_wins_and_margins_recorded_per_direction_and_length(stub_manager, model_calls):
+    stub_manager.translate_with_all_models("Catch rose.", source_lang="en", target_lang="fr", use_find_replace=False)
+    stub_manager.translate_with_all_models("Catch rose.", source_lang="en", target_lang="fr", use_find_replace=False)
+    stub_manager.translate_with_all_models(" ".join(["word"] * 30), source_lang="fr", target_lang="en", use_find_replace=False)
+    # A caller's subset (a deadline level) is not counted
+    stub_manager.translate_with_all_models("Catch rose.", use_find_replace=False, model_names=["model_a", "model_b"])
+    
+    short = stub_manager.ensemble_stats.contexts["en-fr/1-8"]
+    assert short["segments"] == 2
+    assert short["models"]["model_a"]["wins"] == 2
+    assert short["models"]["model_a"]["negligible_wins"] == 2
+    assert short["models"]["model_a"]["margin_total"] == pytest.approx(0.002)
+    assert short["models"]["model_b"] == {"segments": 2, "wins": 0, "negligible_wins": 0, "margin_total": 0.0, "margins": 0}
+    assert stub_manager.ensemble_stats.contexts["fr-en/25+"]["segments"] == 1
+
+
+def test_rare_and_negligible_winners_dropped():
+    context = {"segments": 300, "models": {
+        "model_a": _entry(300, 250, negligible_wins=20),
+        "model_b": _entry(300, 5),
+        "model_c": _entry(300, 45, negligible_wins=40),
+        "model_d": _entry(50, 1),
+    }}
+    
+    decisions = prune_decisions(context, min_segments=200, min_win_rate=0.03)
+    
+    assert {name: keep for name, (keep, _reason) in decisions.items()} == {
+        "model_a": True, "model_b": False, "model_c": False, "model_d": True
+    }
+    assert "negligible margin" in decisions["model_c"][1]
+    assert "only 50 segments" in decisions["model_d"][1]
+
+
+def test_most_frequent_winner_kept_when_all_would_be_dropped():
+    context = {"segments": 300, "models": {"model_a": _entry(300, 8), "model_b": _entry(300, 2)}}
+    
+    decisions = prune_decisions(context, min_segments=200, min_win_rate=0.05)
+    
+    assert decisions["model_a"][0] and not decisions["model_b"][0]
+
+
+def test_auto_prune_skips_dropped_models_and_explores(stub_manager, model_calls, monkeypatch):
+    monkeypatch.setitem(config.ENSEMBLE_STATS_CONFIG, "min_segments", 200)
+    monkeypatch.setitem(config.ENSEMBLE_STATS_CONFIG, "min_win_rate", 0.03)
+    monkeypatch.setitem(config.ENSEMBLE_STATS_CONFIG, "explore_every", 3)
+    stub_manager.auto_prune = True
+    stub_manager.ensemble_stats.contexts["en-fr/1-8"] = {"segments": 300, "models": {
+        "model_a": _entry(300, 284), "model_b": _entry(300, 1), "model_c": _entry(300, 15)
+    }}
+    
+    called = []
+    for _ in range(3):
+        model_calls.clear()
+        stub_manager.translate_with_all_models("Catch rose.", source_lang="en", target_lang="fr", use_find_replace=False)
+        called.append(list(model_calls))
+    
+    assert called == [["model_a", "model_c"], ["model_a", "model_c"], ["model_a", "model_b", "model_c"]]
+    assert stub_manager.ensemble_stats.contexts["en-fr/1-8"]["models"]["model_b"]["segments"] == 301
+
+
+def test_stats_saved_and_reported(tmp_path):
+    path = tmp_path / "ensemble_stats.json"
+    stats = EnsembleStats({"en-fr/1-8": {"segments": 300, "models": {
+        "model_a": {**_entry(300, 295), "margin_total": 5.9},
+        "m2m100_418m_base": _entry(300, 5),
+    }}}, negligible_margin=0.01)
+    
+    stats.save(path)
+    loaded = EnsembleStats.load(path)
+    report = format_ensemble_report(loaded, min_segments=200, min_win_rate=0.03)
+    
+    assert loaded.contexts == stats.contexts
+    assert loaded.negligible_margin == 0.01
+    assert "model_a: 295/300 wins, mean margin 0.0200, keep" in report
+    assert "m2m100_418m_base: 5/300 wins, mean margin 0.0000, drop (won 1.7% of 300 segments (below 3.0%))" in report
+    assert EnsembleStats.load(tmp_path / "missing.json").contexts == {}
@@ -0,0 +1,161 @@
+import pytest
+import torch
+
+from scitrans import config
+from scitrans.translate import execution_profile
+from scitrans.translate.execution_profile import (
+    apply_execution_profile, load_execution_profile, profile_path_for, save_execution_profile, tune_execution_profile
+)
+from scitrans.translate.models import BaseTranslationModel, create_translator, retry_beam_sizes
+
+DTYPE_COST = {"bfloat16": 1.0, "float32": 0.5, "int8": 0.25}
+THREAD_COST = {1: 1.0, 2: 0.6, 4: 0.8}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+class CalibrationModel:
+    # Advances the clock by a cost that depends on dtype, beams and the torch thread count
+    def __init__(self, clock, beam_sensitive=False, **parameters):
+        self.clock = clock
+        self.beam_sensitive = beam_sensitive
+        self.dtype = parameters["dtype"]
+        self.parameters = parameters
+    
+    def translate_text(self, input_text, input_language="en", target_language="fr", generation_kwargs=None):
+        num_beams = (generation_kwargs or {}).get("num_beams", self.parameters.get("num_beams", 4))
+        self.clock.now += DTYPE_COST[self.dtype] * num_beams * THREAD_COST[torch.get_num_threads()]
+        if self.dtype == "int8" or (self.beam_sensitive and num_beams < 4):
+            return f"~{input_text}"
+        return input_text.upper()
+    
+    def clear_cache(self):
+        pass
+
+
+@pytest.fixture
+def restore_threads():
+    threads = torch.get_num_threads()
+    yield
+    torch.set_num_threads(threads)
+
+
+def test_fastest_setting_with_unchanged_output_chosen(restore_threads, mocker):
+    mocker.patch('scitrans.rules_based_replacements.replacements.detect_person_names', return_value=[])
+    clock = FakeClock()
+    all_models = {
+        "model_a": {"cls": CalibrationModel, "params": {"clock": clock}},
+        "model_b": {"cls": CalibrationModel, "params": {"clock": clock, "beam_sensitive": True}},
+    }
+    
+    profile = tune_execution_profile(
+        ["Catch rose.", "Effort fell."], all_models=all_models, thread_counts=[1, 2, 4],
+        dtypes=["bfloat16", "float32", "int8"], beam_sizes=[4, 2], clock=clock
+    )
+    
+    assert profile["num_threads"] == 2
+    assert profile["models"] == {
+        "model_a": {"dtype": "float32", "num_beams": 2},
+        "model_b": {"dtype": "float32", "num_beams": 4},
+    }
+    assert profile["segments_per_second"]["model_a"] == pytest.approx(2 / (0.5 * 2 * 0.6 * 2), abs=0.01)
+
+
+def test_warm_up_not_charged_to_first_setting(restore_threads, mocker):
+    clock = FakeClock()
+    cold = [True]
+    
+    def detect_person_names(*args, **kwargs):
+        # The first NER call loads spaCy
+        if cold:
+            clock.now += 100
+            cold.clear()
+        return []
+    
+    mocker.patch('scitrans.rules_based_replacements.replacements.detect_person_names', side_effect=detect_person_names)
+    all_models = {"model_a": {"cls": CalibrationModel, "params": {"clock": clock}}}
+    
+    profile = tune_execution_profile(
+        ["Catch rose.", "Effort fell."], all_models=all_models, thread_counts=[2, 1],
+        dtypes=["float32"], beam_sizes=[4], clock=clock
+    )
+    
+    assert profile["num_threads"] == 2
+    assert profile["segments_per_second"]["model_a"] == pytest.approx(2 / (0.5 * 4 * 0.6 * 2), abs=0.01)
+
+
+class TokenDroppingModel:
+    def __init__(self, **parameters):
+        self.parameters = parameters
+        self.generation_kwargs = []
+    
+    def translate_text(self, input_text, input_language="en", target_language="fr", generation_kwargs=None):
+        self.generation_kwargs.append(generation_kwargs)
+        return "The stock."
+
+
+@pytest.mark.parametrize("num_beams, expected", [(4, [4, 6, 8]), (2, [2, 3, 4]), (1, [1, 2])])
+def test_retries_widen_from_the_model_beams(stub_manager, num_beams, expected):
+    model = TokenDroppingModel(num_beams=num_beams)
+    
+    stub_manager.translate_with_retries(model, "The ACRONYM0001 stock.", "en", "fr",
+                                        token_mapping={"ACRONYM0001": {"original_text": "DFO"}})
+    
+    assert retry_beam_sizes(num_beams) == expected
+    assert [kwargs["num_beams"] for kwargs in model.generation_kwargs] == expected
+
+
+def test_profile_round_trip_and_hardware_check(tmp_path):
+    path = profile_path_for(host="node-1", profile_dir=str(tmp_path))
+    profile = {
+        "version": execution_profile.PROFILE_VERSION, "hardware": execution_profile._hardware(),
+        "num_threads": 2, "interop_threads": 1, "models": {"model_a": {"dtype": "int8", "num_beams": 2}},
+    }
+    
+    save_execution_profile(profile, path)
+    assert load_execution_profile(path) == profile
+    
+    save_execution_profile({**profile, "hardware": {"cpu_count": -1}}, path)
+    assert load_execution_profile(path) is None
+
+
+def test_profile_settings_merged_into_model_params(restore_threads):
+    all_models = {"model_a": {"cls": CalibrationModel, "params": {"base_model_id": "a"}}}
+    profile = {"num_threads": 1, "interop_threads": torch.get_num_interop_threads(),
+               "models": {"model_a": {"dtype": "int8", "num_beams": 2}, "retired_model": {"dtype": "float32"}}}
+    
+    apply_execution_profile(profile, all_models)
+    
+    assert all_models == {"model_a": {"cls": CalibrationModel,
+                                      "params": {"base_model_id": "a", "dtype": "int8", "num_beams": 2}}}
+    assert torch.get_num_threads() == 1
+
+
+def test_create_translator_picks_up_host_profile(tmp_path, monkeypatch, restore_threads):
+    monkeypatch.setitem(config.EXECUTION_PROFILE_CONFIG, "profile_dir", str(tmp_path))
+    monkeypatch.setattr(torch.cuda, "is_available", lambda: False)
+    save_execution_profile({
+        "version": execution_profile.PROFILE_VERSION, "hardware": execution_profile._hardware(),
+        "num_threads": 1, "interop_threads": torch.get_num_interop_threads(),
+        "models": {"opus_mt_base": {"dtype": "float32", "num_beams": 2}},
+    })
+    
+    manager = create_translator(models_to_use=["opus_mt_base"], use_embedder=False, load_models=False)
+    untuned = create_translator(
+        models_to_use=["opus_mt_base"], use_embedder=False, load_models=False, use_execution_profile=False
+    )
+    
+    assert manager.all_models["opus_mt_base"]["params"]["dtype"] == "float32"
+    assert "dtype" not in untuned.all_models["opus_mt_base"]["params"]
+
+
+def test_int8_loads_in_float32():
+    assert BaseTranslationModel("model", dtype="int8")._torch_dtype() == torch.float32
+    assert BaseTranslationModel("model", dtype="float32")._torch_dtype() == torch.float32
+    assert BaseTranslationModel("model")._torch_dtype() == torch.bfloat16
@@ -1,10 +1,13 @@
 import pytest
 from docx import Document
+from docx.enum.text import WD_UNDERLINE
 from docx.oxml import OxmlElement
 from docx.oxml.ns import qn
+from docx.shared import RGBColor
 
 from scitrans.translate.word_document import _translate_paragraph, _collapse_runs_preserving_shapes
 from scitrans.translate.word_formatting import SuperscriptOrdinalsRule, ItalicBracketsRule, apply_formatting_rules
+from scitrans.translate.word_formatting import FormattedRun, ParagraphAnalysis, RuleRegistry
 from scitrans.translate.word_notes import _group_notes_by_paragraph
 from tests.conftest import run_word_translation, all_notes_text, notes_entry_count
 
@@ -21,6 +24,45 @@ def empty_doc():
     return Document()
 
 
+# ---------------------------------------------------------------------------
+# Paragraph analysis
+# ---------------------------------------------------------------------------
+
+def _varied_run_paragraph(doc):
+    para = doc.add_paragraph("Plain ")
+    para.add_run("bold").bold = True
+    para.add_run(" not bold").bold = False
+    para.add_run("double").font.underline = WD_UNDERLINE.DOUBLE
+    para.add_run("single").underline = True
+    para.add_run("2").font.superscript = True
+    para.add_run("red").font.color.rgb = RGBColor(0xFF, 0, 0)
+    para.add_run("Gadus morhua").italic = True
+    para.add_run("\tafter tab")
+    return para
+
+
+def test_formatted_run_from_element_matches_create(empty_doc):
+    para = _varied_run_paragraph(empty_doc)
+    
+    analysis = ParagraphAnalysis(para)
+    
+    assert analysis.formatted_runs == [FormattedRun.create(run) for run in para.runs]
+    assert analysis.special_runs == [False] * 8 + [True]
+
+
+def test_paragraph_analysis_detection_matches_registry(empty_doc):
+    para = empty_doc.add_paragraph("Atlantic cod (")
+    para.add_run("Gadus morhua").italic = True
+    para.add_run(") were sampled")
+    para.add_run("1").font.superscript = True
+    
+    analysis = ParagraphAnalysis(para)
+    
+    assert analysis.detected == RuleRegistry.detect_all(para)
+    assert len(analysis.detected) == 2
+    assert analysis.has_formatting_differences
+
+
 # ---------------------------------------------------------------------------
 # Header / footer structure
 # ---------------------------------------------------------------------------
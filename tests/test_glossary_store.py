@@ -0,0 +1,138 @@
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from scitrans.proofreader.glossary import load_glossary
+from scitrans.rules_based_replacements import glossary_store
+from scitrans.rules_based_replacements.glossary_store import GlossaryStore, get_glossary_store, index_path_for
+
+
+GLOSSARY_DATA = {
+    "metadata": {"version": "test"},
+    "translations": {
+        "nomenclature": [{"english": "stock assessment", "french": "évaluation des stocks"}],
+        "acronym": [
+            {"english_acronym": "DFO", "french_acronym": "MPO",
+             "english": "Fisheries and Oceans Canada", "french": "Pêches et Océans Canada"},
+            {"english": "CSAS", "french": "SCCS"},
+        ],
+        "table": [
+            {"english": "Yes", "french": "Oui", "en_formatted": "Yes", "fr_formatted": "Oui"},
+            {"english": "Yes", "french": "Oui!", "en_formatted": "Yes", "fr_formatted": "Oui!"},
+        ],
+    },
+}
+
+
+def _write_glossary(path, data):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+
+
+@pytest.fixture
+def glossary_path(tmp_path):
+    path = tmp_path / "glossary.json"
+    _write_glossary(path, GLOSSARY_DATA)
+    return path
+
+
+class TestGlossaryStoreIndexes:
+    def test_glossary_per_direction(self, glossary_path):
+        store = GlossaryStore(glossary_path)
+        
+        assert store.glossary("en") == {
+            "stock assessment": "évaluation des stocks", "Yes": "Oui!", "DFO": "MPO", "CSAS": "SCCS"
+        }
+        assert store.glossary("fr", categories=["acronym"]) == {"MPO": "DFO", "SCCS": "CSAS"}
+    
+    def test_invalid_source_lang_raises(self, glossary_path):
+        with pytest.raises(ValueError):
+            GlossaryStore(glossary_path).glossary("de")
+    
+    def test_table_translations_keep_first_entry(self, glossary_path):
+        store = GlossaryStore(glossary_path)
+        
+        assert store.table_translations("en") == {"Yes": "Oui"}
+        assert store.table_translations("fr") == {"Oui": "Yes", "Oui!": "Yes"}
+    
+    def test_normalized_translations(self, glossary_path):
+        store = GlossaryStore(glossary_path)
+        
+        assert store.translations["acronym"]["MPO"] == "DFO"
+        assert store.data["metadata"] == {"version": "test"}
+    
+    def test_matcher_per_direction(self, glossary_path):
+        store = GlossaryStore(glossary_path)
+        
+        matches = store.matcher("fr").find_matches("Le MPO publie.")
+        assert [(start, end, entry['translation']) for start, end, entry in matches] == [(3, 6, "DFO")]
+    
+    def test_load_glossary_matches_store(self, glossary_path):
+        assert load_glossary(glossary_path, categories=["acronym"], source_lang="en") == {"DFO": "MPO", "CSAS": "SCCS"}
+        with pytest.raises(ValueError):
+            load_glossary(glossary_path)
+    
+    def test_shared_store_per_path(self, glossary_path):
+        assert get_glossary_store(glossary_path) is get_glossary_store(str(glossary_path))
+
+
+class TestGlossaryStoreSidecar:
+    def test_sidecar_written_on_first_load(self, glossary_path):
+        GlossaryStore(glossary_path).data
+        
+        assert index_path_for(glossary_path).exists()
+    
+    def test_fresh_store_loads_from_sidecar(self, glossary_path):
+        GlossaryStore(glossary_path).data
+        
+        with patch('scitrans.rules_based_replacements.glossary_store.build_index') as mock_build:
+            store = GlossaryStore(glossary_path)
+            assert store.glossary("en", categories=["acronym"])["DFO"] == "MPO"
+        mock_build.assert_not_called()
+    
+    def test_content_change_rebuilds(self, glossary_path):
+        store = GlossaryStore(glossary_path)
+        assert "DFO" in store.glossary("en")
+        
+        changed = json.loads(json.dumps(GLOSSARY_DATA))
+        changed["translations"]["acronym"] = [{"english_acronym": "CCG", "french_acronym": "GCC"}]
+        _write_glossary(glossary_path, changed)
+        stat = os.stat(glossary_path)
+        os.utime(glossary_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        
+        assert store.glossary("en", categories=["acronym"]) == {"CCG": "GCC"}
+        assert GlossaryStore(glossary_path).glossary("en", categories=["acronym"]) == {"CCG": "GCC"}
+    
+    def test_touch_without_content_change_reuses_index(self, glossary_path):
+        GlossaryStore(glossary_path).data
+        stat = os.stat(glossary_path)
+        os.utime(glossary_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        
+        with patch('scitrans.rules_based_replacements.glossary_store.build_index') as mock_build:
+            assert GlossaryStore(glossary_path).glossary("fr", categories=["acronym"])["MPO"] == "DFO"
+        mock_build.assert_not_called()
+    
+    def test_sidecar_holds_plain_data_only(self, glossary_path):
+        GlossaryStore(glossary_path).matcher("fr")
+        
+        assert b"GlossaryMatcher" not in index_path_for(glossary_path).read_bytes()
+    
+    def test_matcher_version_change_rebuilds(self, glossary_path):
+        GlossaryStore(glossary_path).data
+        
+        with patch.object(glossary_store, 'MATCHER_VERSION', 2), \
+                patch.object(glossary_store, 'build_index', wraps=glossary_store.build_index) as mock_build:
+            matches = GlossaryStore(glossary_path).matcher("fr").find_matches("Le MPO publie.")
+        mock_build.assert_called_once()
+        assert [entry['translation'] for _start, _end, entry in matches] == ["DFO"]
+    
+    def test_corrupt_sidecar_is_rebuilt(self, glossary_path):
+        index_path_for(glossary_path).write_bytes(b"not a pickle")
+        
+        assert GlossaryStore(glossary_path).glossary("en", categories=["acronym"])["DFO"] == "MPO"
+    
+    def test_unwritable_sidecar_is_not_fatal(self, glossary_path):
+        with patch('scitrans.rules_based_replacements.glossary_store.pickle.dump', side_effect=OSError("read-only")):
+            assert GlossaryStore(glossary_path).glossary("en", categories=["acronym"])["DFO"] == "MPO"
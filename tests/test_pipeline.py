@@ -0,0 +1,223 @@
+import threading
+
+import pytest
+from docx import Document
+from docx.oxml import OxmlElement
+
+from scitrans.translate.pipeline import SegmentPipeline
+from scitrans.translate.progress import TranslationProgress, translate_with_progress
+from scitrans.translate.txt_document import translate_txt_document
+from scitrans.translate.word_document import translate_word_document
+from tests.conftest import EchoModel, MockTranslator
+
+KWARGS = {"source_lang": "en", "target_lang": "fr", "use_find_replace": False, "use_cache": True}
+
+
+class ThreadRecordingTranslator(MockTranslator):
+    def __init__(self, fail_on=None):
+        super().__init__()
+        self.threads = []
+        self.translation_cache = {}
+        self.fail_on = fail_on
+    
+    def translate_with_best_model(self, text, source_lang, target_lang, use_find_replace, idx, **kwargs):
+        if text == self.fail_on:
+            raise RuntimeError("model crashed")
+        self.threads.append(threading.current_thread().name)
+        result = super().translate_with_best_model(text, source_lang, target_lang, use_find_replace, idx)
+        self.translation_cache[text] = result
+        return result
+
+
+def _planned(texts):
+    return [(text, i) for i, text in enumerate(texts)]
+
+
+def _run(pipeline, texts):
+    try:
+        return [pipeline.translate_with_best_model(text, idx=i, **KWARGS)["translated_text"]
+                for i, text in enumerate(texts)]
+    finally:
+        pipeline.close()
+
+
+def test_segments_generated_ahead_in_order():
+    mock = ThreadRecordingTranslator()
+    texts = ["One.", "Two.", "Three.", "Four."]
+    pipeline = SegmentPipeline(mock, _planned(texts), lookahead=2, **KWARGS).start()
+    
+    assert _run(pipeline, texts) == ["[TR:One.]", "[TR:Two.]", "[TR:Three.]", "[TR:Four.]"]
+    assert mock.source_texts == texts
+    assert set(mock.threads) == {"scitrans_generate_ahead"}
+    assert pipeline.hits == 4
+
+
+def test_skipped_segments_never_generated():
+    mock = ThreadRecordingTranslator()
+    pipeline = SegmentPipeline(mock, [("One.", 0), ("Two.", 2), ("Three.", 3), ("Five.", 1)], lookahead=1, **KWARGS).start()
+    
+    assert _run(pipeline, ["One.", "Five.", "Unplanned."]) == ["[TR:One.]", "[TR:Five.]", "[TR:Unplanned.]"]
+    assert "Three." not in mock.source_texts
+    assert mock.source_texts[-1] == "Unplanned."
+
+
+def test_generation_error_raised_at_its_segment():
+    mock = ThreadRecordingTranslator(fail_on="Two.")
+    pipeline = SegmentPipeline(mock, _planned(["One.", "Two.", "Three."]), lookahead=3, **KWARGS).start()
+    
+    assert pipeline.translate_with_best_model("One.", idx=0, **KWARGS)["translated_text"] == "[TR:One.]"
+    with pytest.raises(RuntimeError, match="model crashed"):
+        pipeline.translate_with_best_model("Two.", idx=1, **KWARGS)
+    pipeline.close()
+    assert "Three." not in mock.source_texts
+
+
+def test_pipelined_results_not_counted_as_cache_hits():
+    mock = ThreadRecordingTranslator()
+    pipeline = SegmentPipeline(mock, _planned(["One."]), **KWARGS).start()
+    progress = TranslationProgress(2)
+    try:
+        for i in range(2):
+            translate_with_progress(pipeline, progress, text="One.", idx=i, **KWARGS)
+    finally:
+        pipeline.close()
+    
+    assert progress.cache_hits == 1
+
+
+def test_other_arguments_translated_directly():
+    mock = ThreadRecordingTranslator()
+    pipeline = SegmentPipeline(mock, _planned(["One.", "Two."]), **KWARGS).start()
+    try:
+        first = pipeline.translate_with_best_model("One.", idx=0, **KWARGS)
+        second = pipeline.translate_with_best_model("Two.", idx=5, **KWARGS)
+    finally:
+        pipeline.close()
+    
+    assert first["translated_text"] == "[TR:One.]"
+    assert second["translated_text"] == "[TR:Two.]"
+    assert pipeline.hits == 1
+    assert mock.threads[-1] == threading.current_thread().name
+
+
+class BlockingTranslator(ThreadRecordingTranslator):
+    # Holds the first generate until released, recording what was preprocessed meanwhile
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+        self.prepared = []
+        self.prepared_ahead = threading.Event()
+    
+    def prepare_segment(self, text, source_lang="en", target_lang="fr"):
+        self.prepared.append(text)
+        if len(self.prepared) == 3:
+            self.prepared_ahead.set()
+    
+    def translate_with_best_model(self, text, *args, **kwargs):
+        self.release.wait(timeout=5)
+        return super().translate_with_best_model(text, *args, **kwargs)
+
+
+def test_preprocessing_runs_while_generation_blocked():
+    mock = BlockingTranslator()
+    texts = ["One.", "Two.", "Three.", "Four."]
+    kwargs = {**KWARGS, "use_find_replace": True}
+    pipeline = SegmentPipeline(mock, _planned(texts), lookahead=2, preprocess=True, **kwargs).start()
+    try:
+        assert mock.prepared_ahead.wait(timeout=5)
+        assert mock.source_texts == []
+        mock.release.set()
+        results = [pipeline.translate_with_best_model(text, idx=i, **kwargs)["translated_text"]
+                   for i, text in enumerate(texts)]
+    finally:
+        mock.release.set()
+        pipeline.close()
+    
+    assert results == ["[TR:One.]", "[TR:Two.]", "[TR:Three.]", "[TR:Four.]"]
+    assert mock.prepared[:3] == ["One.", "Two.", "Three."]
+
+
+def test_preprocessed_segment_picked_up_once(stub_manager, mocker):
+    stub_manager.loaded_models = {"model_a": EchoModel()}
+    preprocess = mocker.patch.object(stub_manager, "preprocess_text", return_value=("Le MPO.", {}))
+    
+    stub_manager.prepare_segment("Le MPO.", source_lang="fr", target_lang="en")
+    stub_manager.translate_with_all_models("Le MPO.", source_lang="fr", target_lang="en", use_find_replace=True)
+    
+    assert preprocess.call_count == 1
+    assert stub_manager.preprocess_cache == {}
+
+
+def _add_smart_tag_paragraph(doc, before, tagged, after):
+    # Smart tag runs are not part of paragraph.text until the walk unwraps them
+    paragraph = doc.add_paragraph(before)
+    smart_tag = OxmlElement('w:smartTag')
+    smart_tag.append(doc.add_paragraph(tagged).runs[0]._element)
+    doc.paragraphs[-1]._element.getparent().remove(doc.paragraphs[-1]._element)
+    paragraph._element.append(smart_tag)
+    paragraph.add_run(after)
+
+
+class IdxRecordingTranslator(MockTranslator):
+    def __init__(self):
+        super().__init__()
+        self.threads = []
+    
+    def translate_with_best_model(self, text, source_lang, target_lang, use_find_replace, idx, **kwargs):
+        result = super().translate_with_best_model(text, source_lang, target_lang, use_find_replace, idx)
+        self.source_texts[-1] = (text, idx)
+        self.threads.append(threading.current_thread().name)
+        return result
+
+
+def test_word_document_output_matches_serial_run(tmp_path):
+    input_path = str(tmp_path / 'input.docx')
+    doc = Document()
+    doc.add_paragraph("Recruitment was low. Fishing mortality remains below the reference point.")
+    doc.add_paragraph("Header left\tHeader right")
+    doc.add_paragraph("12.5")
+    _add_smart_tag_paragraph(doc, "Catches in ", "Nova Scotia", " rose sharply this year.")
+    doc.add_table(rows=1, cols=2).rows[0].cells[1].text = "Mean catch per unit effort by area"
+    doc.save(input_path)
+    
+    outputs = []
+    calls = []
+    for pipeline in (False, True):
+        mock = IdxRecordingTranslator()
+        output_path = translate_word_document(
+            input_docx_file=input_path, output_docx_file=str(tmp_path / f'output_{pipeline}.docx'), source_lang="en",
+            translation_manager=mock, pipeline=pipeline
+        )
+        outputs.append([p.text for p in Document(output_path).paragraphs])
+        calls.append(mock.source_texts)
+    
+    assert outputs[0] == outputs[1]
+    assert calls[0] == calls[1]
+    assert "Catches in Nova Scotia rose sharply this year." in [text for text, _idx in calls[1]]
+
+
+def test_txt_document_output_matches_serial_run(tmp_path):
+    input_path = tmp_path / 'input.txt'
+    input_path.write_text(
+        "Recruitment was low. Fishing mortality remains below the reference point.\n\n"
+        "Catches rose sharply this year.\n\nRecruitment was low.", encoding='utf-8'
+    )
+    
+    outputs = []
+    calls = []
+    for pipeline in (False, True):
+        mock = IdxRecordingTranslator()
+        output_path = tmp_path / f'output_{pipeline}.txt'
+        translate_txt_document(
+            str(input_path), output_text_file=str(output_path), source_lang="en", translation_manager=mock,
+            start_idx=10, pipeline=pipeline, use_find_replace=False, bypass_rules=False, corpus_lookup=False
+        )
+        outputs.append(output_path.read_text(encoding='utf-8'))
+        calls.append(mock.source_texts)
+    
+    assert outputs[0] == outputs[1]
+    assert calls[0] == calls[1]
+    assert calls[1][0] == ("Recruitment was low.", 11)
+    # Only the repeated first sentence is left to the walk
+    assert set(mock.threads[:-1]) == {"scitrans_generate_ahead"}
+    assert mock.threads[-1] == threading.current_thread().name
@@ -0,0 +1,130 @@
+import pytest
+
+from scitrans.quality_evaluation.placeholder_benchmark import (
+    benchmark_placeholder_schemes, summarize_placeholder_benchmark
+)
+from scitrans.rules_based_replacements.replacements import PlaceholderScheme, restore_tokens, scan_tokens
+from scitrans.translate.models import BaseTranslationModel
+
+
+class WordTokenizer:
+    # Known words are one id each; anything else is spelled out character by character
+    unk_token_id = 0
+    
+    def __init__(self, words):
+        self.pieces = ["<unk>"] + list(words)
+        self.ids = {piece: i for i, piece in enumerate(self.pieces)}
+    
+    def __call__(self, text, add_special_tokens=True):
+        ids = []
+        for word in text.split():
+            if word in self.ids:
+                ids.append(self.ids[word])
+            else:
+                ids.extend(self.ids.get(char, self.unk_token_id) for char in word)
+        return {"input_ids": ids}
+    
+    def decode(self, ids, skip_special_tokens=False):
+        return "".join(self.pieces[i] for i in ids)
+
+
+SENTINELS = ["Ω", "Δ", "Σ"]
+TOKENIZER = WordTokenizer(SENTINELS + list("ACRONYM0123456789") + ["Le", "publie."])
+
+
+class SentinelModel(BaseTranslationModel):
+    # Copies sentinels through but lower-cases category tokens, as the subword models tend to
+    def __init__(self):
+        super().__init__("sentinel-model")
+        self.inputs = []
+    
+    def tokenizer_for(self, input_language="en", target_language="fr"):
+        return TOKENIZER
+    
+    def count_tokens(self, input_text, input_language="en", target_language="fr"):
+        return len(TOKENIZER(input_text)["input_ids"])
+    
+    def translate_text(self, input_text, input_language="en", target_language="fr", generation_kwargs=None):
+        self.inputs.append(input_text)
+        return input_text.replace("ACRONYM", "acronym")
+
+
+MAPPING = {
+    "ACRONYM0001": {"original_text": "MPO", "category": "acronym", "translation": "DFO", "should_translate": True},
+    "NAME0001": {"original_text": "Smith", "category": "name", "translation": None, "should_translate": False},
+}
+PREFERENTIAL_DICT = {'translations': {'acronym': {'MPO': 'DFO'}}}
+
+
+@pytest.fixture
+def sentinel_config(mocker):
+    mocker.patch.dict("scitrans.config.PLACEHOLDER_CONFIG", {"scheme": "auto", "sentinels": SENTINELS + ["§"], "min_sentinels": 2})
+
+
+def test_only_single_subword_candidates_used(sentinel_config):
+    scheme = PlaceholderScheme.for_tokenizer(TOKENIZER)
+    
+    assert scheme.name == "sentinel"
+    assert scheme.sentinels == SENTINELS
+    assert PlaceholderScheme.for_tokenizer(TOKENIZER, min_sentinels=4).name == "category"
+
+
+def test_tokens_renamed_and_restored():
+    scheme = PlaceholderScheme("sentinel", SENTINELS)
+    
+    text, mapping = scheme.apply("ACRONYM0001 and NAME0001 (Ω = 2)", MAPPING)
+    
+    assert text == "Δ and Σ (Ω = 2)"
+    assert mapping == {"Δ": MAPPING["ACRONYM0001"], "Σ": MAPPING["NAME0001"]}
+    assert restore_tokens("Δ et Σ (Ω = 2)", mapping) == ("DFO et Smith (Ω = 2)", [], [])
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Les Ωs ont", {"Ω": (4, 6)}),
+    ("deΩ a", {"Ω": (2, 3)}),
+    ("ΩΔ", {"Ω": (0, 1), "Δ": (1, 2)}),
+], ids=["plural", "attached", "adjacent"])
+def test_sentinel_forms_found(text, expected):
+    assert scan_tokens(text, ["Ω", "Δ"]) == (expected, [])
+
+
+def test_sentinel_plural_restored():
+    mapping = {"Ω": MAPPING["ACRONYM0001"]}
+    
+    assert restore_tokens("Les Ωs ont", mapping) == ("Les DFO ont", [], [])
+
+
+def test_segment_with_too_many_tokens_keeps_category_tokens():
+    scheme = PlaceholderScheme("sentinel", ["Ω"])
+    
+    assert scheme.apply("ACRONYM0001 and NAME0001", MAPPING) == ("ACRONYM0001 and NAME0001", MAPPING)
+
+
+def test_each_model_translates_with_its_own_scheme(stub_manager, sentinel_config):
+    stub_manager.loaded_models = {"model_a": SentinelModel()}
+    
+    result = stub_manager.translate_with_all_models(
+        "Le MPO publie.", source_lang="fr", target_lang="en", use_find_replace=True, preferential_dict=PREFERENTIAL_DICT
+    )
+    
+    assert stub_manager.loaded_models["model_a"].inputs == ["Le Ω publie."]
+    assert result["best_model"]["translated_text"] == "Le DFO publie."
+    assert result["best_model"]["retry_attempts"] == 0
+
+
+def test_benchmark_compares_schemes(stub_manager, sentinel_config, mocker):
+    stub_manager.loaded_models = {"model_a": SentinelModel()}
+    samples = [{"source": "Le MPO publie.", "source_lang": "fr"}, {"source": "Rien à protéger.", "source_lang": "fr"}]
+    mocker.patch.object(stub_manager, "preprocess_text", side_effect=lambda text, source_lang, target_lang: (
+        ("Le ACRONYM0001 publie.", {"ACRONYM0001": MAPPING["ACRONYM0001"]}) if "MPO" in text else (text, {})
+    ))
+    
+    results = benchmark_placeholder_schemes(stub_manager, samples)
+    summary = summarize_placeholder_benchmark(results)
+    
+    assert list(results["applied_scheme"]) == ["category", "sentinel"]
+    assert summary.loc[("model_a", "category"), "retry_rate"] == 1.0
+    assert summary.loc[("model_a", "category"), "find_replace_error_rate"] == 1.0
+    assert summary.loc[("model_a", "auto"), "find_replace_error_rate"] == 0.0
+    assert summary.loc[("model_a", "auto"), "mean_input_tokens"] < summary.loc[("model_a", "category"), "mean_input_tokens"]
+    assert stub_manager.placeholder_scheme is None
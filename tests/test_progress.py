@@ -0,0 +1,130 @@
+from docx import Document
+
+from scitrans.translate.progress import AliveProgressRenderer, TranslationProgress, translate_with_progress
+from scitrans.translate.txt_document import translate_txt_document
+from scitrans.translate.word_document import translate_word_document
+from tests.conftest import MockTranslator
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+    
+    def __call__(self):
+        return self.now
+
+
+class CachingMockTranslator(MockTranslator):
+    def __init__(self):
+        super().__init__()
+        self.translation_cache = {}
+    
+    def translate_with_best_model(self, text, source_lang, target_lang, use_find_replace, idx, use_cache=True, **kwargs):
+        if use_cache and text in self.translation_cache:
+            return self.translation_cache[text]
+        result = super().translate_with_best_model(text, source_lang, target_lang, use_find_replace, idx, **kwargs)
+        result.update({"best_model_source": "opus_mt_base", "retry_attempts": 1})
+        self.translation_cache[text] = result
+        return result
+
+
+class TestTranslationProgress:
+    def test_rate_and_eta(self):
+        clock = FakeClock()
+        events = []
+        progress = TranslationProgress(4, callback=events.append, clock=clock)
+        progress.start()
+        
+        clock.now = 2.0
+        progress.update({"best_model_source": "m2m100_418m", "retry_attempts": 2})
+        progress.update(cached=True)
+        
+        assert events[0]["event"] == "start"
+        last = events[-1]
+        assert (last["done"], last["total"], last["cache_hits"]) == (2, 4, 1)
+        assert last["segments_per_sec"] == 1.0
+        assert last["eta_seconds"] == 2.0
+        assert (last["model"], last["retries"]) == ("m2m100_418m", 2)
+    
+    def test_skipped_segments_excluded_from_rate(self):
+        clock = FakeClock()
+        progress = TranslationProgress(10, clock=clock)
+        progress.start()
+        
+        clock.now = 4.0
+        progress.skip(6)
+        progress.update()
+        progress.update()
+        
+        snapshot = progress.snapshot()
+        assert snapshot["reused"] == 6
+        assert snapshot["segments_per_sec"] == 0.5
+        assert snapshot["eta_seconds"] == 4.0
+    
+    def test_finish_completes_total_only_on_success(self):
+        events = []
+        progress = TranslationProgress(3, callback=events.append)
+        progress.start()
+        progress.update()
+        progress.finish(completed=False)
+        assert events[-1]["done"] == 1
+        
+        progress.finish()
+        assert (events[-1]["event"], events[-1]["done"], events[-1]["reused"]) == ("finish", 3, 2)
+    
+    def test_cache_hits_detected(self):
+        mock = CachingMockTranslator()
+        progress = TranslationProgress(2)
+        for _ in range(2):
+            translate_with_progress(mock, progress, text="Stock status.", source_lang="en", target_lang="fr",
+                                    use_find_replace=False, idx=1, use_cache=True)
+        
+        assert progress.cache_hits == 1
+        assert progress.model == "opus_mt_base"
+    
+    def test_alive_renderer_runs_to_completion(self):
+        progress = TranslationProgress(2, callback=AliveProgressRenderer(force_tty=False), title="doc")
+        progress.start()
+        progress.update({"best_model_source": "opus_mt_base"})
+        progress.update()
+        progress.finish()
+
+
+def test_word_document_progress_events(tmp_path):
+    input_path = str(tmp_path / 'input.docx')
+    doc = Document()
+    doc.add_paragraph("Recruitment has been low. Fishing mortality remains below the reference point.")
+    doc.add_paragraph("Recruitment has been low.")
+    cells = doc.add_table(rows=1, cols=3).rows[0].cells
+    cells[0].text = "12.5"
+    cells[1].text = "Area"
+    cells[2].text = "Mean catch per unit effort by area"
+    doc.save(input_path)
+    
+    events = []
+    translate_word_document(
+        input_docx_file=input_path, output_docx_file=str(tmp_path / 'output.docx'), source_lang="en",
+        translation_manager=CachingMockTranslator(), progress=events.append
+    )
+    
+    # Numeric and short cells are filled without the models and are not counted
+    assert [e["event"] for e in events] == ["start", "segment", "segment", "segment", "segment", "finish"]
+    assert events[0]["total"] == 4
+    assert events[-2]["cache_hits"] == 1
+    assert events[-2]["done"] == 4
+    assert (events[-1]["done"], events[-1]["reused"]) == (4, 0)
+
+
+def test_txt_document_progress_events(tmp_path):
+    input_path = tmp_path / 'input.txt'
+    input_path.write_text("Recruitment has been low.\n\nFishing mortality remains low.\n", encoding='utf-8')
+    
+    events = []
+    translate_txt_document(
+        input_text_file=str(input_path), source_lang="en", use_find_replace=False,
+        translation_manager=MockTranslator(), progress=events.append
+    )
+    
+    assert events[0]["event"] == "start"
+    assert events[-1]["event"] == "finish"
+    assert events[-1]["done"] == events[-1]["total"] == events[0]["total"]
@@ -0,0 +1,109 @@
+import pytest
+from docx import Document
+
+from scitrans.translate.references import ReferenceSections, is_reference_entry
+from scitrans.translate.word_document import translate_word_document
+from tests.conftest import MockTranslator
+
+REFERENCES = [
+    "DFO. 2019. Stock assessment of Atlantic herring. DFO Can. Sci. Advis. Sec. Sci. Advis. Rep. 2019/001.",
+    "Smith, J.A., and Lee, C. 2018. Recruitment dynamics. In: Fisheries science. Edited by K. Brown. pp. 12–30.",
+    "Tremblay, M. In press. Growth of lobster larvae. Can. J. Fish. Aquat. Sci.",
+]
+
+
+def _build_document(paragraphs):
+    doc = Document()
+    for text, style in paragraphs:
+        doc.add_paragraph(text, style=style)
+    return doc
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Smith, J.A., Brown, K., and Lee, C. 2019. Title. J. Fish. 12: 3–4.", True),
+    ("DFO. 2019. Stock assessment. Res. Doc. 2019/001.", True),
+    ("Dupont, M. et Roy, P. 2018. Titre.", True),
+    ("Brown, K. (2020) Title.", True),
+    ("Smith et al. (2019) showed that recruitment declined.", False),
+    ("The stock declined. 2019 was a poor year.", False),
+])
+def test_reference_entry_shape(text, expected):
+    assert is_reference_entry(text) == expected
+
+
+def test_section_runs_from_heading_to_next_heading():
+    doc = _build_document([
+        ("Recruitment was low.", None),
+        ("References cited", "Heading 1"),
+        *((text, None) for text in REFERENCES),
+        ("Appendix 1", "Heading 1"),
+        ("Survey stations were fixed.", None),
+    ])
+    
+    sections = ReferenceSections.detect(doc, "en")
+    
+    assert sorted(sections.paragraph_indices) == [2, 3, 4]
+
+
+def test_unheaded_run_of_entries_detected():
+    doc = _build_document([
+        ("Recruitment was low.", None),
+        *((text, None) for text in REFERENCES[:2]),
+        ("Smith, J.A. 2017. Another report. Res. Doc. 2017/002.", None),
+        ("Survey stations were fixed.", None),
+    ])
+    
+    sections = ReferenceSections.detect(doc, "en", min_entry_run=3)
+    
+    assert sorted(sections.paragraph_indices) == [1, 2, 3]
+
+
+def test_isolated_entry_shape_left_for_translation():
+    doc = _build_document([(REFERENCES[0], None), ("Survey stations were fixed.", None)])
+    
+    assert len(ReferenceSections.detect(doc, "en")) == 0
+
+
+def test_bibliography_style_detected():
+    doc = Document()
+    doc.styles.add_style('Bibliography', doc.styles['Normal'].type)
+    doc.add_paragraph("Recruitment was low.")
+    doc.add_paragraph("Anonymous report on herring", style='Bibliography')
+    
+    assert sorted(ReferenceSections.detect(doc, "en").paragraph_indices) == [1]
+
+
+def test_word_document_copies_references_through(tmp_path, capsys):
+    input_path = str(tmp_path / 'input.docx')
+    output_path = str(tmp_path / 'output.docx')
+    _build_document([
+        ("Recruitment was low.", None),
+        ("References cited", "Heading 1"),
+        *((text, None) for text in REFERENCES),
+    ]).save(input_path)
+    mock = MockTranslator()
+    
+    translate_word_document(
+        input_docx_file=input_path, output_docx_file=output_path, source_lang="en",
+        translation_manager=mock, bypass_rules=False, skip_references=True
+    )
+    
+    assert mock.source_texts == ["Recruitment was low.", "References cited"]
+    texts = [p.text for p in Document(output_path).paragraphs]
+    assert texts[2] == REFERENCES[0]
+    assert "Dans : Fisheries science" in texts[3]
+    assert texts[4].startswith("Tremblay, M. Sous presse.")
+    assert "Copied 3 reference paragraphs untranslated (2 rule-based token replacements)" in capsys.readouterr().out
+
+
+def test_word_document_translates_references_when_disabled(tmp_path):
+    input_path = str(tmp_path / 'input.docx')
+    _build_document([("References", "Heading 1"), (REFERENCES[0], None)]).save(input_path)
+    mock = MockTranslator()
+    
+    translate_word_document(
+        input_docx_file=input_path, output_docx_file=str(tmp_path / 'output.docx'), source_lang="en",
+        translation_manager=mock, bypass_rules=False, skip_references=False
+    )
+    
+    assert len(mock.source_texts) > 1
@@ -1,4 +1,5 @@
 import pytest
+from types import SimpleNamespace
 from unittest.mock import patch
 
 from scitrans.rules_based_replacements.token_utils import (
@@ -10,6 +11,9 @@ from scitrans.rules_based_replacements.token_utils import (
     get_search_patterns,
 )
 from scitrans.rules_based_replacements.replacements import (
+    clear_person_name_cache,
+    detect_person_names,
+    prefetch_person_names,
     replace_whole_word,
     find_translation_matches,
     preprocess_for_translation,
@@ -17,7 +21,11 @@ from scitrans.rules_based_replacements.replacements import (
     find_corrupted_token,
     postprocess_translation,
     validate_tokens_replaced,
+    restore_tokens,
+    scan_tokens,
 )
+from scitrans.rules_based_replacements.glossary_matcher import GlossaryMatcher
+from scitrans.rules_based_replacements.glossary_store import get_glossary_matcher
 from scitrans.rules_based_replacements.preferential_translations import (
     apply_preferential_translations,
     reverse_preferential_translations,
@@ -312,6 +320,119 @@ class TestPreprocessEnglishSource:
         assert mapping[token]['category'] == 'taxon'
 
 
+# ---------------------------------------------------------------------------
+# glossary_matcher — compiled matcher used by preprocess_for_translation
+# ---------------------------------------------------------------------------
+
+class TestGlossaryMatcher:
+    def test_longest_term_wins_within_category(self):
+        translations = {'nomenclature': {'surveillance': 'monitoring', 'surveillance acoustique': 'acoustic monitoring'}}
+        matcher = GlossaryMatcher(translations, source_lang='fr')
+        
+        matches = matcher.find_matches("la surveillance acoustique")
+        
+        assert [(start, end, entry['term']) for start, end, entry in matches] == [(3, 26, 'surveillance acoustique')]
+    
+    def test_earlier_category_wins_overlap(self):
+        translations = {
+            'taxon': {'Morue': 'Cod'},
+            'nomenclature': {'Morue franche': 'Atlantic Cod'},
+        }
+        matcher = GlossaryMatcher(translations, source_lang='fr')
+        
+        matches = matcher.find_matches("la Morue franche")
+        
+        assert [entry['category'] for _, _, entry in matches] == ['taxon']
+    
+    def test_single_word_term_requires_word_boundary(self):
+        matcher = GlossaryMatcher({'acronym': {'RAA': 'AAR'}}, source_lang='fr')
+        assert matcher.find_matches("ABRAA et RAAB") == []
+        assert len(matcher.find_matches("le RAA, ici")) == 1
+    
+    def test_case_insensitive_reverse_lookup(self):
+        matcher = GlossaryMatcher({'site': {'Mont Turbulent': 'Mount Turbulent'}}, source_lang='fr')
+        
+        (_, _, entry), = matcher.find_matches("près du MONT TURBULENT")
+        
+        assert entry['translation'] == 'Mount Turbulent'
+    
+    def test_matcher_cached_per_glossary_and_language(self, old_format_with_metadata):
+        fr_matcher = get_glossary_matcher(old_format_with_metadata, 'fr')
+        
+        assert get_glossary_matcher(old_format_with_metadata, 'fr') is fr_matcher
+        assert get_glossary_matcher(old_format_with_metadata, 'en') is not fr_matcher
+    
+    @patch('scitrans.rules_based_replacements.replacements.detect_person_names')
+    def test_names_use_original_offsets_after_term_replacement(self, mock_names, old_format_with_metadata):
+        text = "RAA selon Jean Dupont."
+        mock_names.return_value = [(10, 21, 'Jean Dupont')]
+        
+        result, mapping = preprocess_for_translation(text, old_format_with_metadata, source_lang='fr')
+        
+        assert result == "ACRONYM0001 selon NAME0001."
+        assert mapping['NAME0001']['original_text'] == 'Jean Dupont'
+
+
+# ---------------------------------------------------------------------------
+# replacements — detect_person_names / prefetch_person_names
+# ---------------------------------------------------------------------------
+
+class FakeNerPipeline:
+    def __init__(self):
+        self.single_calls = 0
+        self.pipe_batches = []
+    
+    def _doc(self, text):
+        start = text.find('Jean Dupont')
+        ents = [SimpleNamespace(start_char=start, end_char=start + 11, text='Jean Dupont', label_='PER')] if start >= 0 else []
+        return SimpleNamespace(ents=ents)
+    
+    def __call__(self, text):
+        self.single_calls += 1
+        return self._doc(text)
+    
+    def pipe(self, texts, batch_size=64, n_process=1):
+        self.pipe_batches.append(list(texts))
+        return (self._doc(text) for text in texts)
+
+
+@pytest.fixture
+def fake_ner():
+    nlp = FakeNerPipeline()
+    clear_person_name_cache()
+    with patch('scitrans.rules_based_replacements.replacements._load_ner_model', return_value=nlp):
+        yield nlp
+    clear_person_name_cache()
+
+
+class TestPersonNameDetection:
+    def test_detects_person_spans(self, fake_ner):
+        assert detect_person_names("Selon Jean Dupont.", 'fr') == [(6, 17, 'Jean Dupont')]
+    
+    def test_repeated_text_runs_ner_once(self, fake_ner):
+        detect_person_names("Selon Jean Dupont.", 'fr')
+        detect_person_names("Selon Jean Dupont.", 'fr')
+        assert fake_ner.single_calls == 1
+    
+    def test_prefetch_batches_unique_segments(self, fake_ner):
+        texts = ["Selon Jean Dupont.", "Rien ici.", "Selon Jean Dupont.", "  "]
+        
+        count = prefetch_person_names(texts, 'fr')
+        
+        assert count == 2
+        assert fake_ner.pipe_batches == [["Selon Jean Dupont.", "Rien ici."]]
+    
+    def test_prefetched_segments_skip_single_calls(self, fake_ner):
+        prefetch_person_names(["Selon Jean Dupont.", "Rien ici."], 'fr')
+        
+        assert detect_person_names("Selon Jean Dupont.", 'fr') == [(6, 17, 'Jean Dupont')]
+        assert detect_person_names("Rien ici.", 'fr') == []
+        assert fake_ner.single_calls == 0
+    
+    def test_unsupported_language_returns_empty(self):
+        assert detect_person_names("Hallo Welt", 'de') == []
+
+
 # ---------------------------------------------------------------------------
 # replacements — postprocess_translation
 # ---------------------------------------------------------------------------
@@ -411,6 +532,64 @@ class TestValidateTokensReplaced:
         assert validate_tokens_replaced('still has NOMENCLATURE0001', mapping) is False
 
 
+# ---------------------------------------------------------------------------
+# replacements — scan_tokens / restore_tokens
+# ---------------------------------------------------------------------------
+
+def _mapping(*tokens):
+    return {
+        token: {'original_text': 'RAA', 'category': 'acronym', 'translation': 'AAR', 'should_translate': True}
+        for token in tokens
+    }
+
+
+class TestScanTokens:
+    def test_finds_every_form_in_one_pass(self):
+        found, leftover = scan_tokens('ACRONYM0001, ACRONYM 0002 and ACRONYM0003s', _mapping(
+            'ACRONYM0001', 'ACRONYM0002', 'ACRONYM0003'
+        ))
+        assert found == {'ACRONYM0001': (0, 11), 'ACRONYM0002': (13, 25), 'ACRONYM0003': (30, 42)}
+        assert leftover == []
+    
+    def test_exact_form_preferred_over_earlier_plural(self):
+        found, leftover = scan_tokens('ACRONYM0001s then ACRONYM0001', ['ACRONYM0001'])
+        assert found == {'ACRONYM0001': (18, 29)}
+        assert leftover == ['ACRONYM0001']
+    
+    def test_unbounded_token_is_leftover_not_found(self):
+        found, leftover = scan_tokens('XACRONYM0001 ACRONYM00012', ['ACRONYM0001'])
+        assert found == {}
+        assert leftover == ['ACRONYM0001']
+
+
+class TestRestoreTokens:
+    def test_reports_missing_tokens(self):
+        text, missing, leftover = restore_tokens('ACRONYM0001 only', _mapping('ACRONYM0001', 'ACRONYM0002'))
+        assert text == 'AAR only'
+        assert missing == ['ACRONYM0002']
+        assert leftover == []
+    
+    def test_duplicate_token_replaced_once(self):
+        text, missing, leftover = restore_tokens('ACRONYM0001 and ACRONYM0001', _mapping('ACRONYM0001'))
+        assert text == 'AAR and ACRONYM0001'
+        assert missing == []
+        assert leftover == ['ACRONYM0001']
+    
+    def test_sentence_start_follows_restored_text(self):
+        mapping = {
+            'NOMENCLATURE0001': {
+                'original_text': 'surveillance', 'category': 'nomenclature',
+                'translation': 'monitoring', 'should_translate': True,
+            },
+        }
+        text, _, _ = restore_tokens('Done. NOMENCLATURE0001 follows.', mapping)
+        assert text == 'Done. Monitoring follows.'
+    
+    def test_replacement_text_is_literal(self):
+        mapping = {'NAME0001': {'original_text': r'A\1', 'category': 'name', 'translation': None, 'should_translate': False}}
+        assert restore_tokens('NAME0001 wrote.', mapping)[0] == r'A\1 wrote.'
+
+
 # ---------------------------------------------------------------------------
 # replacements — find_translation_matches
 # ---------------------------------------------------------------------------
@@ -0,0 +1,141 @@
+import pytest
+from docx import Document
+
+from scitrans.create_training_data.language_classifier.language_classifier import LanguageClassifier
+from scitrans.translate.segment_classifier import SegmentClassifier, translate_segment
+from scitrans.translate.word_document import translate_word_document
+from tests.conftest import MockTranslator
+
+WORD_LISTS = {"stock", "assessment", "table", "data", "analysis", "since"}
+
+
+@pytest.fixture
+def en_classifier():
+    return SegmentClassifier(
+        "en", glossary={"DFO": "MPO"}, scientific_names=["Homarus americanus", "Clupea pallasii"],
+        word_lists=WORD_LISTS
+    )
+
+
+@pytest.mark.parametrize("text, expected_class, expected", [
+    ("12.5", "numeric", "12,5"),
+    ("2019", "numeric", "2019"),
+    ("10–15 mm", "range", "10–15\u00a0mm"),
+    ("1500 kg", "measurement", "1\u00a0500\u00a0kg"),
+    ("https://doi.org/10.1139/f2012-001", "url", "https://doi.org/10.1139/f2012-001"),
+    ("Table 2.", "label", "Tableau 2."),
+    ("Figure 3", "label", "Figure 3"),
+    ("(Smith et al. 2019; Brown and Lee 2020a)", "citation", "(Smith et al. 2019; Brown et Lee 2020a)"),
+    ("Clupea harengus", "species", "Clupea harengus"),
+    ("Homarus americanus", "species", "Homarus americanus"),
+    ("Sebastes spp.", "species", "Sebastes spp."),
+    ("DFO", "glossary", "MPO"),
+], ids=["numeric", "year", "range", "measurement", "doi", "table_label", "figure_label", "citation",
+        "binomial", "known_taxon", "spp", "glossary"])
+def test_bypassed_classes(en_classifier, text, expected_class, expected):
+    assert en_classifier.classify(text) == (expected_class, expected)
+
+
+@pytest.mark.parametrize("text", [
+    "Stock assessment", "Data analysis", "In 2019", "Since 2015",
+    "Recruitment has been low since 2015.", "Figure 3 shows the study area.", "Smith 2019", "(Autumn 2018)",
+    "Stock status", "Census bonus", "Gadus morhua",
+])
+def test_sentences_go_to_models(en_classifier, text):
+    assert en_classifier.classify(text) == (None, None)
+
+
+def test_french_source_labels_and_citations():
+    classifier = SegmentClassifier("fr", word_lists=WORD_LISTS)
+    
+    assert classifier.classify("Tableau 4.") == ("label", "Table 4.")
+    assert classifier.classify("Dupont et Roy 2018") == ("citation", "Dupont and Roy 2018")
+    assert classifier.classify("Julia et al. 2019") == ("citation", "Julia et al. 2019")
+    assert classifier.classify("(Julia et al. 2019; Dupont et Roy sous presse)") == (
+        "citation", "(Julia et al. 2019; Dupont and Roy in press)"
+    )
+    assert classifier.classify("Automne 2018") == (None, None)
+    assert classifier.classify("12,5 %") == ("numeric", "12.5%")
+
+
+def test_translate_segment_counts_bypasses(en_classifier):
+    mock = MockTranslator()
+    
+    bypassed = translate_segment(mock, " 12.5 ", classifier=en_classifier, source_lang="en", target_lang="fr",
+                                 use_find_replace=False, idx=1)
+    modelled = translate_segment(mock, "Recruitment was low.", classifier=en_classifier, source_lang="en",
+                                 target_lang="fr", use_find_replace=False, idx=2)
+    
+    assert bypassed["translated_text"] == " 12,5 "
+    assert modelled["translated_text"] == "[TR:Recruitment was low.]"
+    assert mock.source_texts == ["Recruitment was low."]
+    assert en_classifier.stats() == {"numeric": 1}
+
+
+def test_word_document_bypasses_label_segments(tmp_path, capsys):
+    input_path = str(tmp_path / 'input.docx')
+    output_path = str(tmp_path / 'output.docx')
+    doc = Document()
+    doc.add_paragraph("Table 1. Summary of results from the survey.")
+    doc.add_paragraph("https://www.dfo-mpo.gc.ca/csas-sccs/")
+    doc.save(input_path)
+    mock = MockTranslator()
+    
+    translate_word_document(
+        input_docx_file=input_path, output_docx_file=output_path, source_lang="en",
+        translation_manager=mock, bypass_rules=True
+    )
+    
+    assert mock.source_texts == ["Summary of results from the survey."]
+    assert [p.text for p in Document(output_path).paragraphs] == [
+        "Tableau 1. [TR:Summary of results from the survey.]", "https://www.dfo-mpo.gc.ca/csas-sccs/"
+    ]
+    assert "Bypassed the models for 2 segments (label=1, url=1)" in capsys.readouterr().out
+
+
+@pytest.fixture(scope="module")
+def language_classifier():
+    return LanguageClassifier()
+
+
+@pytest.mark.parametrize("source_lang, text, expected_class", [
+    ("en", "Les données de relevé indiquent une baisse de l'abondance.", "target_language"),
+    ("en", "The survey data indicate a decline in abundance.", None),
+    ("en", "The Plan de gestion intégrée des pêches was adopted.", None),
+    ("en", "Sommaire de la réunion", None),
+    ("fr", "The survey data indicate a decline in abundance.", "target_language"),
+], ids=["french_in_english", "english_source", "mixed", "too_few_words", "english_in_french"])
+def test_target_language_segments(language_classifier, source_lang, text, expected_class):
+    classifier = SegmentClassifier(source_lang, language_classifier=language_classifier)
+    
+    name, translated = classifier.classify(text)
+    
+    assert name == expected_class
+    assert translated == (text if expected_class else None)
+
+
+def test_target_language_threshold(language_classifier):
+    text = "The Plan de gestion intégrée des pêches was adopted."
+    classifier = SegmentClassifier("en", language_classifier=language_classifier, language_threshold=0.7)
+    
+    assert classifier.classify(text) == ("target_language", text)
+
+
+def test_word_document_passes_target_language_quotes_through(tmp_path, capsys):
+    input_path = str(tmp_path / 'input.docx')
+    output_path = str(tmp_path / 'output.docx')
+    quote = "Les données de relevé indiquent une baisse de l'abondance."
+    doc = Document()
+    doc.add_paragraph("Recruitment was low.")
+    doc.add_paragraph(quote)
+    doc.save(input_path)
+    mock = MockTranslator()
+    
+    translate_word_document(
+        input_docx_file=input_path, output_docx_file=output_path, source_lang="en",
+        translation_manager=mock, bypass_rules=True
+    )
+    
+    assert mock.source_texts == ["Recruitment was low."]
+    assert Document(output_path).paragraphs[1].text == quote
+    assert "target_language=1" in capsys.readouterr().out
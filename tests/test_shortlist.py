@@ -0,0 +1,142 @@
+import json
+
+import pytest
+import torch
+
+from scitrans import config
+from scitrans.quality_evaluation.shortlist_benchmark import benchmark_shortlist, summarize_shortlist_benchmark
+from scitrans.translate import shortlist
+from scitrans.translate.models import OpusTranslationModel
+from scitrans.translate.shortlist import LexicalShortlist, build_shortlist_table, shortlisted_output_layer
+
+PAIRS = [
+    ("the catch rose", "la prise a augmenté"),
+    ("the catch fell", "la prise a diminué"),
+    ("the effort rose", "l'effort a augmenté"),
+    ("the effort fell", "l'effort a diminué"),
+]
+
+
+class SplitTokenizer:
+    # Whitespace words as ids, with separate source and target vocabularies like Marian
+    all_special_ids = [0, 1]
+    
+    def __init__(self):
+        self.vocab = {}
+    
+    def _ids(self, text, prefix):
+        return [self.vocab.setdefault(f"{prefix}{word}", len(self.vocab) + 2) for word in text.split()]
+    
+    def __call__(self, text=None, text_target=None, add_special_tokens=True):
+        if text_target is not None:
+            return {"input_ids": self._ids(text_target, "tgt:")}
+        return {"input_ids": self._ids(text, "src:")}
+
+
+def _table(tokenizer, **settings):
+    settings = {"top_k": 2, "frequent_targets": 1, "min_cooccurrence": 2, **settings}
+    return build_shortlist_table(
+        PAIRS, lambda text: tokenizer(text)["input_ids"], lambda text: tokenizer(text_target=text)["input_ids"], **settings
+    )
+
+
+def test_targets_ranked_by_association():
+    tokenizer = SplitTokenizer()
+    table, frequent = _table(tokenizer)
+    source = lambda word: tokenizer(word)["input_ids"][0]
+    target = lambda word: tokenizer(text_target=word)["input_ids"][0]
+    
+    assert table[source("catch")] == [target("prise"), target("la")]
+    assert table[source("rose")] == [target("augmenté"), target("a")]
+    assert target("diminué") not in table[source("rose")]
+    assert target("a") in frequent
+
+
+def test_allowed_ids_cover_candidates_frequent_and_input_tokens():
+    shortlist_table = LexicalShortlist({5: [7, 8]}, frequent=[9], special_ids=[0, 1])
+    
+    allowed = shortlist_table.allowed_ids([5, 6], extra_ids=[12])
+    
+    assert allowed.tolist() == [0, 1, 5, 6, 7, 8, 9, 12]
+
+
+def test_output_layer_scores_only_allowed_tokens():
+    model = torch.nn.Module()
+    model.lm_head = torch.nn.Linear(4, 10)
+    model.get_output_embeddings = lambda: model.lm_head
+    model.set_output_embeddings = lambda layer: setattr(model, "lm_head", layer)
+    original = model.lm_head
+    hidden = torch.randn(2, 3, 4)
+    allowed = torch.tensor([1, 4, 7])
+    
+    with shortlisted_output_layer(model, allowed):
+        scores = model.lm_head(hidden)
+    
+    assert scores.shape == (2, 3, 10)
+    assert torch.allclose(scores[..., allowed], original(hidden)[..., allowed])
+    assert torch.isinf(scores[..., [0, 2, 3, 5, 6, 8, 9]]).all()
+    assert model.lm_head is original
+
+
+def test_int8_output_layer_shortlisted():
+    # The int8 execution profile quantizes the head, whose weight is then a method
+    model = torch.nn.Module()
+    model.lm_head = torch.ao.quantization.quantize_dynamic(
+        torch.nn.Sequential(torch.nn.Linear(4, 10)), {torch.nn.Linear}, dtype=torch.qint8
+    )[0]
+    model.get_output_embeddings = lambda: model.lm_head
+    model.set_output_embeddings = lambda layer: setattr(model, "lm_head", layer)
+    original = model.lm_head
+    hidden = torch.randn(2, 3, 4)
+    allowed = torch.tensor([1, 4, 7])
+    
+    with shortlisted_output_layer(model, allowed):
+        scores = model.lm_head(hidden)
+    
+    assert scores.shape == (2, 3, 10)
+    assert torch.allclose(scores[..., allowed], original(hidden)[..., allowed], atol=0.05)
+    assert torch.isinf(scores[..., [0, 2, 3, 5, 6, 8, 9]]).all()
+    assert model.lm_head is original
+
+
+def test_table_cached_until_corpus_changes(tmp_path, monkeypatch):
+    jsonl_path = tmp_path / "training_data.jsonl"
+    records = [{"source": source, "target": target, "source_lang": "en"} for source, target in PAIRS]
+    jsonl_path.write_text("\n".join(json.dumps(r, ensure_ascii=False) for r in records), encoding="utf-8")
+    monkeypatch.setitem(config.SHORTLIST_CONFIG, "top_k", 2)
+    built = []
+    real_build = shortlist.build_shortlist_table
+    monkeypatch.setattr(shortlist, "build_shortlist_table", lambda *args, **kwargs: built.append(1) or real_build(*args, **kwargs))
+    load = lambda: LexicalShortlist.load(SplitTokenizer(), "opus-mt-en-fr", "en", "fr", [jsonl_path], tmp_path / "cache")
+    
+    first = load()
+    second = load()
+    with open(jsonl_path, 'a', encoding='utf-8') as f:
+        f.write("\n" + json.dumps({"source": "the catch", "target": "la prise", "source_lang": "en"}))
+    load()
+    
+    assert len(built) == 2
+    assert second.table == first.table
+    assert LexicalShortlist.load(SplitTokenizer(), "opus-mt-en-fr", "en", "fr", [tmp_path / "missing.jsonl"]) is None
+
+
+class ShortlistModel(OpusTranslationModel):
+    # Drops the last word when shortlisting, like a rare target token that fell outside the list
+    def __init__(self):
+        super().__init__("Helsinki-NLP/opus-mt-en-fr")
+    
+    def translate_text(self, input_text, input_language="en", target_language="fr", generation_kwargs=None):
+        return input_text.rsplit(" ", 1)[0] if self.use_shortlist and input_text.count(" ") > 2 else input_text
+
+
+def test_benchmark_reports_agreement_with_full_decoding(stub_manager):
+    stub_manager.loaded_models = {"opus_mt_base": ShortlistModel()}
+    samples = [{"source": "Catch rose.", "source_lang": "en"}, {"source": "Effort fell in the north.", "source_lang": "en"}]
+    
+    results = benchmark_shortlist(stub_manager, samples)
+    summary = summarize_shortlist_benchmark(results)
+    
+    assert len(results) == 4
+    assert summary.loc[("opus_mt_base", True), "same_as_full_rate"] == 0.5
+    assert summary.loc[("opus_mt_base", False), "speedup"] == pytest.approx(1.0)
+    assert stub_manager.loaded_models["opus_mt_base"].use_shortlist is None
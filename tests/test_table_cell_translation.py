@@ -1,8 +1,9 @@
 from unittest.mock import patch
 from docx import Document
 import json
-from scitrans.translate.word_document import _translate_table_cell
+from scitrans.translate.word_document import _translate_table_cell, _find_preferential_match
 from scitrans.translate.word_notes import write_notes_json
+from scitrans.rules_based_replacements.token_utils import normalize_translations
 
 
 class MockTranslator:
@@ -303,6 +304,23 @@ class TestPreferentialTranslations:
                               preferential_dict=self._pref_dict())
         combined = "".join(r.text for r in cell.paragraphs[0].runs)
         assert combined == "Environnement"
+    
+    def test_lookup_index_built_once_per_glossary(self):
+        pref = self._pref_dict()
+        with patch("scitrans.translate.word_document.normalize_translations",
+                   wraps=normalize_translations) as spy:
+            for text in ["environnement", "ANALYSE", "Unknown"] * 20:
+                _find_preferential_match(text, "fr", pref)
+        assert spy.call_count == 1
+    
+    def test_first_usable_translation_wins(self):
+        pref = {
+            "translations": {
+                "a": {"Analyse": {"en": ""}},
+                "b": {"analyse": {"en": "Analysis"}},
+            }
+        }
+        assert _find_preferential_match("analyse", "en", pref) == "Analysis"
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,59 @@
+import pytest
+
+from tests.conftest import EchoModel
+
+PREFERENTIAL_DICT = {'translations': {'acronym': {'MPO': 'DFO'}}}
+
+
+@pytest.fixture
+def person_names(mocker):
+    return mocker.patch('scitrans.rules_based_replacements.replacements.detect_person_names', return_value=[])
+
+
+def _load_models(manager, n_models):
+    manager.loaded_models = {f"model_{i}": EchoModel() for i in range(n_models)}
+    return manager
+
+
+class TestSharedPreprocessing:
+    def test_preprocessing_runs_once_per_segment(self, stub_manager, person_names, mocker):
+        manager = _load_models(stub_manager, n_models=3)
+        spy = mocker.spy(manager, 'preprocess_text')
+        
+        results = manager.translate_with_all_models(
+            "Le MPO publie.", source_lang="fr", target_lang="en",
+            use_find_replace=True, preferential_dict=PREFERENTIAL_DICT
+        )
+        
+        assert spy.call_count == 1
+        assert person_names.call_count == 1
+        assert results['best_model']['translated_text'] == "Le DFO publie."
+    
+    def test_every_model_receives_tokenized_text(self, stub_manager):
+        manager = _load_models(stub_manager, n_models=2)
+        
+        manager.translate_with_all_models(
+            "Le MPO publie.", source_lang="fr", target_lang="en",
+            use_find_replace=True, preferential_dict=PREFERENTIAL_DICT
+        )
+        
+        for model in manager.loaded_models.values():
+            assert model.inputs == ["Le ACRONYM0001 publie."]
+    
+    def test_no_preprocessing_without_find_replace(self, stub_manager, mocker):
+        manager = _load_models(stub_manager, n_models=2)
+        preprocess = mocker.patch.object(manager, 'preprocess_text')
+        
+        manager.translate_with_all_models("Le MPO publie.", source_lang="fr", target_lang="en", use_find_replace=False)
+        
+        preprocess.assert_not_called()
+    
+    def test_translate_single_still_preprocesses_on_its_own(self, stub_manager):
+        manager = _load_models(stub_manager, n_models=1)
+        
+        result = manager.translate_single(
+            "Le MPO publie.", "model_0", source_lang="fr", target_lang="en",
+            use_find_replace=True, preferential_dict=PREFERENTIAL_DICT
+        )
+        
+        assert result['translated_text'] == "Le DFO publie."
@@ -0,0 +1,112 @@
+import json
+
+import pytest
+import torch
+from tokenizers import Tokenizer, decoders, pre_tokenizers
+from tokenizers.models import Unigram
+from transformers import M2M100Config, M2M100ForConditionalGeneration, MBartConfig, MBartForConditionalGeneration
+from transformers import PreTrainedTokenizerFast
+
+from scitrans import config
+from scitrans.model_finetuning.trim_vocab import (
+    TrimmedVocabTokenizer, collect_used_ids, trim_checkpoint, trim_model_vocabulary, trimmed_model_paths
+)
+from scitrans.translate.models import BaseTranslationModel, get_model_config
+
+PIECES = ["<s>", "<pad>", "</s>", "<unk>", "▁the", "▁catch", "▁catches", "es", "▁rose", "▁fell", "▁la", "▁prise",
+          "▁a", "▁augmenté", "▁der", "▁fang", "▁stieg", "▁", "c", "a", "t", "h", "e", "s", "r", "o"]
+TINY_MODEL = dict(
+    vocab_size=len(PIECES), d_model=16, encoder_layers=1, decoder_layers=1, encoder_attention_heads=2,
+    decoder_attention_heads=2, encoder_ffn_dim=32, decoder_ffn_dim=32, max_position_embeddings=64
+)
+
+
+def _tokenizer():
+    backend = Tokenizer(Unigram([(piece, -1.0 if piece.startswith("▁") else -3.0) for piece in PIECES], unk_id=3))
+    backend.pre_tokenizer = pre_tokenizers.Metaspace()
+    backend.decoder = decoders.Metaspace()
+    return PreTrainedTokenizerFast(
+        tokenizer_object=backend, bos_token="<s>", pad_token="<pad>", eos_token="</s>", unk_token="<unk>"
+    )
+
+
+@pytest.mark.parametrize("model_classes", [(M2M100Config, M2M100ForConditionalGeneration),
+                                           (MBartConfig, MBartForConditionalGeneration)])
+def test_trimmed_model_scores_kept_tokens_unchanged(model_classes):
+    config_class, model_class = model_classes
+    torch.manual_seed(0)
+    model = model_class(config_class(**TINY_MODEL)).eval()
+    if hasattr(model, "final_logits_bias"):
+        model.final_logits_bias.normal_()
+    kept_ids = [0, 1, 2, 3, 4, 5, 8, 10, 11]
+    inputs = {"input_ids": torch.tensor([[4, 5, 8, 2]]), "decoder_input_ids": torch.tensor([[2, 0, 10, 11]])}
+    with torch.no_grad():
+        full_logits = model(**inputs).logits
+    
+    trim_model_vocabulary(model, kept_ids)
+    trimmed_inputs = {key: torch.tensor([[kept_ids.index(i) for i in row] for row in value.tolist()])
+                      for key, value in inputs.items()}
+    with torch.no_grad():
+        trimmed_logits = model(**trimmed_inputs).logits
+    
+    assert model.config.vocab_size == len(kept_ids)
+    assert model.get_input_embeddings().weight is model.get_output_embeddings().weight
+    assert torch.allclose(trimmed_logits, full_logits[..., kept_ids], atol=1e-5)
+
+
+def test_used_ids_from_corpus_and_keep_texts():
+    tokenizer = _tokenizer()
+    
+    kept_ids = collect_used_ids(tokenizer, ["the catch rose", "la prise a augmenté"], keep_texts=["cat"])
+    
+    assert tokenizer.convert_ids_to_tokens(kept_ids) == [
+        "<s>", "<pad>", "</s>", "<unk>", "▁the", "▁catch", "▁rose", "▁la", "▁prise", "▁a", "▁augmenté", "▁", "c", "a", "t"
+    ]
+
+
+def test_dropped_pieces_resegmented_and_ids_remapped():
+    tokenizer = _tokenizer()
+    kept_ids = [0, 1, 2, 3, 4, 5, 7, 8, 17, 18, 19, 20, 21, 22, 23]
+    
+    trimmed = TrimmedVocabTokenizer(tokenizer, kept_ids)
+    encoded = trimmed("the catches rose", return_tensors="pt")
+    
+    assert len(trimmed) == len(kept_ids)
+    assert encoded["input_ids"].tolist() == [[4, 5, 6, 7]]
+    assert trimmed.convert_ids_to_tokens([4, 5, 6, 7]) == ["▁the", "▁catch", "es", "▁rose"]
+    assert trimmed.decode(encoded["input_ids"][0]) == "the catches rose"
+    assert trimmed("hats", add_special_tokens=False)["input_ids"] == [8, 12, 10, 11, 14]
+    assert trimmed("stieg", add_special_tokens=False)["input_ids"][-1] == trimmed.unk_token_id == 3
+
+
+def test_trimmed_checkpoint_loads_through_translation_model(tmp_path):
+    source_dir = tmp_path / "full"
+    M2M100ForConditionalGeneration(M2M100Config(**TINY_MODEL)).save_pretrained(source_dir)
+    _tokenizer().save_pretrained(source_dir)
+    corpus = tmp_path / "training_data.jsonl"
+    corpus.write_text(json.dumps({"source": "the catch rose", "target": "la prise a augmenté"}), encoding="utf-8")
+    
+    report = trim_checkpoint(source_dir, tmp_path / "trimmed", jsonl_paths=[corpus], keep_texts=["cat"])
+    model = BaseTranslationModel("full", merged_model_path=str(tmp_path / "trimmed"), dtype="float32", device_map=None)
+    
+    assert report["trimmed_vocab_size"] == 15
+    assert report["trimmed_parameters"] < report["original_parameters"]
+    assert isinstance(model.load_tokenizer(), TrimmedVocabTokenizer)
+    assert model.load_model().config.vocab_size == len(model.load_tokenizer()) == 15
+
+
+def test_model_config_uses_trimmed_checkpoints_that_exist(tmp_path, monkeypatch):
+    monkeypatch.setitem(config.VOCAB_TRIM_CONFIG, "output_dir", tmp_path)
+    (tmp_path / "m2m100_418m_finetuned").mkdir()
+    (tmp_path / "mbart50_mmt_base").mkdir()
+    
+    all_models = get_model_config(use_trimmed_vocab=True)
+    
+    assert trimmed_model_paths("mbart50_mmt_finetuned") == {
+        "merged_model_path_en_fr": str(tmp_path / "mbart50_mmt_finetuned_en_fr"),
+        "merged_model_path_fr_en": str(tmp_path / "mbart50_mmt_finetuned_fr_en"),
+    }
+    assert all_models["m2m100_418m_finetuned"]["params"]["merged_model_path"] == str(tmp_path / "m2m100_418m_finetuned")
+    assert all_models["mbart50_mmt_base"]["params"]["merged_model_path_fr_en"] == str(tmp_path / "mbart50_mmt_base")
+    assert "merged_model_path" not in all_models["m2m100_418m_base"]["params"]
+    assert all_models["mbart50_mmt_finetuned"]["params"]["merged_model_path_en_fr"].endswith("mbart50_mmt_fr")
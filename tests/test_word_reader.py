@@ -0,0 +1,92 @@
+from docx import Document
+from docx.enum.section import WD_SECTION
+from docx.oxml import OxmlElement
+
+from scitrans.translate.word_document import _iter_document_elements
+from scitrans.translate.word_reader import DocxReader, iter_location_texts, iter_translatable_texts
+
+
+def _add_hyperlink_run(paragraph, text):
+    hyperlink = OxmlElement('w:hyperlink')
+    run = OxmlElement('w:r')
+    t = OxmlElement('w:t')
+    t.text = text
+    run.append(t)
+    hyperlink.append(run)
+    paragraph._p.append(hyperlink)
+
+
+def _build_document(path):
+    doc = Document()
+    paragraph = doc.add_paragraph("Stock status")
+    run = paragraph.add_run(" summary")
+    run.add_break()
+    run.add_text("next\tline")
+    _add_hyperlink_run(paragraph, " (link)")
+    doc.add_paragraph("")
+    
+    table = doc.add_table(rows=3, cols=3)
+    for r_idx, row in enumerate(table.rows):
+        for c_idx, cell in enumerate(row.cells):
+            cell.text = f"r{r_idx}c{c_idx}"
+    table.cell(0, 0).merge(table.cell(0, 2))
+    table.cell(1, 0).merge(table.cell(2, 0))
+    doc.add_paragraph("After the table")
+    
+    doc.sections[0].header.paragraphs[0].text = "Science Advisory Report"
+    header_table = doc.sections[0].header.add_table(rows=1, cols=2, width=914400)
+    header_table.cell(0, 0).text = "Region"
+    doc.sections[0].footer.paragraphs[0].text = "Page footer"
+    second = doc.add_section(WD_SECTION.NEW_PAGE)
+    second.header.is_linked_to_previous = False
+    second.header.paragraphs[0].text = "Appendix header"
+    doc.save(path)
+    return path
+
+
+def _python_docx_translatable_texts(path):
+    # python-docx adds empty first-page/even-page parts to the first section when they are
+    # looked up, so only the non-empty texts are comparable
+    texts = []
+    for element, _location, element_type in _iter_document_elements(Document(path)):
+        paragraphs = element.paragraphs if element_type == "cell" else [element]
+        texts.extend(p.text for p in paragraphs if p.text.strip())
+    return texts
+
+
+class TestDocxReader:
+    def test_paragraph_text_matches_python_docx(self, tmp_path):
+        path = _build_document(str(tmp_path / "doc.docx"))
+        reader = DocxReader(path)
+        
+        texts = [text for _, text in reader.iter_paragraphs()]
+        
+        assert texts == [p.text for p in Document(path).paragraphs]
+        assert texts[0] == "Stock status summary\nnext\tline (link)"
+    
+    def test_table_grid_matches_row_cells(self, tmp_path):
+        path = _build_document(str(tmp_path / "doc.docx"))
+        reader = DocxReader(path)
+        list(reader.iter_paragraphs())
+        
+        table = Document(path).tables[0]
+        expected = [[cell.text for cell in row.cells] for row in table.rows]
+        assert [reader.tables[0].row_texts(r) for r in range(3)] == expected
+        assert len(list(reader.tables[0].unique_cell_indexes())) == 6
+    
+    def test_translatable_texts_follow_translation_order(self, tmp_path):
+        path = _build_document(str(tmp_path / "doc.docx"))
+        
+        texts = [text for text in iter_translatable_texts(path) if text.strip()]
+        assert texts == _python_docx_translatable_texts(path)
+    
+    def test_location_ids(self, tmp_path):
+        path = _build_document(str(tmp_path / "doc.docx"))
+        
+        locations = dict(iter_location_texts(path))
+        
+        assert locations["P0"].startswith("Stock status")
+        assert "P1" not in locations
+        assert locations["T0-R0"] == "r0c0\nr0c1\nr0c2 | r0c0\nr0c1\nr0c2 | r0c0\nr0c1\nr0c2"
+        assert [locations[k] for k in ("H0", "H1", "H2")] == ["Science Advisory Report", "Region", "Appendix header"]
+        assert locations["F0"] == "Page footer"
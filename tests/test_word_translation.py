@@ -9,8 +9,8 @@ from docx.opc.constants import RELATIONSHIP_TYPE as RT
 from docx.oxml import OxmlElement
 import docx.oxml.ns as ns
 
-from scitrans.translate.word_document import translate_word_document, _translate_paragraph
-from scitrans.translate.word_notes import write_notes_json
+from scitrans.translate.word_document import translate_word_document, _translate_paragraph, _iter_document_elements
+from scitrans.translate.word_notes import write_notes_json, write_notes_docx, json_to_word_tables
 from scitrans.translate.utils import split_by_sentences
 from scitrans.translate.models import create_translator
 from tests.conftest import MockTranslator, PeriodDroppingMockTranslator
@@ -351,6 +351,53 @@ def test_write_formatting_notes(tmp_path):
     assert any('https://example.com' in n['detail'] for n in first['notes'])
 
 
+def test_notes_docx_matches_json_route(tmp_path):
+    records = [
+        {'original_text': 'Example Link', 'full_paragraph': 'Visit Example Link for details.', 'notes': 'https://example.com', 'type': 'url'},
+        {'original_text': 'Gadus morhua', 'full_paragraph': 'Visit Example Link for details.', 'notes': 'italic', 'type': 'formatting'},
+        {'original_text': 'Count', 'full_paragraph': 'Count', 'notes': 'bold', 'type': 'formatting',
+         'location': {'section': 'tables', 'table': 0, 'row': 0, 'cell': 0}},
+    ]
+    json_path = str(tmp_path / 'via_json.json')
+    write_notes_json(records, json_path)
+    json_to_word_tables(json_path)
+    
+    direct_path = write_notes_docx(records, str(tmp_path / 'direct.docx'))
+    
+    via_json = Document(str(tmp_path / 'via_json.docx'))
+    direct = Document(direct_path)
+    assert [c.text for t in direct.tables for r in t.rows for c in r.cells] == \
+           [c.text for t in via_json.tables for r in t.rows for c in r.cells]
+    assert direct.tables[0].rows[1].cells[1].paragraphs[1].text == '"Gadus morhua": italic'
+    assert not os.path.exists(json_path)
+
+
+def test_notes_docx_skipped_when_all_records_filtered(tmp_path):
+    records = [{'original_text': 'Total', 'full_paragraph': 'Total', 'notes': 'colour=000000', 'type': 'formatting'}]
+    
+    assert write_notes_docx(records, str(tmp_path / 'notes.docx')) is None
+    assert not os.path.exists(tmp_path / 'notes.docx')
+
+
+@pytest.mark.parametrize("preserve_json_notes", [False, True], ids=["docx_only", "with_json"])
+def test_notes_json_written_only_on_request(preserve_json_notes, tmp_path):
+    input_path = str(tmp_path / 'input.docx')
+    output_path = str(tmp_path / 'output.docx')
+    doc = Document()
+    para = doc.add_paragraph('Samples of ')
+    para.add_run('Gadus morhua').bold = True
+    para.add_run(' were collected.')
+    doc.save(input_path)
+    
+    translate_word_document(
+        input_docx_file=input_path, output_docx_file=output_path, source_lang="en",
+        translation_manager=MockTranslator(), preserve_json_notes=preserve_json_notes
+    )
+    
+    assert os.path.exists(tmp_path / 'output_translation_notes.docx')
+    assert os.path.exists(tmp_path / 'output_translation_notes.json') == preserve_json_notes
+
+
 @pytest.mark.parametrize("use_find_replace", [True, False], ids=["find_replace_on", "find_replace_off"])
 @pytest.mark.parametrize("source_lang, expected_locale", [
     ('en', 'fr-CA'),
@@ -410,7 +457,8 @@ def test_figure_table_period_preserved(input_text, expected_label, tmp_path):
         output_docx_file=output_path,
         source_lang="en",
         use_find_replace=False,
-        translation_manager=mock
+        translation_manager=mock,
+        bypass_rules=False  # labels go through the period-dropping model path
     )
     
     output_doc = Document(output_path)
@@ -435,7 +483,8 @@ def test_figure_label_period_preserved_multisentence(tmp_path):
         output_docx_file=output_path,
         source_lang="en",
         use_find_replace=False,
-        translation_manager=mock
+        translation_manager=mock,
+        bypass_rules=False  # labels go through the period-dropping model path
     )
     
     output_doc = Document(output_path)
@@ -463,7 +512,8 @@ def test_table_label_period_preserved_in_table_cell(tmp_path):
         output_docx_file=output_path,
         source_lang="en",
         use_find_replace=False,
-        translation_manager=mock
+        translation_manager=mock,
+        bypass_rules=False  # labels go through the period-dropping model path
     )
     
     output_doc = Document(output_path)
@@ -472,3 +522,206 @@ def test_table_label_period_preserved_in_table_cell(tmp_path):
     assert "Table 2." in cell_text, (
         f"Period stripped from 'Table 2.' in table cell: {cell_text}"
     )
+
+
+class PrefetchingMockTranslator(MockTranslator):
+    def __init__(self):
+        super().__init__()
+        self.prefetched = []
+    
+    def prefetch_segments(self, texts, source_lang="en"):
+        self.prefetched.extend(texts)
+        return len(texts)
+
+
+@pytest.mark.parametrize("use_find_replace", [True, False], ids=["find_replace_on", "find_replace_off"])
+def test_segments_prefetched_before_translation(use_find_replace, tmp_path):
+    mock = PrefetchingMockTranslator()
+    input_path = str(tmp_path / 'input.docx')
+    output_path = str(tmp_path / 'output.docx')
+    
+    doc = Document()
+    doc.add_paragraph("Figure 1. Map showing the study area. Data was collected in 2024.")
+    doc.add_table(rows=1, cols=1).rows[0].cells[0].text = "Observed counts by region and year."
+    doc.save(input_path)
+    
+    translate_word_document(
+        input_docx_file=input_path,
+        output_docx_file=output_path,
+        source_lang="en",
+        use_find_replace=use_find_replace,
+        translation_manager=mock
+    )
+    
+    if use_find_replace:
+        assert set(mock.source_texts) <= set(mock.prefetched)
+    else:
+        assert mock.prefetched == []
+
+
+def test_merged_cells_translated_once(tmp_path):
+    mock = MockTranslator()
+    input_path = str(tmp_path / 'input.docx')
+    output_path = str(tmp_path / 'output.docx')
+    
+    doc = Document()
+    table = doc.add_table(rows=3, cols=3)
+    header = table.cell(0, 0).merge(table.cell(0, 2))
+    header.text = "Catch at age for the southern Gulf stock."
+    side = table.cell(1, 0).merge(table.cell(2, 0))
+    side.text = "Northern contingent spawning biomass."
+    doc.save(input_path)
+    
+    traversal_stats = {}
+    elements = list(_iter_document_elements(Document(input_path), stats=traversal_stats))
+    assert len([e for e in elements if e[2] == "cell"]) == 6
+    assert traversal_stats == {"grid_cells": 9, "table_cells": 6}
+    
+    translate_word_document(
+        input_docx_file=input_path,
+        output_docx_file=output_path,
+        source_lang="en",
+        use_find_replace=False,
+        translation_manager=mock
+    )
+    
+    assert mock.source_texts.count("Catch at age for the southern Gulf stock.") == 1
+    assert mock.source_texts.count("Northern contingent spawning biomass.") == 1
+    output_table = Document(output_path).tables[0]
+    assert output_table.cell(0, 2).text == "[TR:Catch at age for the southern Gulf stock.]"
+
+
+def _save_draft(path, paragraphs):
+    doc = Document()
+    for text in paragraphs:
+        doc.add_paragraph(text)
+    doc.save(path)
+
+
+DRAFT_ONE = [
+    "The stock is assessed every three years.",
+    "Recruitment has been low since 2015.",
+    "Fishing mortality remains below the reference point.",
+]
+DRAFT_TWO = [
+    "The stock is assessed every three years.",
+    "Recruitment has been very low since 2012.",
+    "Fishing mortality remains below the reference point.",
+]
+
+
+def test_incremental_translation_from_segment_map(tmp_path, capsys):
+    first_input = str(tmp_path / 'draft1.docx')
+    second_input = str(tmp_path / 'draft2.docx')
+    _save_draft(first_input, DRAFT_ONE)
+    _save_draft(second_input, DRAFT_TWO)
+    
+    first_output = translate_word_document(
+        input_docx_file=first_input, output_docx_file=str(tmp_path / 'draft1_fr.docx'),
+        source_lang="en", translation_manager=MockTranslator(), save_segment_map=True
+    )
+    segment_map_path = str(tmp_path / 'draft1_fr_segments.json')
+    assert os.path.exists(segment_map_path)
+    
+    mock = MockTranslator()
+    second_output = translate_word_document(
+        input_docx_file=second_input, output_docx_file=str(tmp_path / 'draft2_fr.docx'),
+        source_lang="en", translation_manager=mock, previous_segment_map=segment_map_path
+    )
+    
+    assert mock.source_texts == ["Recruitment has been very low since 2012."]
+    assert "Reused 2 unchanged segments, retranslated 1" in capsys.readouterr().out
+    first_texts = [p.text for p in Document(first_output).paragraphs]
+    second_texts = [p.text for p in Document(second_output).paragraphs]
+    assert second_texts[0] == first_texts[0]
+    assert second_texts[1] == "[TR:Recruitment has been very low since 2012.]"
+
+
+def test_incremental_translation_from_previous_documents(tmp_path):
+    first_input = str(tmp_path / 'draft1.docx')
+    second_input = str(tmp_path / 'draft2.docx')
+    _save_draft(first_input, DRAFT_ONE)
+    _save_draft(second_input, DRAFT_TWO)
+    first_output = translate_word_document(
+        input_docx_file=first_input, output_docx_file=str(tmp_path / 'draft1_fr.docx'),
+        source_lang="en", translation_manager=MockTranslator()
+    )
+    
+    # A reviewer's fix in the previous output is carried forward for unchanged paragraphs
+    reviewed = Document(first_output)
+    reviewed.paragraphs[2].runs[0].text = "Reviewed translation."
+    reviewed.save(first_output)
+    
+    mock = MockTranslator()
+    second_output = translate_word_document(
+        input_docx_file=second_input, output_docx_file=str(tmp_path / 'draft2_fr.docx'),
+        source_lang="en", translation_manager=mock,
+        previous_source_docx=first_input, previous_translated_docx=first_output
+    )
+    
+    assert mock.call_count == 1
+    assert Document(second_output).paragraphs[2].text == "Reviewed translation."
+    
+    with pytest.raises(ValueError):
+        translate_word_document(
+            input_docx_file=second_input, output_docx_file=str(tmp_path / 'x.docx'),
+            source_lang="en", translation_manager=mock, previous_source_docx=first_input
+        )
+
+
+class FailingMockTranslator(MockTranslator):
+    def __init__(self, fail_after):
+        super().__init__()
+        self.fail_after = fail_after
+    
+    def translate_with_best_model(self, text, source_lang, target_lang, use_find_replace, idx, **kwargs):
+        if self.call_count >= self.fail_after:
+            raise RuntimeError("model crashed")
+        return super().translate_with_best_model(text, source_lang, target_lang, use_find_replace, idx, **kwargs)
+
+
+def test_checkpoint_resumes_interrupted_translation(tmp_path, capsys):
+    input_path = str(tmp_path / 'report.docx')
+    output_path = str(tmp_path / 'report_fr.docx')
+    _save_draft(input_path, DRAFT_ONE)
+    checkpoint_path = str(tmp_path / 'report_fr_checkpoint.json')
+    
+    with pytest.raises(RuntimeError):
+        translate_word_document(
+            input_docx_file=input_path, output_docx_file=output_path, source_lang="en",
+            translation_manager=FailingMockTranslator(fail_after=2), checkpoint=True
+        )
+    assert os.path.exists(checkpoint_path)
+    assert not os.path.exists(output_path)
+    
+    mock = MockTranslator()
+    translate_word_document(
+        input_docx_file=input_path, output_docx_file=output_path, source_lang="en",
+        translation_manager=mock, checkpoint=True
+    )
+    
+    assert mock.source_texts == [DRAFT_ONE[2]]
+    assert "Resumed 2 segments from checkpoint" in capsys.readouterr().out
+    assert [p.text for p in Document(output_path).paragraphs] == [f"[TR:{text}]" for text in DRAFT_ONE]
+    assert not os.path.exists(checkpoint_path)
+
+
+def test_checkpoint_ignored_when_input_changes(tmp_path):
+    input_path = str(tmp_path / 'report.docx')
+    output_path = str(tmp_path / 'report_fr.docx')
+    _save_draft(input_path, DRAFT_ONE)
+    
+    with pytest.raises(RuntimeError):
+        translate_word_document(
+            input_docx_file=input_path, output_docx_file=output_path, source_lang="en",
+            translation_manager=FailingMockTranslator(fail_after=2), checkpoint=True
+        )
+    
+    _save_draft(input_path, DRAFT_TWO)
+    mock = MockTranslator()
+    translate_word_document(
+        input_docx_file=input_path, output_docx_file=output_path, source_lang="en",
+        translation_manager=mock, checkpoint=True
+    )
+    
+    assert mock.source_texts == DRAFT_TWO